@@ -0,0 +1,115 @@
+ALTER TABLE "issues" ADD COLUMN "dispatch_score_base" integer DEFAULT 0 NOT NULL;--> statement-breakpoint
+ALTER TABLE "issues" ADD COLUMN "dispatch_rank" double precision DEFAULT 0 NOT NULL;--> statement-breakpoint
+ALTER TABLE "issues" ADD COLUMN "is_blocked" boolean DEFAULT false NOT NULL;--> statement-breakpoint
+CREATE INDEX "idx_issues_dispatch_queue" ON "issues" USING btree ("dispatch_rank") WHERE "issues"."status" = 'todo' AND "issues"."deleted_at" IS NULL AND "issues"."is_blocked" = false;--> statement-breakpoint
+CREATE INDEX "idx_issues_dispatch_queue_project" ON "issues" USING btree ("project_id","dispatch_rank") WHERE "issues"."status" = 'todo' AND "issues"."deleted_at" IS NULL AND "issues"."is_blocked" = false;--> statement-breakpoint
+-- Custom SQL migration: keep the dispatch columns in sync with their inputs.
+-- Weights mirror apps/api/src/lib/priority-scoring.ts, which stays the source of truth;
+-- dispatch-ordering.test.ts fails if the two drift apart.
+-- dispatch_rank = base score - days since epoch of created_at. Ordering by it descending
+-- is the same as ordering by base + age in days, without going stale as time passes.
+CREATE OR REPLACE FUNCTION issue_dispatch_score_base(p_priority integer, p_type issue_type, p_project_id text)
+RETURNS integer LANGUAGE sql STABLE AS $$
+  SELECT (CASE p_priority WHEN 1 THEN 100 WHEN 2 THEN 75 WHEN 3 THEN 50 WHEN 4 THEN 25 ELSE 10 END)
+    + (CASE p_type
+        WHEN 'signal' THEN 50 WHEN 'hypothesis' THEN 40 WHEN 'plan' THEN 30
+        WHEN 'task' THEN 20 WHEN 'monitor' THEN 10 ELSE 0 END)
+    + (CASE WHEN EXISTS (
+        SELECT 1 FROM goals g
+        WHERE g.project_id = p_project_id AND g.status = 'active' AND g.deleted_at IS NULL
+      ) THEN 20 ELSE 0 END)
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION issue_dispatch_rank(p_base integer, p_created_at timestamp with time zone)
+RETURNS double precision LANGUAGE sql STABLE AS $$
+  SELECT p_base - EXTRACT(EPOCH FROM p_created_at)::double precision / 86400
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION refresh_issue_blocked(p_issue_ids text[])
+RETURNS void LANGUAGE sql AS $$
+  UPDATE issues i SET is_blocked = s.blocked
+  FROM (
+    SELECT t.id, EXISTS (
+      SELECT 1 FROM issue_relations ir
+      JOIN issues blocker ON blocker.id = ir.related_issue_id
+      WHERE ir.issue_id = t.id
+        AND ir.type = 'blocked_by'
+        AND blocker.status NOT IN ('done', 'canceled')
+        AND blocker.deleted_at IS NULL
+    ) AS blocked
+    FROM issues t
+    WHERE t.id = ANY(p_issue_ids)
+  ) s
+  WHERE i.id = s.id AND i.is_blocked <> s.blocked
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION refresh_issue_dispatch_score(p_project_ids text[])
+RETURNS void LANGUAGE sql AS $$
+  UPDATE issues i
+  SET dispatch_score_base = s.base, dispatch_rank = issue_dispatch_rank(s.base, i.created_at)
+  FROM (
+    SELECT t.id, issue_dispatch_score_base(t.priority, t.type, t.project_id) AS base
+    FROM issues t
+    WHERE t.project_id = ANY(p_project_ids)
+  ) s
+  WHERE i.id = s.id AND i.dispatch_score_base <> s.base
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION issues_set_dispatch_rank()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  NEW.dispatch_score_base := issue_dispatch_score_base(NEW.priority, NEW.type, NEW.project_id);
+  NEW.dispatch_rank := issue_dispatch_rank(NEW.dispatch_score_base, NEW.created_at);
+  RETURN NEW;
+END
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION issues_refresh_dependents()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM refresh_issue_blocked(ARRAY(
+    SELECT ir.issue_id FROM issue_relations ir
+    WHERE ir.related_issue_id = NEW.id AND ir.type = 'blocked_by'
+  ));
+  RETURN NULL;
+END
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION issue_relations_refresh_blocked()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    PERFORM refresh_issue_blocked(ARRAY[OLD.issue_id]);
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM refresh_issue_blocked(ARRAY[NEW.issue_id]);
+  END IF;
+  RETURN NULL;
+END
+$$;--> statement-breakpoint
+CREATE OR REPLACE FUNCTION goals_refresh_dispatch_score()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+  project_ids text[] := '{}';
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    project_ids := array_append(project_ids, OLD.project_id);
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    project_ids := array_append(project_ids, NEW.project_id);
+  END IF;
+  PERFORM refresh_issue_dispatch_score(project_ids);
+  RETURN NULL;
+END
+$$;--> statement-breakpoint
+UPDATE issues SET dispatch_score_base = issue_dispatch_score_base(priority, type, project_id);--> statement-breakpoint
+UPDATE issues SET dispatch_rank = issue_dispatch_rank(dispatch_score_base, created_at);--> statement-breakpoint
+SELECT refresh_issue_blocked(ARRAY(SELECT id FROM issues));--> statement-breakpoint
+CREATE TRIGGER issues_dispatch_rank
+BEFORE INSERT OR UPDATE OF priority, type, project_id, created_at ON issues
+FOR EACH ROW EXECUTE FUNCTION issues_set_dispatch_rank();--> statement-breakpoint
+CREATE TRIGGER issues_dispatch_dependents
+AFTER UPDATE OF status, deleted_at ON issues
+FOR EACH ROW
+WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.deleted_at IS DISTINCT FROM NEW.deleted_at)
+EXECUTE FUNCTION issues_refresh_dependents();--> statement-breakpoint
+CREATE TRIGGER issue_relations_dispatch_blocked
+AFTER INSERT OR UPDATE OR DELETE ON issue_relations
+FOR EACH ROW EXECUTE FUNCTION issue_relations_refresh_blocked();--> statement-breakpoint
+CREATE TRIGGER goals_dispatch_score
+AFTER INSERT OR DELETE OR UPDATE OF status, project_id, deleted_at ON goals
+FOR EACH ROW EXECUTE FUNCTION goals_refresh_dispatch_score();
@@ -0,0 +1,5 @@
+ALTER TABLE "signals" ADD COLUMN "occurrences" integer DEFAULT 1 NOT NULL;--> statement-breakpoint
+ALTER TABLE "signals" ADD COLUMN "last_seen_at" timestamp with time zone DEFAULT now() NOT NULL;--> statement-breakpoint
+CREATE INDEX "idx_signals_dedup" ON "signals" USING btree ("source","source_id","type","last_seen_at");--> statement-breakpoint
+-- Custom SQL migration: existing signals were last seen when they were created
+UPDATE "signals" SET "last_seen_at" = "created_at";
@@ -0,0 +1,2 @@
+CREATE INDEX "idx_issues_created_at_id" ON "issues" USING btree ("created_at","id") WHERE "issues"."deleted_at" IS NULL;--> statement-breakpoint
+CREATE INDEX "idx_issues_project_created_at_id" ON "issues" USING btree ("project_id","created_at","id") WHERE "issues"."deleted_at" IS NULL;
\ No newline at end of file
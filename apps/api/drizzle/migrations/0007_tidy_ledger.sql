@@ -0,0 +1,17 @@
+ALTER TABLE "prompt_versions" ADD COLUMN "review_count" integer DEFAULT 0 NOT NULL;--> statement-breakpoint
+ALTER TABLE "prompt_versions" ADD COLUMN "clarity_sum" integer DEFAULT 0 NOT NULL;--> statement-breakpoint
+ALTER TABLE "prompt_versions" ADD COLUMN "completeness_sum" integer DEFAULT 0 NOT NULL;--> statement-breakpoint
+ALTER TABLE "prompt_versions" ADD COLUMN "relevance_sum" integer DEFAULT 0 NOT NULL;--> statement-breakpoint
+-- Custom SQL migration: seed the aggregates from reviews recorded before they existed
+UPDATE "prompt_versions" v
+SET "review_count" = r.n,
+  "clarity_sum" = r.clarity,
+  "completeness_sum" = r.completeness,
+  "relevance_sum" = r.relevance
+FROM (
+  SELECT "version_id", count(*)::int AS n, sum("clarity")::int AS clarity,
+    sum("completeness")::int AS completeness, sum("relevance")::int AS relevance
+  FROM "prompt_reviews"
+  GROUP BY "version_id"
+) r
+WHERE v."id" = r."version_id";
\ No newline at end of file
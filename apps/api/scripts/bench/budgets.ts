@@ -0,0 +1,40 @@
+import type { BenchDatabase, ScenarioResult } from './harness';
+
+/**
+ * Most queries a single request in each scenario may issue. These are tracked budgets:
+ * lower one when an optimization lands, and only raise one alongside the change that
+ * needs it, so N+1 regressions fail the benchmark instead of slipping through.
+ *
+ * Counts are as PGlite reports them. node-postgres also counts the BEGIN and COMMIT
+ * around a transaction, which {@link TRANSACTION_OVERHEAD} allows for.
+ */
+export const QUERY_BUDGETS: Record<string, { maxQueries: number; transactional?: boolean }> = {
+  // claim, labels, failed siblings, usage UPDATE, up to six hydration lookups, and the
+  // template index and version loads on a cold registry
+  'GET /dispatch/next': { maxQueries: 12 },
+  // page, total, active goals
+  'GET /dispatch/queue': { maxQueries: 3 },
+  // roots, children, child relations
+  'GET /dashboard/activity': { maxQueries: 3 },
+  // advisory locks, dedup match, then two INSERTs or two UPDATEs
+  'POST /signals/github': { maxQueries: 4, transactional: true },
+};
+
+/** Extra statements node-postgres reports for a transaction. */
+export const TRANSACTION_OVERHEAD = 2;
+
+/** One line per scenario over budget; empty when every scenario is within its budget. */
+export function checkBudgets(
+  results: ScenarioResult[],
+  driver: BenchDatabase['driver']
+): string[] {
+  return results.flatMap((result) => {
+    const budget = QUERY_BUDGETS[result.name];
+    if (!budget) return [];
+    const overhead = budget.transactional && driver === 'postgres' ? TRANSACTION_OVERHEAD : 0;
+    const allowed = budget.maxQueries + overhead;
+    return result.maxQueries > allowed
+      ? [`${result.name}: ${result.maxQueries} queries in one request, budget is ${allowed}`]
+      : [];
+  });
+}
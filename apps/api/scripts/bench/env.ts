@@ -0,0 +1,9 @@
+/**
+ * Environment for the benchmark run. Imported before anything from `src/` so the API
+ * modules load the built-in test configuration instead of requiring a `.env` file.
+ */
+import { randomBytes } from 'node:crypto';
+
+process.env.NODE_ENV = 'test';
+process.env.LOOP_API_KEY = process.env.LOOP_API_KEY ?? 'loop_test-api-key';
+process.env.GITHUB_WEBHOOK_SECRET = randomBytes(16).toString('hex');
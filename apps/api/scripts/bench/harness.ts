@@ -0,0 +1,190 @@
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { Hono } from 'hono';
+import { HTTPException } from 'hono/http-exception';
+import { sql } from 'drizzle-orm';
+import * as schema from '../../src/db/schema';
+import { instrumentClient, queryCounter } from '../../src/lib/query-metrics';
+import { apiKeyAuth } from '../../src/middleware/auth';
+import { requestTiming } from '../../src/middleware/request-timing';
+import { dispatchRoutes } from '../../src/routes/dispatch';
+import { dashboardRoutes } from '../../src/routes/dashboard';
+import { webhookRoutes } from '../../src/routes/webhooks';
+import type { AnyDb, AppEnv } from '../../src/types';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const migrationsFolder = path.resolve(__dirname, '../../drizzle/migrations');
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+export interface BenchDatabase {
+  db: AnyDb;
+  /** `pglite` for the in-process default, `postgres` when `BENCH_DATABASE_URL` is set. */
+  driver: 'pglite' | 'postgres';
+  close: () => Promise<void>;
+}
+
+/** Latency, throughput and query cost of one scenario. */
+export interface ScenarioResult {
+  name: string;
+  requests: number;
+  elapsedMs: number;
+  /** Requests per second over the scenario's wall time. */
+  throughput: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  meanDbMs: number;
+  meanQueries: number;
+  maxQueries: number;
+  statuses: Record<number, number>;
+}
+
+export interface ScenarioOptions {
+  /** Requests in flight at once, e.g. the number of concurrent agents. */
+  concurrency: number;
+  /** Upper bound on requests sent. */
+  requests: number;
+  /** Send request number `index`. */
+  send: (index: number) => Promise<Response>;
+  /** Stop early once a response says there is nothing left to do, e.g. a 204 from `/next`. */
+  done?: (res: Response) => boolean;
+}
+
+// ─── Database ───────────────────────────────────────────────────────────────
+
+/**
+ * Create the database to benchmark against: a fresh in-memory PGlite by default, or the
+ * Postgres database at `url`, emptied first. Either way the client is instrumented like
+ * the API's own, so `Server-Timing` carries query counts.
+ */
+export async function createBenchDatabase(url: string | undefined): Promise<BenchDatabase> {
+  if (!url) {
+    const { PGlite } = await import('@electric-sql/pglite');
+    const { drizzle } = await import('drizzle-orm/pglite');
+    const { migrate } = await import('drizzle-orm/pglite/migrator');
+    const client = new PGlite();
+    const db = drizzle(instrumentClient(client), { schema, logger: queryCounter });
+    await migrate(db, { migrationsFolder });
+    return { db: db as unknown as AnyDb, driver: 'pglite', close: () => client.close() };
+  }
+
+  const pg = await import('pg');
+  const { drizzle } = await import('drizzle-orm/node-postgres');
+  const { migrate } = await import('drizzle-orm/node-postgres/migrator');
+  const pool = new pg.default.Pool({ connectionString: url });
+  const db = drizzle(instrumentClient(pool), { schema, logger: queryCounter });
+  await migrate(db, { migrationsFolder });
+
+  // Start from empty tables so every run sees exactly the seeded volumes
+  const { rows } = await pool.query<{ tablename: string }>(
+    `SELECT tablename FROM pg_tables WHERE schemaname = 'public'`
+  );
+  if (rows.length > 0) {
+    const tables = rows.map((row) => `"${row.tablename}"`).join(', ');
+    await db.execute(sql.raw(`TRUNCATE ${tables} RESTART IDENTITY CASCADE`));
+  }
+
+  return { db: db as unknown as AnyDb, driver: 'postgres', close: () => pool.end() };
+}
+
+// ─── App ────────────────────────────────────────────────────────────────────
+
+/**
+ * The routes under test, mounted at their production paths behind the same auth and
+ * `requestTiming` middleware as `src/app.ts`.
+ */
+export function createBenchApp(db: AnyDb): Hono<AppEnv> {
+  const app = new Hono<AppEnv>();
+  app.onError((err, c) => {
+    if (err instanceof HTTPException) {
+      return c.json({ error: err.message }, err.status);
+    }
+    console.error(err);
+    return c.json({ error: 'Internal server error' }, 500);
+  });
+
+  const api = new Hono<AppEnv>();
+  api.use('*', apiKeyAuth);
+  api.use('*', requestTiming());
+  api.use('*', async (c, next) => {
+    c.set('db', db);
+    await next();
+  });
+  api.route('/dispatch', dispatchRoutes);
+  api.route('/dashboard', dashboardRoutes);
+  api.route('/signals', webhookRoutes);
+  app.route('/api', api);
+
+  return app;
+}
+
+// ─── Measurement ────────────────────────────────────────────────────────────
+
+/**
+ * Drive `send` from `concurrency` workers until `requests` have been sent or `done`
+ * reports the work is exhausted, reading query counts from each `Server-Timing` header.
+ */
+export async function runScenario(name: string, options: ScenarioOptions): Promise<ScenarioResult> {
+  const latencies: number[] = [];
+  const queries: number[] = [];
+  const statuses: Record<number, number> = {};
+  let dbMs = 0;
+  let next = 0;
+  let exhausted = false;
+
+  const worker = async () => {
+    while (!exhausted && next < options.requests) {
+      const index = next++;
+      const start = performance.now();
+      const res = await options.send(index);
+      await res.arrayBuffer();
+      latencies.push(performance.now() - start);
+
+      const timing = parseDbTiming(res.headers.get('Server-Timing'));
+      queries.push(timing.queries);
+      dbMs += timing.durationMs;
+      statuses[res.status] = (statuses[res.status] ?? 0) + 1;
+      if (options.done?.(res)) exhausted = true;
+    }
+  };
+
+  const start = performance.now();
+  await Promise.all(Array.from({ length: options.concurrency }, worker));
+  const elapsedMs = performance.now() - start;
+
+  latencies.sort((a, b) => a - b);
+  const count = latencies.length;
+  return {
+    name,
+    requests: count,
+    elapsedMs: round(elapsedMs),
+    throughput: round((count / elapsedMs) * 1000),
+    p50Ms: round(quantile(latencies, 0.5)),
+    p95Ms: round(quantile(latencies, 0.95)),
+    p99Ms: round(quantile(latencies, 0.99)),
+    meanDbMs: round(dbMs / Math.max(count, 1)),
+    meanQueries: round(queries.reduce((sum, n) => sum + n, 0) / Math.max(count, 1)),
+    maxQueries: Math.max(0, ...queries),
+    statuses,
+  };
+}
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+/** Read the `db` entry written by `requestTiming`: `db;dur=1.2;desc="3 queries"`. */
+function parseDbTiming(header: string | null): { queries: number; durationMs: number } {
+  const match = header?.match(/\bdb;dur=([\d.]+);desc="(\d+) queries"/);
+  if (!match) throw new Error(`Response has no db Server-Timing entry: ${header ?? 'none'}`);
+  return { durationMs: Number(match[1]), queries: Number(match[2]) };
+}
+
+/** Nearest-rank quantile of sorted samples. */
+function quantile(sorted: number[], q: number): number {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.ceil(q * sorted.length) - 1)];
+}
+
+function round(value: number): number {
+  return Math.round(value * 100) / 100;
+}
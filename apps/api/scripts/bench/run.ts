@@ -0,0 +1,179 @@
+/**
+ * Benchmark the hot API paths against a seeded database and enforce query budgets.
+ *
+ * Run with: pnpm --filter @loop/api bench --issues=20000 --agents=16
+ *
+ * Every option can also be set through the environment (`--issues` is `BENCH_ISSUES`).
+ * Uses in-memory PGlite unless `BENCH_DATABASE_URL` points at a Postgres database, which
+ * is emptied before seeding. Exits with code 1 when a scenario exceeds its query budget.
+ */
+import './env';
+import { createHmac } from 'node:crypto';
+import { parseArgs } from 'node:util';
+import { createBenchApp, createBenchDatabase, runScenario } from './harness';
+import type { ScenarioResult } from './harness';
+import { seedDatabase } from './seed';
+import { checkBudgets } from './budgets';
+
+// ─── Options ────────────────────────────────────────────────────────────────
+
+const DEFAULTS = {
+  issues: 5000,
+  relations: 1000,
+  templates: 20,
+  signals: 2000,
+  agents: 8,
+  requests: 500,
+  seed: 42,
+};
+
+type BenchOption = keyof typeof DEFAULTS;
+
+const { values: args } = parseArgs({
+  options: Object.fromEntries(
+    Object.keys(DEFAULTS).map((name) => [name, { type: 'string' as const }])
+  ) as Record<BenchOption, { type: 'string' }>,
+});
+
+/** Resolve an option from `--name`, then `BENCH_NAME`, then its default. */
+function option(name: BenchOption): number {
+  const raw = args[name] ?? process.env[`BENCH_${name.toUpperCase()}`];
+  if (raw === undefined) return DEFAULTS[name];
+  const value = Number(raw);
+  if (!Number.isInteger(value) || value < 0) {
+    throw new Error(`--${name} must be a non-negative integer, got "${raw}"`);
+  }
+  return value;
+}
+
+const volumes = {
+  issues: option('issues'),
+  relations: option('relations'),
+  templates: option('templates'),
+  signals: option('signals'),
+};
+const agents = Math.max(1, option('agents'));
+const requests = option('requests');
+
+// ─── Requests ───────────────────────────────────────────────────────────────
+
+const AUTH_HEADER = { Authorization: `Bearer ${process.env.LOOP_API_KEY}` };
+/** Event types paired with the payload field naming their entity; pushes have none. */
+const GITHUB_EVENTS = [
+  ['issues', 'issue'],
+  ['push', null],
+  ['pull_request', 'pull_request'],
+  ['code_scanning_alert', 'alert'],
+] as const;
+
+/**
+ * A signed GitHub delivery. Entities repeat every 50 deliveries per event, exercising
+ * dedup; pushes name no entity and always create a new signal.
+ */
+function githubDelivery(index: number): RequestInit {
+  const [event, entityField] = GITHUB_EVENTS[index % GITHUB_EVENTS.length];
+  const number = Math.floor(index / GITHUB_EVENTS.length) % 50;
+  const body = JSON.stringify({
+    action: 'opened',
+    ...(entityField ? { [entityField]: { number } } : {}),
+    repository: { full_name: 'loop/bench' },
+    sender: { login: `agent-${index % agents}` },
+  });
+  const signature = createHmac('sha256', process.env.GITHUB_WEBHOOK_SECRET!)
+    .update(body)
+    .digest('hex');
+  return {
+    method: 'POST',
+    headers: {
+      ...AUTH_HEADER,
+      'Content-Type': 'application/json',
+      'X-GitHub-Event': event,
+      'X-Hub-Signature-256': `sha256=${signature}`,
+    },
+    body,
+  };
+}
+
+// ─── Run ────────────────────────────────────────────────────────────────────
+
+const database = await createBenchDatabase(process.env.BENCH_DATABASE_URL);
+const seeded = await seedDatabase(database.db, volumes, option('seed'));
+const app = createBenchApp(database.db);
+
+console.log(`Seeded ${database.driver}:`, seeded);
+console.log(`Running with ${agents} concurrent agents, up to ${requests} requests per scenario\n`);
+
+// Read-only scenarios run first so claims and ingest do not change what they read
+const results: ScenarioResult[] = [];
+
+results.push(
+  await runScenario('GET /dispatch/queue', {
+    concurrency: agents,
+    requests,
+    send: () => app.request('/api/dispatch/queue?limit=50', { headers: AUTH_HEADER }),
+  })
+);
+
+// The dashboard caches responses; bypass it so every request does the work
+results.push(
+  await runScenario('GET /dashboard/activity', {
+    concurrency: agents,
+    requests,
+    send: () =>
+      app.request('/api/dashboard/activity?limit=20', {
+        headers: { ...AUTH_HEADER, 'Cache-Control': 'no-cache' },
+      }),
+  })
+);
+
+const claims = await runScenario('GET /dispatch/next', {
+  concurrency: agents,
+  requests,
+  send: () => app.request('/api/dispatch/next', { headers: AUTH_HEADER }),
+  done: (res) => res.status === 204,
+});
+results.push(claims);
+
+results.push(
+  await runScenario('POST /signals/github', {
+    concurrency: agents,
+    requests,
+    send: (index) => app.request('/api/signals/github', githubDelivery(index)),
+  })
+);
+
+await database.close();
+
+// ─── Report ─────────────────────────────────────────────────────────────────
+
+console.table(
+  results.map(({ statuses, ...result }) => ({
+    ...result,
+    statuses: Object.entries(statuses)
+      .map(([status, count]) => `${status}×${count}`)
+      .join(' '),
+  }))
+);
+
+const claimed = claims.statuses[200] ?? 0;
+console.log(`\n/dispatch/next: ${claimed} claims, ${round((claimed / claims.elapsedMs) * 1000)}/s`);
+
+const failures = results.filter((result) =>
+  Object.keys(result.statuses).some((status) => Number(status) >= 500)
+);
+for (const result of failures) {
+  console.error(`${result.name}: server errors`, result.statuses);
+}
+
+const overBudget = checkBudgets(results, database.driver);
+if (overBudget.length > 0) {
+  console.error('\nQuery budget exceeded:');
+  for (const line of overBudget) console.error(`  - ${line}`);
+}
+
+if (failures.length > 0 || overBudget.length > 0) process.exit(1);
+console.log('\nAll scenarios within their query budgets');
+
+function round(value: number): number {
+  return Math.round(value * 100) / 100;
+}
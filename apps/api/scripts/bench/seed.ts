@@ -0,0 +1,193 @@
+import { eq } from 'drizzle-orm';
+import type { PgInsertValue, PgTable } from 'drizzle-orm/pg-core';
+import { createId } from '@paralleldrive/cuid2';
+import {
+  issues,
+  issueRelations,
+  projects,
+  goals,
+  promptTemplates,
+  promptVersions,
+  signals,
+  issueTypeValues,
+} from '../../src/db/schema';
+import type { AnyDb } from '../../src/types';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** How much data to seed; every volume can be set from the command line or environment. */
+export interface SeedVolumes {
+  issues: number;
+  /** `blocks` relations, each stored with its inverse `blocked_by` row. */
+  relations: number;
+  /** Templates, each with one active version. */
+  templates: number;
+  signals: number;
+}
+
+export interface SeedSummary extends SeedVolumes {
+  projects: number;
+  /** Issues in `todo`, the pool `/dispatch/next` claims from. */
+  todo: number;
+}
+
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+const PROJECT_COUNT = 5;
+const INSERT_CHUNK = 500;
+const SIGNAL_SOURCES = ['github', 'sentry', 'posthog'] as const;
+const SEVERITIES = ['low', 'medium', 'high', 'critical'] as const;
+
+/** Status mix for seeded issues; the rest of the range after the last bound is `done`. */
+const STATUS_MIX = [
+  ['todo', 0.55],
+  ['backlog', 0.7],
+  ['triage', 0.8],
+  ['in_progress', 0.85],
+] as const;
+
+// ─── Seeding ────────────────────────────────────────────────────────────────
+
+/**
+ * Fill an empty, migrated database with a synthetic workload. The same `seed` and
+ * volumes always produce the same shape of data, so runs are comparable.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param volumes - Row counts to create
+ * @param seed - Seed for the pseudo-random generator
+ */
+export async function seedDatabase(
+  db: AnyDb,
+  volumes: SeedVolumes,
+  seed: number
+): Promise<SeedSummary> {
+  const random = mulberry32(seed);
+  const pick = <T>(values: readonly T[]): T => values[Math.floor(random() * values.length)];
+  const now = Date.now();
+
+  // Projects first, so the dispatch-rank trigger sees their goals when issues are inserted
+  const projectRows = Array.from({ length: PROJECT_COUNT }, (_, i) => ({
+    id: createId(),
+    name: `Bench project ${i + 1}`,
+  }));
+  await db.insert(projects).values(projectRows);
+  await db.insert(goals).values(
+    projectRows.slice(0, Math.ceil(PROJECT_COUNT / 2)).map((project) => ({
+      title: `Goal for ${project.name}`,
+      projectId: project.id,
+      status: 'active' as const,
+    }))
+  );
+
+  // The first tenth of the issues act as parents for a fifth of the rest
+  const parentPool = Math.max(1, Math.floor(volumes.issues / 10));
+  const issueRows = Array.from({ length: volumes.issues }, (_, i) => {
+    const roll = random();
+    const status = STATUS_MIX.find(([, bound]) => roll < bound)?.[0] ?? 'done';
+    const createdAt = new Date(now - random() * 30 * 86_400_000);
+    return {
+      id: createId(),
+      title: `Bench issue ${i + 1}`,
+      type: pick(issueTypeValues),
+      status,
+      priority: Math.floor(random() * 5),
+      projectId: random() < 0.8 ? pick(projectRows).id : null,
+      signalSource: random() < 0.3 ? pick(SIGNAL_SOURCES) : null,
+      createdAt,
+      completedAt: status === 'done' ? new Date(createdAt.getTime() + 3_600_000) : null,
+    };
+  });
+  const withParents = issueRows.map((row, i) =>
+    i >= parentPool && random() < 0.2
+      ? { ...row, parentId: issueRows[Math.floor(random() * parentPool)].id }
+      : row
+  );
+  await insertChunked(db, issues, withParents);
+
+  const relationRows = Array.from({ length: volumes.relations }, () => {
+    const blocker = pick(issueRows).id;
+    let blocked = pick(issueRows).id;
+    while (blocked === blocker && issueRows.length > 1) blocked = pick(issueRows).id;
+    return { blocker, blocked };
+  }).flatMap(({ blocker, blocked }) => [
+    { type: 'blocks' as const, issueId: blocker, relatedIssueId: blocked },
+    { type: 'blocked_by' as const, issueId: blocked, relatedIssueId: blocker },
+  ]);
+  await insertChunked(db, issueRelations, relationRows);
+
+  // Template 0 matches everything; the rest are keyed on type or signal source
+  const templateRows = Array.from({ length: volumes.templates }, (_, i) => ({
+    id: createId(),
+    slug: `bench-template-${i + 1}`,
+    name: `Bench template ${i + 1}`,
+    conditions:
+      i === 0
+        ? {}
+        : i % 2 === 0
+          ? { signalSource: SIGNAL_SOURCES[i % SIGNAL_SOURCES.length] }
+          : { type: issueTypeValues[i % issueTypeValues.length] },
+    specificity: i === 0 ? 0 : 10 + (i % 5),
+  }));
+  const versionRows = templateRows.map((template) => ({
+    id: createId(),
+    templateId: template.id,
+    version: 1,
+    content: `{{issue.title}} (#{{issue.number}}) via ${template.slug}`,
+    authorType: 'human' as const,
+    authorName: 'bench',
+    status: 'active' as const,
+  }));
+  await insertChunked(db, promptTemplates, templateRows);
+  await insertChunked(db, promptVersions, versionRows);
+  for (const version of versionRows) {
+    await db
+      .update(promptTemplates)
+      .set({ activeVersionId: version.id })
+      .where(eq(promptTemplates.id, version.templateId));
+  }
+
+  const signalIssues = issueRows.filter((row) => row.type === 'signal');
+  const signalRows = Array.from({ length: volumes.signals }, (_, i) => {
+    const source = pick(SIGNAL_SOURCES);
+    return {
+      source,
+      sourceId: `bench-${i}`,
+      type: 'event',
+      severity: pick(SEVERITIES),
+      payload: { bench: true, sequence: i },
+      issueId: pick(signalIssues.length > 0 ? signalIssues : issueRows).id,
+    };
+  });
+  await insertChunked(db, signals, signalRows);
+
+  return {
+    ...volumes,
+    projects: PROJECT_COUNT,
+    todo: issueRows.filter((row) => row.status === 'todo').length,
+  };
+}
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+/** Insert rows in chunks to stay under the driver's bind-parameter limit. */
+async function insertChunked<TTable extends PgTable>(
+  db: AnyDb,
+  table: TTable,
+  rows: PgInsertValue<TTable>[]
+): Promise<void> {
+  for (let start = 0; start < rows.length; start += INSERT_CHUNK) {
+    await db.insert(table).values(rows.slice(start, start + INSERT_CHUNK));
+  }
+}
+
+/** Small seeded PRNG, so seeded data does not depend on `Math.random`. */
+function mulberry32(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
@@ -3,7 +3,8 @@ import { createTestApp, withTestDb, getTestDb } from './setup';
 import { dashboardRoutes } from '../routes/dashboard';
 import { issues, issueRelations } from '../db/schema/issues';
 import { goals } from '../db/schema/projects';
-import { promptTemplates, promptVersions, promptReviews } from '../db/schema/prompts';
+import { promptTemplates, promptVersions } from '../db/schema/prompts';
+import { recordReviews, REVIEW_MIN_SAMPLES } from '../lib/review-aggregate';
 import { apiKeyAuth } from '../middleware/auth';
 import { HTTPException } from 'hono/http-exception';
 import { cors } from 'hono/cors';
@@ -686,8 +687,8 @@ describe('dashboard API', () => {
         ])
         .returning();
 
-      // Insert reviews with known scores
-      await db.insert(promptReviews).values([
+      // Record reviews with known scores through the aggregate
+      await recordReviews(db, [
         {
           versionId: version.id,
           issueId: issue1.id,
@@ -714,7 +715,6 @@ describe('dashboard API', () => {
       const entry = findBySlug(data, 'reviewed-template');
       expect(entry).toBeDefined();
       expect(entry!.reviewSummary.totalReviews).toBe(2);
-      // PostgreSQL avg() returns a numeric string; compare via Number()
       expect(Number(entry!.reviewSummary.avgClarity)).toBe(3); // (4+2)/2
       expect(Number(entry!.reviewSummary.avgCompleteness)).toBe(4); // (5+3)/2
       expect(Number(entry!.reviewSummary.avgRelevance)).toBe(4); // (3+5)/2
@@ -741,6 +741,7 @@ describe('dashboard API', () => {
         authorName: 'tester',
         status: 'active',
         reviewScore: 2.5,
+        reviewCount: REVIEW_MIN_SAMPLES,
         completionRate: 0.8,
       });
 
@@ -755,6 +756,40 @@ describe('dashboard API', () => {
       expect(entry!.reviewSummary.compositeScore).toBe(2.5);
     });
 
+    it('ignores a low compositeScore until REVIEW_MIN_SAMPLES reviews exist', async () => {
+      const db = getTestDb();
+      const app = buildApp();
+
+      const [template] = await db
+        .insert(promptTemplates)
+        .values({
+          slug: 'few-reviews-template',
+          name: 'Few Reviews Template',
+        })
+        .returning();
+
+      await db.insert(promptVersions).values({
+        templateId: template.id,
+        version: 1,
+        content: 'content',
+        authorType: 'human',
+        authorName: 'tester',
+        status: 'active',
+        reviewScore: 1.0,
+        reviewCount: REVIEW_MIN_SAMPLES - 1,
+        completionRate: 0.8,
+      });
+
+      const res = await app.request('/dashboard/prompts', {
+        headers: AUTH_HEADER,
+      });
+      const { data } = await res.json();
+
+      const entry = findBySlug(data, 'few-reviews-template');
+      expect(entry!.reviewSummary.compositeScore).toBe(1.0);
+      expect(entry!.needsAttention).toBe(false);
+    });
+
     it('sets needsAttention = true when completionRate < 0.5', async () => {
       const db = getTestDb();
       const app = buildApp();
@@ -822,6 +857,34 @@ describe('dashboard API', () => {
       expect(entry!.needsAttention).toBe(false);
     });
 
+    it('finds the active version even when it is older than the recent window', async () => {
+      const db = getTestDb();
+      const app = buildApp();
+
+      const [template] = await db
+        .insert(promptTemplates)
+        .values({ slug: 'long-history', name: 'Long History' })
+        .returning();
+
+      await db.insert(promptVersions).values(
+        Array.from({ length: 8 }, (_, i) => ({
+          templateId: template.id,
+          version: i + 1,
+          content: `content v${i + 1}`,
+          authorType: 'agent' as const,
+          authorName: 'tester',
+          status: i === 0 ? ('active' as const) : ('draft' as const),
+        }))
+      );
+
+      const res = await app.request('/dashboard/prompts', { headers: AUTH_HEADER });
+      const { data } = await res.json();
+
+      const entry = findBySlug(data, 'long-history');
+      expect(entry!.activeVersion).toMatchObject({ version: 1, status: 'active' });
+      expect(entry!.recentVersions.map((v) => v.version)).toEqual([8, 7, 6, 5, 4]);
+    });
+
     it('excludes soft-deleted templates', async () => {
       const db = getTestDb();
       const app = buildApp();
@@ -843,8 +906,9 @@ describe('dashboard API', () => {
         },
       ]);
 
+      // Bypass the short-TTL response cache populated by the first request
       const res = await app.request('/dashboard/prompts', {
-        headers: AUTH_HEADER,
+        headers: { ...AUTH_HEADER, 'Cache-Control': 'no-cache' },
       });
       const { data } = await res.json();
 
@@ -854,4 +918,47 @@ describe('dashboard API', () => {
       expect(findBySlug(data, 'deleted-template')).toBeUndefined();
     });
   });
+
+  describe('response caching', () => {
+    it('returns an ETag and answers a matching If-None-Match with 304', async () => {
+      const app = buildApp();
+
+      const first = await app.request('/dashboard/stats', { headers: AUTH_HEADER });
+      const tag = first.headers.get('etag');
+      expect(tag).toBeTruthy();
+      expect(first.headers.get('cache-control')).toBe('no-cache');
+
+      const second = await app.request('/dashboard/stats', {
+        headers: { ...AUTH_HEADER, 'If-None-Match': tag! },
+      });
+      expect(second.status).toBe(304);
+      expect(await second.text()).toBe('');
+    });
+
+    it('serves repeat requests from cache within the TTL', async () => {
+      const db = getTestDb();
+      const app = buildApp();
+
+      const before = await (await app.request('/dashboard/stats', { headers: AUTH_HEADER })).json();
+      await db.insert(issues).values({ title: 'After first poll', type: 'task', status: 'todo' });
+      const after = await (await app.request('/dashboard/stats', { headers: AUTH_HEADER })).json();
+
+      expect(after).toEqual(before);
+    });
+
+    it('recomputes when the client sends Cache-Control: no-cache', async () => {
+      const db = getTestDb();
+      const app = buildApp();
+
+      const before = await (await app.request('/dashboard/stats', { headers: AUTH_HEADER })).json();
+      await db.insert(issues).values({ title: 'After first poll', type: 'task', status: 'todo' });
+      const res = await app.request('/dashboard/stats', {
+        headers: { ...AUTH_HEADER, 'Cache-Control': 'no-cache' },
+      });
+      const after = await res.json();
+
+      expect(after.data.issues.total).toBe(before.data.issues.total + 1);
+      expect(res.headers.get('etag')).not.toBeNull();
+    });
+  });
 });
@@ -0,0 +1,233 @@
+import { Hono } from 'hono';
+import { eq } from 'drizzle-orm';
+import { describe, expect, it } from 'vitest';
+import { issues, issueRelations, issueTypeValues, projects, goals } from '../db/schema';
+import { apiKeyAuth } from '../middleware/auth';
+import { dispatchRoutes } from '../routes/dispatch';
+import { scoreIssue } from '../lib/priority-scoring';
+import { withTestDb, getTestDb, type TestAppEnv } from './setup';
+
+const AUTH_HEADER = { Authorization: 'Bearer loop_test-api-key' };
+const DAY_MS = 86_400_000;
+
+/** Creates a Hono app with auth + dispatch routes at /api/dispatch. */
+function buildApp() {
+  const app = new Hono<TestAppEnv>();
+  app.use('*', async (c, next) => {
+    c.set('db', getTestDb());
+    await next();
+  });
+  const api = new Hono<TestAppEnv>();
+  api.use('*', apiKeyAuth);
+  api.route('/dispatch', dispatchRoutes);
+  app.route('/api', api);
+  return app;
+}
+
+/** Seed a todo issue directly into the database. Returns the inserted row. */
+async function seedIssue(overrides: Partial<typeof issues.$inferInsert> = {}) {
+  const [row] = await getTestDb()
+    .insert(issues)
+    .values({ title: 'Seed Issue', type: 'task', status: 'todo', priority: 0, ...overrides })
+    .returning();
+  return row;
+}
+
+async function fetchIssue(id: string) {
+  const [row] = await getTestDb().select().from(issues).where(eq(issues.id, id));
+  return row;
+}
+
+// ─── Materialized score vs priority-scoring.ts ───────────────────────────────
+
+describe('materialized dispatch score', () => {
+  withTestDb();
+
+  it('matches scoreIssue for every priority, type and goal combination', async () => {
+    const db = getTestDb();
+    const [withGoal] = await db.insert(projects).values({ name: 'With Goal' }).returning();
+    const [withoutGoal] = await db.insert(projects).values({ name: 'Without Goal' }).returning();
+    await db.insert(goals).values({ title: 'Ship it', status: 'active', projectId: withGoal.id });
+
+    const projectIds = [withGoal.id, withoutGoal.id, null];
+    for (const priority of [0, 1, 2, 3, 4, 9]) {
+      for (const type of issueTypeValues) {
+        for (const projectId of projectIds) {
+          await seedIssue({ priority, type, projectId });
+        }
+      }
+    }
+
+    const rows = await db.select().from(issues);
+    expect(rows).toHaveLength(6 * issueTypeValues.length * projectIds.length);
+
+    for (const row of rows) {
+      const expected = scoreIssue({
+        priority: row.priority,
+        type: row.type,
+        createdAt: row.createdAt,
+        hasActiveGoal: row.projectId === withGoal.id,
+      });
+      expect(row.dispatchScoreBase).toBe(expected.total - expected.ageBonus);
+    }
+  });
+
+  it('recomputes the goal bonus when a goal is activated or abandoned', async () => {
+    const db = getTestDb();
+    const [project] = await db.insert(projects).values({ name: 'Project' }).returning();
+    const issue = await seedIssue({ priority: 3, type: 'task', projectId: project.id });
+    expect(issue.dispatchScoreBase).toBe(70);
+
+    const [goal] = await db
+      .insert(goals)
+      .values({ title: 'Goal', status: 'active', projectId: project.id })
+      .returning();
+    expect((await fetchIssue(issue.id)).dispatchScoreBase).toBe(90);
+
+    await db.update(goals).set({ status: 'abandoned' }).where(eq(goals.id, goal.id));
+    expect((await fetchIssue(issue.id)).dispatchScoreBase).toBe(70);
+  });
+
+  it('recomputes when priority changes', async () => {
+    const issue = await seedIssue({ priority: 4, type: 'monitor' });
+    await getTestDb().update(issues).set({ priority: 1 }).where(eq(issues.id, issue.id));
+
+    expect((await fetchIssue(issue.id)).dispatchScoreBase).toBe(110);
+  });
+});
+
+// ─── is_blocked maintenance ──────────────────────────────────────────────────
+
+describe('materialized is_blocked flag', () => {
+  withTestDb();
+
+  it('tracks blocked_by relations and blocker status', async () => {
+    const db = getTestDb();
+    const blocker = await seedIssue({ title: 'Blocker', status: 'in_progress' });
+    const blocked = await seedIssue({ title: 'Blocked' });
+    expect(blocked.isBlocked).toBe(false);
+
+    const [relation] = await db
+      .insert(issueRelations)
+      .values({ type: 'blocked_by', issueId: blocked.id, relatedIssueId: blocker.id })
+      .returning();
+    expect((await fetchIssue(blocked.id)).isBlocked).toBe(true);
+
+    await db.update(issues).set({ status: 'done' }).where(eq(issues.id, blocker.id));
+    expect((await fetchIssue(blocked.id)).isBlocked).toBe(false);
+
+    await db.update(issues).set({ status: 'todo' }).where(eq(issues.id, blocker.id));
+    expect((await fetchIssue(blocked.id)).isBlocked).toBe(true);
+
+    await db.delete(issueRelations).where(eq(issueRelations.id, relation.id));
+    expect((await fetchIssue(blocked.id)).isBlocked).toBe(false);
+  });
+
+  it('unblocks dependents when the blocker is soft-deleted', async () => {
+    const db = getTestDb();
+    const blocker = await seedIssue({ title: 'Blocker' });
+    const blocked = await seedIssue({ title: 'Blocked' });
+    await db
+      .insert(issueRelations)
+      .values({ type: 'blocked_by', issueId: blocked.id, relatedIssueId: blocker.id });
+    expect((await fetchIssue(blocked.id)).isBlocked).toBe(true);
+
+    await db.update(issues).set({ deletedAt: new Date() }).where(eq(issues.id, blocker.id));
+    expect((await fetchIssue(blocked.id)).isBlocked).toBe(false);
+  });
+});
+
+// ─── SQL ordering vs TS ordering ─────────────────────────────────────────────
+
+describe('dispatch ordering', () => {
+  withTestDb();
+
+  /** A mix where age outweighs priority for some rows, so both terms matter. */
+  async function seedMixedQueue() {
+    const db = getTestDb();
+    const [project] = await db.insert(projects).values({ name: 'Goal Project' }).returning();
+    await db.insert(goals).values({ title: 'Goal', status: 'active', projectId: project.id });
+
+    const now = Date.now();
+    const specs = [
+      { priority: 1, type: 'signal', ageDays: 0 },
+      { priority: 4, type: 'monitor', ageDays: 200 },
+      { priority: 2, type: 'task', ageDays: 30, projectId: project.id },
+      { priority: 3, type: 'plan', ageDays: 45.5 },
+      { priority: 0, type: 'hypothesis', ageDays: 12.25, projectId: project.id },
+      { priority: 2, type: 'signal', ageDays: 3 },
+      { priority: 3, type: 'task', ageDays: 0.5 },
+      { priority: 1, type: 'monitor', ageDays: 60 },
+    ] as const;
+
+    for (const [i, spec] of specs.entries()) {
+      await seedIssue({
+        title: `Issue ${i}`,
+        priority: spec.priority,
+        type: spec.type,
+        projectId: 'projectId' in spec ? spec.projectId : null,
+        createdAt: new Date(now - spec.ageDays * DAY_MS),
+      });
+    }
+
+    return { goalProjectId: project.id, count: specs.length };
+  }
+
+  it('GET /queue returns issues in the order scoreIssue ranks them', async () => {
+    const { goalProjectId, count } = await seedMixedQueue();
+    const rows = await getTestDb().select().from(issues);
+    const expectedScores = rows
+      .map(
+        (row) =>
+          scoreIssue({
+            priority: row.priority,
+            type: row.type,
+            createdAt: row.createdAt,
+            hasActiveGoal: row.projectId === goalProjectId,
+          }).total
+      )
+      .sort((a, b) => b - a);
+
+    const res = await buildApp().request('/api/dispatch/queue', { headers: AUTH_HEADER });
+    const body = await res.json();
+
+    expect(body.total).toBe(count);
+    expect(body.data.map((entry: { score: number }) => entry.score)).toEqual(expectedScores);
+  });
+
+  it('GET /queue pages are consecutive slices of the global order', async () => {
+    await seedMixedQueue();
+    const app = buildApp();
+
+    const full = await (
+      await app.request('/api/dispatch/queue?limit=200', { headers: AUTH_HEADER })
+    ).json();
+
+    const paged: string[] = [];
+    for (let offset = 0; offset < full.total; offset += 3) {
+      const res = await app.request(`/api/dispatch/queue?limit=3&offset=${offset}`, {
+        headers: AUTH_HEADER,
+      });
+      const body = await res.json();
+      paged.push(...body.data.map((entry: { issue: { id: string } }) => entry.issue.id));
+    }
+
+    expect(paged).toEqual(full.data.map((entry: { issue: { id: string } }) => entry.issue.id));
+  });
+
+  it('GET /next claims in the same order as the queue', async () => {
+    await seedMixedQueue();
+    const app = buildApp();
+
+    const queue = await (
+      await app.request('/api/dispatch/queue?limit=200', { headers: AUTH_HEADER })
+    ).json();
+    const batch = await (
+      await app.request('/api/dispatch/next?count=50', { headers: AUTH_HEADER })
+    ).json();
+
+    expect(batch.data.map((r: { issue: { id: string } }) => r.issue.id)).toEqual(
+      queue.data.map((entry: { issue: { id: string } }) => entry.issue.id)
+    );
+  });
+});
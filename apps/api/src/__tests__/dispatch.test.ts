@@ -246,6 +246,44 @@ describe('GET /api/dispatch/next', () => {
     expect(body.meta.templateSlug).toBe('signal-handler');
   });
 
+  it('picks up a promoted version without serving a stale cached template', async () => {
+    await seedIssue({ title: 'First Signal', type: 'signal', priority: 1 });
+    await seedIssue({ title: 'Second Signal', type: 'signal', priority: 2 });
+    const { template } = await seedTemplateWithVersion(
+      {
+        slug: 'signal-promoted',
+        name: 'Signal Promoted',
+        conditions: { type: 'signal' },
+        specificity: 50,
+      },
+      'v1: {{issue.title}}'
+    );
+
+    const app = buildApp();
+    const first = await app.request('/api/dispatch/next', { headers: AUTH_HEADER });
+    expect((await first.json()).prompt).toBe('v1: First Signal');
+
+    const created = await app.request(`/api/templates/${template.id}/versions`, {
+      method: 'POST',
+      headers: { ...AUTH_HEADER, 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        content: 'v2: {{issue.title}}',
+        authorType: 'human',
+        authorName: 'Tester',
+      }),
+    });
+    const { data: v2 } = await created.json();
+    await app.request(`/api/templates/${template.id}/versions/${v2.id}/promote`, {
+      method: 'POST',
+      headers: AUTH_HEADER,
+    });
+
+    const second = await app.request('/api/dispatch/next', { headers: AUTH_HEADER });
+    const body = await second.json();
+    expect(body.prompt).toBe('v2: Second Signal');
+    expect(body.meta.versionId).toBe(v2.id);
+  });
+
   it('returns prompt=null when no matching templates exist', async () => {
     // Soft-delete all seeded default templates so none match
     const db = getTestDb();
@@ -266,6 +304,105 @@ describe('GET /api/dispatch/next', () => {
   });
 });
 
+// ─── GET /api/dispatch/next?count=N ───────────────────────────────────────────
+
+describe('GET /api/dispatch/next?count=N', () => {
+  withTestDb();
+
+  it('claims up to N issues in priority order and hydrates each prompt', async () => {
+    await seedIssue({ title: 'Low', priority: 4 });
+    await seedIssue({ title: 'Urgent', priority: 1 });
+    await seedIssue({ title: 'Medium', priority: 3 });
+    await seedIssue({ title: 'High', priority: 2 });
+
+    const app = buildApp();
+    const res = await app.request('/api/dispatch/next?count=3', {
+      headers: AUTH_HEADER,
+    });
+
+    expect(res.status).toBe(200);
+    const body = await res.json();
+    expect(body.data).toHaveLength(3);
+    expect(body.data.map((d: { issue: { title: string } }) => d.issue.title)).toEqual([
+      'Urgent',
+      'High',
+      'Medium',
+    ]);
+    for (const item of body.data) {
+      expect(item.issue.status).toBe('in_progress');
+      expect(typeof item.prompt).toBe('string');
+      expect(item.meta.versionId).toBeDefined();
+    }
+
+    const db = getTestDb();
+    const remaining = await db.select().from(issues).where(eq(issues.status, 'todo'));
+    expect(remaining.map((r) => r.title)).toEqual(['Low']);
+  });
+
+  it('returns fewer items when the queue holds less than N', async () => {
+    await seedIssue({ title: 'Only One', priority: 2 });
+
+    const app = buildApp();
+    const res = await app.request('/api/dispatch/next?count=5', {
+      headers: AUTH_HEADER,
+    });
+
+    expect(res.status).toBe(200);
+    const body = await res.json();
+    expect(body.data).toHaveLength(1);
+    expect(body.data[0].issue.title).toBe('Only One');
+  });
+
+  it('returns 204 when no eligible issues exist', async () => {
+    const app = buildApp();
+    const res = await app.request('/api/dispatch/next?count=5', {
+      headers: AUTH_HEADER,
+    });
+
+    expect(res.status).toBe(204);
+  });
+
+  it('increments usage count once per issue rendered with a version', async () => {
+    await seedIssue({ title: 'Signal A', type: 'signal', priority: 1 });
+    await seedIssue({ title: 'Signal B', type: 'signal', priority: 2 });
+    const { version } = await seedTemplateWithVersion(
+      {
+        slug: 'signal-batch',
+        name: 'Signal Batch',
+        conditions: { type: 'signal' },
+        specificity: 50,
+      },
+      'Batch signal: {{issue.title}}'
+    );
+
+    const app = buildApp();
+    const res = await app.request('/api/dispatch/next?count=2', {
+      headers: AUTH_HEADER,
+    });
+
+    expect(res.status).toBe(200);
+    const body = await res.json();
+    expect(body.data[0].prompt).toContain('Batch signal: Signal A');
+    expect(body.data[1].prompt).toContain('Batch signal: Signal B');
+
+    const db = getTestDb();
+    const [updated] = await db
+      .select({ usageCount: promptVersions.usageCount })
+      .from(promptVersions)
+      .where(eq(promptVersions.id, version.id));
+    expect(updated.usageCount).toBe(2);
+  });
+
+  it('rejects count above the batch limit', async () => {
+    const app = buildApp();
+    const res = await app.request('/api/dispatch/next?count=1000', {
+      headers: AUTH_HEADER,
+    });
+
+    expect(res.status).toBe(400);
+  });
+});
+
 // ─── GET /api/dispatch/queue ──────────────────────────────────────────────────
 
 describe('GET /api/dispatch/queue', () => {
@@ -327,6 +464,17 @@ describe('GET /api/dispatch/queue', () => {
     expect(body2.data).toHaveLength(2);
     expect(body2.total).toBe(5);
   });
+
+  it('omits the total when includeTotal=false', async () => {
+    await seedIssue({ title: 'Only one', priority: 3 });
+
+    const res = await buildApp().request('/api/dispatch/queue?includeTotal=false', {
+      headers: AUTH_HEADER,
+    });
+    const body = await res.json();
+    expect(body.data).toHaveLength(1);
+    expect(body).not.toHaveProperty('total');
+  });
 });
 
 // ─── GET /api/templates/preview/:issueId ──────────────────────────────────────
@@ -365,6 +513,29 @@ describe('GET /api/templates/preview/:issueId', () => {
     expect(body.prompt).toContain('Preview Issue');
   });
 
+  it('falls back to a template conditioned on the issue type when nothing matches', async () => {
+    const issue = await seedIssue({ title: 'Unsourced Task', type: 'task' });
+    await seedTemplateWithVersion(
+      {
+        slug: 'sentry-task-template',
+        name: 'Sentry Task Template',
+        conditions: { type: 'task', signalSource: 'sentry' },
+        specificity: 20,
+      },
+      'Sentry task: {{issue.title}}'
+    );
+
+    const app = buildApp();
+    const res = await app.request(`/api/templates/preview/${issue.id}`, {
+      headers: AUTH_HEADER,
+    });
+
+    expect(res.status).toBe(200);
+    const body = await res.json();
+    expect(body.template.slug).toBe('sentry-task-template');
+    expect(body.prompt).toContain('Sentry task: Unsourced Task');
+  });
+
   it('returns 404 for non-existent issue', async () => {
     const app = buildApp();
     const res = await app.request('/api/templates/preview/nonexistent-id', {
@@ -43,6 +43,9 @@ describe('API env schema', () => {
       expect(result.data.NODE_ENV).toBe('development');
       expect(result.data.PORT).toBe(5667);
       expect(result.data.LOOP_URL).toBe('http://localhost:5667');
+      expect(result.data.SIGNAL_DEDUP_WINDOW_SECONDS).toBe(900);
+      expect(result.data.IDEMPOTENCY_STORE).toBe('memory');
+      expect(result.data.REQUEST_METRICS).toBe(false);
     }
   });
 
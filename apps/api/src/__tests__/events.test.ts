@@ -0,0 +1,364 @@
+import { Hono } from 'hono';
+import { PGlite } from '@electric-sql/pglite';
+import { EventEmitter } from 'node:events';
+import { afterEach, describe, expect, it, vi } from 'vitest';
+import { apiKeyAuth } from '../middleware/auth';
+import { issueRoutes } from '../routes/issues';
+import { dispatchRoutes } from '../routes/dispatch';
+import { eventRoutes } from '../routes/events';
+import { signalRoutes } from '../routes/signals';
+import { EventBus, EventSubscription, eventBus } from '../lib/event-bus';
+import type { LoopEvent } from '../lib/event-bus';
+import {
+  createPgEventTransport,
+  createReconnectingPgEventTransport,
+  EVENT_CHANNEL,
+} from '../lib/pg-event-transport';
+import type { ManagedConnection, NotifyConnection } from '../lib/pg-event-transport';
+import { withTestDb, getTestDb, type TestAppEnv } from './setup';
+
+const AUTH_HEADER = { Authorization: 'Bearer loop_test-api-key' };
+
+/** Creates a Hono app with auth + the routes that publish or consume events. */
+function buildApp() {
+  const app = new Hono<TestAppEnv>();
+  app.use('*', async (c, next) => {
+    c.set('db', getTestDb());
+    await next();
+  });
+  const api = new Hono<TestAppEnv>();
+  api.use('*', apiKeyAuth);
+  api.route('/issues', issueRoutes);
+  api.route('/signals', signalRoutes);
+  api.route('/dispatch', dispatchRoutes);
+  api.route('/events', eventRoutes);
+  app.route('/api', api);
+  return app;
+}
+
+/** Read an SSE response body until `pattern` matches the accumulated text. */
+async function readUntil(reader: ReadableStreamDefaultReader<Uint8Array>, pattern: RegExp) {
+  const decoder = new TextDecoder();
+  let text = '';
+  while (!pattern.test(text)) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    text += decoder.decode(value, { stream: true });
+  }
+  return text;
+}
+
+/** Parse the JSON `data:` lines of every message in an SSE chunk. */
+function parseEvents(text: string): LoopEvent[] {
+  return text
+    .split('\n')
+    .filter((line) => line.startsWith('data: {"id"'))
+    .map((line) => JSON.parse(line.slice('data: '.length)) as LoopEvent);
+}
+
+// ─── EventBus ────────────────────────────────────────────────────────────────
+
+describe('EventBus', () => {
+  it('delivers only the subscribed event types', () => {
+    const bus = new EventBus();
+    const received: string[] = [];
+    const unsubscribe = bus.subscribe((event) => received.push(event.type), ['issue.deleted']);
+
+    bus.publish('issue.deleted', { issueId: 'a' });
+    bus.publish('signal.ingested', {
+      signalId: 's',
+      issueId: 'a',
+      source: 'test',
+      type: 'x',
+      severity: 'low',
+      deduplicated: false,
+    });
+    unsubscribe();
+    bus.publish('issue.deleted', { issueId: 'b' });
+
+    expect(received).toEqual(['issue.deleted']);
+  });
+
+  it('replays events published after a known ID', () => {
+    const bus = new EventBus(3);
+    const [first, second, third] = ['a', 'b', 'c'].map((issueId) =>
+      bus.publish('issue.deleted', { issueId })
+    );
+
+    expect(bus.replay(first.id).map((e) => e.id)).toEqual([second.id, third.id]);
+    expect(bus.replay(third.id)).toEqual([]);
+
+    // Once an ID rolls out of the history window it can no longer be resumed from
+    bus.publish('issue.deleted', { issueId: 'd' });
+    expect(bus.replay(first.id)).toEqual([]);
+  });
+
+  it('buffers events for a subscription until taken', async () => {
+    const bus = new EventBus();
+    const subscription = new EventSubscription(bus);
+
+    bus.publish('issue.deleted', { issueId: 'a' });
+    const event = await subscription.take(0);
+    expect(event?.data).toEqual({ issueId: 'a' });
+
+    expect(await subscription.take(10)).toBeNull();
+    subscription.close();
+    expect(await subscription.take()).toBeNull();
+  });
+});
+
+// ─── GET /api/events ─────────────────────────────────────────────────────────
+
+describe('GET /api/events', () => {
+  withTestDb();
+
+  it('streams issue events published by route handlers', async () => {
+    const app = buildApp();
+    const res = await app.request('/api/events?types=issue.created', { headers: AUTH_HEADER });
+    expect(res.status).toBe(200);
+    expect(res.headers.get('content-type')).toContain('text/event-stream');
+
+    const reader = res.body!.getReader();
+    await readUntil(reader, /event: ready/);
+
+    const created = await app.request('/api/issues', {
+      method: 'POST',
+      headers: { ...AUTH_HEADER, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ title: 'Streamed issue', type: 'task' }),
+    });
+    const { data: issue } = await created.json();
+
+    const text = await readUntil(reader, /event: issue\.created[\s\S]*\n\n/);
+    await reader.cancel();
+
+    const [event] = parseEvents(text);
+    expect(event.type).toBe('issue.created');
+    expect(event.data).toMatchObject({ issueId: issue.id, title: 'Streamed issue' });
+  });
+
+  it('publishes signal and issue events for ingested signals', async () => {
+    const app = buildApp();
+    const subscription = new EventSubscription(eventBus, ['signal.ingested', 'issue.created']);
+
+    await app.request('/api/signals', {
+      method: 'POST',
+      headers: { ...AUTH_HEADER, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ source: 'test', type: 'spike', severity: 'high', payload: {} }),
+    });
+
+    const types = [(await subscription.take(0))?.type, (await subscription.take(0))?.type];
+    subscription.close();
+    expect(types).toEqual(['issue.created', 'signal.ingested']);
+  });
+
+  it('replays missed events after Last-Event-ID', async () => {
+    const app = buildApp();
+    const seen = eventBus.publish('issue.deleted', { issueId: 'seen' });
+    const missed = eventBus.publish('issue.deleted', { issueId: 'missed' });
+
+    const res = await app.request('/api/events', {
+      headers: { ...AUTH_HEADER, 'Last-Event-ID': seen.id },
+    });
+    const reader = res.body!.getReader();
+    const text = await readUntil(reader, new RegExp(`id: ${missed.id}`));
+    await reader.cancel();
+
+    expect(parseEvents(text).map((e) => e.id)).toEqual([missed.id]);
+  });
+
+  it('rejects unknown event types', async () => {
+    const res = await buildApp().request('/api/events?types=issue.exploded', {
+      headers: AUTH_HEADER,
+    });
+    expect(res.status).toBe(400);
+  });
+});
+
+// ─── GET /api/dispatch/next?wait ─────────────────────────────────────────────
+
+describe('GET /api/dispatch/next?wait', () => {
+  withTestDb();
+
+  it('blocks until an issue becomes claimable', async () => {
+    const app = buildApp();
+    const pending = app.request('/api/dispatch/next?wait=5', { headers: AUTH_HEADER });
+
+    // Let the long-poll make its first (empty) claim attempt before work arrives
+    await new Promise((resolve) => setTimeout(resolve, 50));
+    await app.request('/api/issues', {
+      method: 'POST',
+      headers: { ...AUTH_HEADER, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ title: 'Late work', type: 'task', status: 'todo' }),
+    });
+
+    const res = await pending;
+    expect(res.status).toBe(200);
+    expect((await res.json()).issue.title).toBe('Late work');
+  });
+
+  it('returns 204 once the wait elapses with nothing to claim', async () => {
+    const started = Date.now();
+    const res = await buildApp().request('/api/dispatch/next?wait=1', { headers: AUTH_HEADER });
+
+    expect(res.status).toBe(204);
+    expect(Date.now() - started).toBeGreaterThanOrEqual(900);
+  });
+
+  it('publishes issue.claimed for each claimed issue', async () => {
+    const app = buildApp();
+    await app.request('/api/issues', {
+      method: 'POST',
+      headers: { ...AUTH_HEADER, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ title: 'Claim me', type: 'task', status: 'todo' }),
+    });
+    const subscription = new EventSubscription(eventBus, ['issue.claimed']);
+
+    await app.request('/api/dispatch/next', { headers: AUTH_HEADER });
+
+    const event = await subscription.take(0);
+    subscription.close();
+    expect(event?.data).toMatchObject({ title: 'Claim me', status: 'in_progress' });
+  });
+
+  it('rejects waits longer than the maximum', async () => {
+    const res = await buildApp().request('/api/dispatch/next?wait=600', { headers: AUTH_HEADER });
+    expect(res.status).toBe(400);
+  });
+});
+
+// ─── LISTEN/NOTIFY transport ─────────────────────────────────────────────────
+
+describe('createPgEventTransport', () => {
+  const stops: Array<() => Promise<void>> = [];
+
+  afterEach(async () => {
+    await Promise.all(stops.splice(0).map((stop) => stop()));
+  });
+
+  /** Adapt a PGlite instance to the connection shape the transport expects. */
+  function pgliteConnection(client: PGlite): NotifyConnection {
+    return {
+      query: (text, values) => client.query(text, values),
+      on: (_event, listener) =>
+        client.onNotification((channel, payload) => listener({ channel, payload })),
+    };
+  }
+
+  it('fans events out to other instances without echoing them back', async () => {
+    const client = new PGlite();
+    const connection = pgliteConnection(client);
+    const local = new EventBus();
+    const remote = new EventBus();
+    stops.push(await local.connect(createPgEventTransport(connection)));
+    stops.push(await remote.connect(createPgEventTransport(connection)));
+
+    const localEvents = new EventSubscription(local);
+    const remoteEvents = new EventSubscription(remote);
+
+    const published = local.publish('issue.deleted', { issueId: 'fan-out' });
+
+    expect(await remoteEvents.take(1000)).toEqual(published);
+    expect(await localEvents.take(0)).toEqual(published);
+    expect(await localEvents.take(200)).toBeNull();
+
+    localEvents.close();
+    remoteEvents.close();
+  });
+});
+
+describe('createReconnectingPgEventTransport', () => {
+  /** In-memory stand-in for a `pg.Client` that can be made to drop. */
+  class FakeConnection extends EventEmitter implements ManagedConnection {
+    readonly queries: string[] = [];
+    ended = false;
+
+    async query(text: string) {
+      this.queries.push(text);
+      return {};
+    }
+
+    async end() {
+      this.ended = true;
+    }
+
+    /** Deliver a notification as another instance would. */
+    receive(event: LoopEvent) {
+      const payload = JSON.stringify({ origin: 'other-instance', event });
+      this.emit('notification', { channel: EVENT_CHANNEL, payload });
+    }
+  }
+
+  const event = (issueId: string) =>
+    ({
+      id: issueId,
+      type: 'issue.deleted',
+      data: { issueId },
+      timestamp: new Date().toISOString(),
+    }) as LoopEvent;
+
+  it('reconnects and LISTENs again after the connection drops', async () => {
+    const consoleError = vi.spyOn(console, 'error').mockImplementation(() => {});
+    const connections: FakeConnection[] = [];
+    let failNextOpen = false;
+    const open = vi.fn(async () => {
+      if (failNextOpen) {
+        failNextOpen = false;
+        throw new Error('connection refused');
+      }
+      const connection = new FakeConnection();
+      connections.push(connection);
+      return connection;
+    });
+
+    const bus = new EventBus();
+    const stop = await bus.connect(
+      createReconnectingPgEventTransport(open, { initialDelayMs: 5, maxDelayMs: 20 })
+    );
+    const events = new EventSubscription(bus);
+
+    connections[0].receive(event('before-drop'));
+    expect((await events.take(100))?.id).toBe('before-drop');
+
+    // The first reopen attempt fails and is retried with backoff
+    failNextOpen = true;
+    connections[0].emit('error', new Error('Connection terminated unexpectedly'));
+    connections[0].emit('end');
+    expect(connections[0].ended).toBe(true);
+
+    await vi.waitFor(() => expect(connections).toHaveLength(2), { timeout: 1000 });
+    await vi.waitFor(() => expect(connections[1].queries).toContain(`LISTEN "${EVENT_CHANNEL}"`));
+    expect(open).toHaveBeenCalledTimes(3);
+    expect(consoleError).toHaveBeenCalled();
+
+    connections[1].receive(event('after-reconnect'));
+    expect((await events.take(100))?.id).toBe('after-reconnect');
+
+    // Publishing goes out over the new connection
+    bus.publish('issue.deleted', { issueId: 'outgoing' });
+    await vi.waitFor(() => expect(connections[1].queries).toContain('SELECT pg_notify($1, $2)'));
+
+    events.close();
+    await stop();
+    expect(connections[1].ended).toBe(true);
+    consoleError.mockRestore();
+  });
+
+  it('stops reconnecting once stopped', async () => {
+    const consoleError = vi.spyOn(console, 'error').mockImplementation(() => {});
+    const connections: FakeConnection[] = [];
+    const open = async () => {
+      const connection = new FakeConnection();
+      connections.push(connection);
+      return connection;
+    };
+
+    const bus = new EventBus();
+    const stop = await bus.connect(createReconnectingPgEventTransport(open, { initialDelayMs: 5 }));
+    await stop();
+    connections[0].emit('end');
+
+    await new Promise((resolve) => setTimeout(resolve, 30));
+    expect(connections).toHaveLength(1);
+    consoleError.mockRestore();
+  });
+});
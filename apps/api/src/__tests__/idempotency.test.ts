@@ -0,0 +1,187 @@
+import { Hono } from 'hono';
+import { HTTPException } from 'hono/http-exception';
+import { describe, expect, it } from 'vitest';
+import { issues } from '../db/schema';
+import { apiKeyAuth } from '../middleware/auth';
+import { idempotency } from '../middleware/idempotency';
+import { MemoryIdempotencyStore, PostgresIdempotencyStore } from '../lib/idempotency-store';
+import type { IdempotencyStore } from '../lib/idempotency-store';
+import { issueRoutes } from '../routes/issues';
+import { withTestDb, getTestDb, type TestAppEnv } from './setup';
+
+const AUTH_HEADER = { Authorization: 'Bearer loop_test-api-key' };
+const JSON_HEADERS = { ...AUTH_HEADER, 'Content-Type': 'application/json' };
+
+/** Creates a Hono app with auth, idempotency and issue routes mounted at /api/issues. */
+function createApp(store: IdempotencyStore = new MemoryIdempotencyStore()) {
+  const app = new Hono<TestAppEnv>();
+
+  app.onError((err, c) => {
+    if (err instanceof HTTPException) {
+      return c.json({ error: err.message }, err.status);
+    }
+    return c.json({ error: 'Internal server error' }, 500);
+  });
+
+  app.use('*', async (c, next) => {
+    c.set('db', getTestDb());
+    await next();
+  });
+
+  const api = new Hono<TestAppEnv>();
+  api.use('*', apiKeyAuth);
+  api.use('*', idempotency({ store, lockWaitMs: 200 }));
+  api.route('/issues', issueRoutes);
+
+  let failures = 0;
+  /** Fails with a 500 on the first call and succeeds afterwards. */
+  api.post('/flaky', (c) => {
+    failures += 1;
+    if (failures === 1) throw new Error('boom');
+    return c.json({ attempt: failures }, 201);
+  });
+
+  app.route('/api', api);
+  return app;
+}
+
+/** POST an issue with the given key and body. */
+function postIssue(app: Hono<TestAppEnv>, key: string, title = 'Exactly once') {
+  return app.request('/api/issues', {
+    method: 'POST',
+    headers: { ...JSON_HEADERS, 'Idempotency-Key': key },
+    body: JSON.stringify({ title, type: 'task' }),
+  });
+}
+
+// ─── idempotency middleware ──────────────────────────────────────────────────
+
+describe('idempotency middleware', () => {
+  withTestDb();
+
+  it('replays the stored response for a repeated key', async () => {
+    const app = createApp();
+
+    const first = await postIssue(app, 'key-1');
+    expect(first.status).toBe(201);
+    expect(first.headers.get('Idempotent-Replayed')).toBeNull();
+
+    const second = await postIssue(app, 'key-1');
+    expect(second.status).toBe(201);
+    expect(second.headers.get('Idempotent-Replayed')).toBe('true');
+    expect(await second.json()).toEqual(await first.json());
+
+    expect(await getTestDb().select().from(issues)).toHaveLength(1);
+  });
+
+  it('runs concurrent requests with the same key once', async () => {
+    const app = createApp();
+
+    const responses = await Promise.all([1, 2, 3].map(() => postIssue(app, 'key-2')));
+    const bodies = await Promise.all(responses.map((res) => res.json()));
+
+    expect(responses.map((res) => res.status)).toEqual([201, 201, 201]);
+    expect(new Set(bodies.map((body) => body.data.id)).size).toBe(1);
+    expect(await getTestDb().select().from(issues)).toHaveLength(1);
+  });
+
+  it('rejects a key reused with a different body', async () => {
+    const app = createApp();
+    await postIssue(app, 'key-3', 'Original');
+
+    const res = await postIssue(app, 'key-3', 'Changed');
+    expect(res.status).toBe(422);
+  });
+
+  it('does not store server errors, so a retry runs again', async () => {
+    const app = createApp();
+    const request = () =>
+      app.request('/api/flaky', {
+        method: 'POST',
+        headers: { ...AUTH_HEADER, 'Idempotency-Key': 'key-4' },
+      });
+
+    expect((await request()).status).toBe(500);
+
+    const retried = await request();
+    expect(retried.status).toBe(201);
+    expect(await retried.json()).toEqual({ attempt: 2 });
+
+    const replayed = await request();
+    expect(replayed.headers.get('Idempotent-Replayed')).toBe('true');
+    expect(await replayed.json()).toEqual({ attempt: 2 });
+  });
+
+  it('ignores requests without a key', async () => {
+    const app = createApp();
+    const create = () =>
+      app.request('/api/issues', {
+        method: 'POST',
+        headers: JSON_HEADERS,
+        body: JSON.stringify({ title: 'No key', type: 'task' }),
+      });
+
+    await create();
+    await create();
+    expect(await getTestDb().select().from(issues)).toHaveLength(2);
+  });
+
+  it('returns 409 while another instance holds the key', async () => {
+    // A store in which the key stays reserved by a request that never finishes
+    const held: IdempotencyStore = {
+      reserve: async (_key, fingerprint) => ({ fingerprint, response: null }),
+      get: async () => ({ fingerprint: 'held', response: null }),
+      complete: async () => {},
+      release: async () => {},
+    };
+
+    const res = await postIssue(createApp(held), 'key-5');
+    expect(res.status).toBe(409);
+    expect(await getTestDb().select().from(issues)).toHaveLength(0);
+  });
+});
+
+// ─── PostgresIdempotencyStore ────────────────────────────────────────────────
+
+describe('PostgresIdempotencyStore', () => {
+  withTestDb();
+
+  it('lets exactly one caller reserve a key', async () => {
+    const store = new PostgresIdempotencyStore(getTestDb());
+
+    expect(await store.reserve('pg-1', 'abc')).toBeNull();
+    expect(await store.reserve('pg-1', 'abc')).toEqual({ fingerprint: 'abc', response: null });
+  });
+
+  it('stores completed responses and keeps them past release', async () => {
+    const store = new PostgresIdempotencyStore(getTestDb());
+    const response = { status: 201, headers: { 'Content-Type': 'application/json' }, body: '{}' };
+
+    await store.reserve('pg-2', 'abc');
+    await store.complete('pg-2', response);
+    await store.release('pg-2');
+
+    expect(await store.get('pg-2')).toEqual({ fingerprint: 'abc', response });
+  });
+
+  it('frees a released or abandoned reservation', async () => {
+    const store = new PostgresIdempotencyStore(getTestDb(), { lockTimeoutMs: 0 });
+
+    await store.reserve('pg-3', 'abc');
+    await new Promise((resolve) => setTimeout(resolve, 5));
+    expect(await store.reserve('pg-3', 'def')).toBeNull();
+
+    await store.release('pg-3');
+    expect(await store.get('pg-3')).toBeNull();
+  });
+
+  it('replays through the middleware', async () => {
+    const app = createApp(new PostgresIdempotencyStore(getTestDb()));
+
+    await postIssue(app, 'pg-4');
+    const replayed = await postIssue(app, 'pg-4');
+
+    expect(replayed.headers.get('Idempotent-Replayed')).toBe('true');
+    expect(await getTestDb().select().from(issues)).toHaveLength(1);
+  });
+});
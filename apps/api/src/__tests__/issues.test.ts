@@ -1,7 +1,7 @@
 import { Hono } from 'hono';
 import { HTTPException } from 'hono/http-exception';
 import { describe, expect, it } from 'vitest';
-import { labels } from '../db/schema';
+import { issues, labels } from '../db/schema';
 import { apiKeyAuth } from '../middleware/auth';
 import { issueRoutes } from '../routes/issues';
 import { withTestDb, getTestDb, type TestAppEnv } from './setup';
@@ -269,6 +269,73 @@ describe('Issues CRUD', () => {
     expect(body.total).toBe(3);
   });
 
+  it('walks every issue by cursor, including rows created in the same instant', async () => {
+    const app = createIssueApp();
+    // One statement gives every row the same created_at, so only the id breaks ties
+    await getTestDb()
+      .insert(issues)
+      .values(['A', 'B', 'C', 'D', 'E'].map((title) => ({ title, type: 'task' as const })));
+
+    const seen: string[] = [];
+    let cursor: string | null = null;
+    do {
+      const query: string = cursor ? `limit=2&cursor=${cursor}` : 'limit=2';
+      const res = await app.request(`/api/issues?${query}`, { headers: AUTH_HEADER });
+      const body = await res.json();
+      expect(res.status).toBe(200);
+      seen.push(...body.data.map((issue: { id: string }) => issue.id));
+      cursor = body.nextCursor;
+    } while (cursor);
+
+    const expected = (await getTestDb().select({ id: issues.id }).from(issues))
+      .map((row) => row.id)
+      .sort();
+    expect(seen).toEqual(expected);
+  });
+
+  it('orders by number and omits total when includeTotal=false', async () => {
+    const app = createIssueApp();
+    await createIssue(app, { title: 'First' });
+    await createIssue(app, { title: 'Second' });
+
+    const res = await app.request('/api/issues?orderBy=number&limit=1&includeTotal=false', {
+      headers: AUTH_HEADER,
+    });
+    const body = await res.json();
+    expect(body).not.toHaveProperty('total');
+    expect(body.data[0].title).toBe('First');
+
+    const next = await app.request(`/api/issues?orderBy=number&cursor=${body.nextCursor}`, {
+      headers: AUTH_HEADER,
+    });
+    const nextBody = await next.json();
+    expect(nextBody.data.map((issue: { title: string }) => issue.title)).toEqual(['Second']);
+    expect(nextBody.nextCursor).toBeNull();
+    expect(nextBody.total).toBe(2);
+  });
+
+  it('rejects malformed cursors and cursors from another sort order', async () => {
+    const app = createIssueApp();
+    await createIssue(app, { title: 'One' });
+    await createIssue(app, { title: 'Two' });
+
+    const page = await app.request('/api/issues?limit=1', { headers: AUTH_HEADER });
+    const { nextCursor } = await page.json();
+
+    const wrongOrder = await app.request(`/api/issues?orderBy=number&cursor=${nextCursor}`, {
+      headers: AUTH_HEADER,
+    });
+    expect(wrongOrder.status).toBe(400);
+
+    const garbage = await app.request('/api/issues?cursor=not-a-cursor', { headers: AUTH_HEADER });
+    expect(garbage.status).toBe(400);
+
+    const withOffset = await app.request(`/api/issues?offset=1&cursor=${nextCursor}`, {
+      headers: AUTH_HEADER,
+    });
+    expect(withOffset.status).toBe(400);
+  });
+
   // ─── GET /api/issues/:id ─────────────────────────────────────────────────────
 
   it('gets an issue by ID with parent, children, labels, and relations', async () => {
@@ -46,6 +46,7 @@ describe('generateOpenApiDocument', () => {
       'Prompt Reviews',
       'Dispatch',
       'Dashboard',
+      'Events',
       'Webhooks',
     ];
     for (const tag of expectedTags) {
@@ -119,6 +120,7 @@ describe('registered paths', () => {
     ['/api/templates/preview/{issueId}', 'get'],
     // Prompt reviews
     ['/api/prompt-reviews', 'post'],
+    ['/api/prompt-reviews/batch', 'post'],
     // Dispatch
     ['/api/dispatch/next', 'get'],
     ['/api/dispatch/queue', 'get'],
@@ -126,6 +128,9 @@ describe('registered paths', () => {
     ['/api/dashboard/stats', 'get'],
     ['/api/dashboard/activity', 'get'],
     ['/api/dashboard/prompts', 'get'],
+    ['/api/dashboard/metrics', 'get'],
+    // Events
+    ['/api/events', 'get'],
     // Webhooks
     ['/api/signals/posthog', 'post'],
     ['/api/signals/github', 'post'],
@@ -1,7 +1,7 @@
 import { describe, expect, it } from 'vitest';
 import { createTestApp, withTestDb, getTestDb } from './setup';
 import { promptReviewRoutes } from '../routes/prompt-reviews';
-import { promptTemplates, promptVersions, issues } from '../db/schema';
+import { promptTemplates, promptVersions, promptReviews, issues } from '../db/schema';
 import { apiKeyAuth } from '../middleware/auth';
 import { HTTPException } from 'hono/http-exception';
 import { ZodError } from 'zod';
@@ -440,4 +440,156 @@ describe('prompt reviews', () => {
       .where(sql`${issues.title} LIKE ${'Improve prompt template: ' + template.slug + '%'}`);
     expect(afterTwo).toHaveLength(0);
   });
+
+  // ─── Review aggregate ─────────────────────────────────────────────────────
+
+  it('maintains the review count and per-dimension sums on the version', async () => {
+    const db = getTestDb();
+    const { version } = await seedTemplateAndVersion();
+    const app = buildApp();
+
+    for (const [clarity, completeness, relevance] of [
+      [4, 5, 3],
+      [2, 3, 5],
+    ]) {
+      await app.request('/prompt-reviews', {
+        method: 'POST',
+        headers: JSON_HEADERS,
+        body: JSON.stringify({
+          versionId: version.id,
+          issueId: 'issue-agg',
+          clarity,
+          completeness,
+          relevance,
+          authorType: 'agent',
+        }),
+      });
+    }
+
+    const [v] = await db.select().from(promptVersions).where(eq(promptVersions.id, version.id));
+    expect(v.reviewCount).toBe(2);
+    expect(v.claritySum).toBe(6);
+    expect(v.completenessSum).toBe(8);
+    expect(v.relevanceSum).toBe(8);
+  });
+
+  it('does not lose updates when reviews arrive concurrently', async () => {
+    const db = getTestDb();
+    const { version } = await seedTemplateAndVersion();
+    const app = buildApp();
+
+    const responses = await Promise.all(
+      Array.from({ length: 10 }, (_, i) =>
+        app.request('/prompt-reviews', {
+          method: 'POST',
+          headers: JSON_HEADERS,
+          body: JSON.stringify({
+            versionId: version.id,
+            issueId: `issue-concurrent-${i}`,
+            clarity: 4,
+            completeness: 4,
+            relevance: 4,
+            authorType: 'agent',
+          }),
+        })
+      )
+    );
+    expect(responses.every((res) => res.status === 201)).toBe(true);
+
+    const [v] = await db.select().from(promptVersions).where(eq(promptVersions.id, version.id));
+    const [{ reviews }] = await db
+      .select({ reviews: count() })
+      .from(promptReviews)
+      .where(eq(promptReviews.versionId, version.id));
+    expect(v.reviewCount).toBe(10);
+    expect(reviews).toBe(10);
+    expect(v.reviewScore).toBeCloseTo(4.0, 5);
+  });
+
+  // ─── POST /prompt-reviews/batch ────────────────────────────────────────
+
+  it('applies a batch to the EWMA in submission order', async () => {
+    const db = getTestDb();
+    const { version } = await seedTemplateAndVersion();
+    const app = buildApp();
+
+    // Composites 3.0, 5.0, 2.0 → 3.0, then 0.3*5 + 0.7*3 = 3.6, then 0.3*2 + 0.7*3.6 = 3.12
+    const res = await app.request('/prompt-reviews/batch', {
+      method: 'POST',
+      headers: JSON_HEADERS,
+      body: JSON.stringify({
+        reviews: [3, 5, 2].map((score, i) => ({
+          versionId: version.id,
+          issueId: `issue-batch-${i}`,
+          clarity: score,
+          completeness: score,
+          relevance: score,
+          authorType: 'agent',
+        })),
+      }),
+    });
+
+    expect(res.status).toBe(201);
+    const { data } = await res.json();
+    expect(data.map((review: { issueId: string }) => review.issueId)).toEqual([
+      'issue-batch-0',
+      'issue-batch-1',
+      'issue-batch-2',
+    ]);
+
+    const [v] = await db.select().from(promptVersions).where(eq(promptVersions.id, version.id));
+    expect(v.reviewScore).toBeCloseTo(3.12, 5);
+    expect(v.reviewCount).toBe(3);
+  });
+
+  it('rejects a whole batch that names an unknown version', async () => {
+    const db = getTestDb();
+    const { version } = await seedTemplateAndVersion();
+    const app = buildApp();
+
+    const review = { issueId: 'issue-1', clarity: 3, completeness: 3, relevance: 3 };
+    const res = await app.request('/prompt-reviews/batch', {
+      method: 'POST',
+      headers: JSON_HEADERS,
+      body: JSON.stringify({
+        reviews: [
+          { ...review, versionId: version.id, authorType: 'agent' },
+          { ...review, versionId: 'nonexistent', authorType: 'agent' },
+        ],
+      }),
+    });
+
+    expect(res.status).toBe(404);
+    const [v] = await db.select().from(promptVersions).where(eq(promptVersions.id, version.id));
+    expect(v.reviewCount).toBe(0);
+    expect(await db.select().from(promptReviews)).toHaveLength(0);
+  });
+
+  it('opens one improvement issue when a batch crosses the thresholds', async () => {
+    const db = getTestDb();
+    const { template, version } = await seedTemplateAndVersion();
+    const app = buildApp();
+
+    await app.request('/prompt-reviews/batch', {
+      method: 'POST',
+      headers: JSON_HEADERS,
+      body: JSON.stringify({
+        reviews: [1, 2, 3, 4].map((i) => ({
+          versionId: version.id,
+          issueId: `issue-batch-low-${i}`,
+          clarity: 2,
+          completeness: 2,
+          relevance: 2,
+          authorType: 'agent',
+        })),
+      }),
+    });
+
+    const improvementIssues = await db
+      .select()
+      .from(issues)
+      .where(sql`${issues.title} LIKE ${'Improve prompt template: ' + template.slug + '%'}`);
+    expect(improvementIssues).toHaveLength(1);
+    expect(improvementIssues[0].title).toContain('4 reviews since v1');
+  });
 });
@@ -0,0 +1,127 @@
+import { describe, expect, it } from 'vitest';
+import { HTTPException } from 'hono/http-exception';
+import { createTestApp, withTestDb, getTestDb } from './setup';
+import { issues } from '../db/schema';
+import { apiKeyAuth } from '../middleware/auth';
+import { requestTiming } from '../middleware/request-timing';
+import { RequestMetrics, LATENCY_BUCKETS_MS } from '../lib/request-metrics';
+import { issueRoutes } from '../routes/issues';
+import { dashboardRoutes } from '../routes/dashboard';
+
+const AUTH_HEADER = { Authorization: 'Bearer loop_test-api-key' };
+
+/** Mounts issue and dashboard routes behind `requestTiming`, optionally recording metrics. */
+function buildApp(metrics?: RequestMetrics) {
+  const app = createTestApp();
+  app.onError((err, c) => {
+    if (err instanceof HTTPException) {
+      return c.json({ error: err.message }, err.status);
+    }
+    return c.json({ error: 'Internal server error' }, 500);
+  });
+  app.use('*', apiKeyAuth);
+  app.use('*', requestTiming({ metrics }));
+  app.route('/issues', issueRoutes);
+  app.route('/dashboard', dashboardRoutes);
+  return app;
+}
+
+/** Parse a `Server-Timing` header into `{ name: { dur, desc } }`. */
+function parseServerTiming(header: string | null) {
+  const metrics: Record<string, { dur: number; desc?: string }> = {};
+  for (const entry of (header ?? '').split(',')) {
+    const [name, ...params] = entry.trim().split(';');
+    const fields = Object.fromEntries(params.map((param) => param.split('=')));
+    metrics[name] = { dur: Number(fields.dur), desc: fields.desc?.replace(/"/g, '') };
+  }
+  return metrics;
+}
+
+describe('request timing', () => {
+  withTestDb();
+
+  it('reports query count and durations in Server-Timing', async () => {
+    await getTestDb()
+      .insert(issues)
+      .values([
+        { title: 'One', type: 'task' },
+        { title: 'Two', type: 'task' },
+      ]);
+    const app = buildApp();
+
+    const res = await app.request('/issues', { headers: AUTH_HEADER });
+    expect(res.status).toBe(200);
+
+    const timing = parseServerTiming(res.headers.get('Server-Timing'));
+    expect(timing.db.desc).toBe('2 queries');
+    expect(timing.db.dur).toBeGreaterThan(0);
+    expect(timing.total.dur).toBeGreaterThanOrEqual(timing.db.dur);
+    expect(timing.app.dur).toBeGreaterThanOrEqual(0);
+  });
+
+  it('attributes queries to the request that issued them', async () => {
+    const app = buildApp();
+
+    const [withTotal, withoutTotal] = await Promise.all([
+      app.request('/issues', { headers: AUTH_HEADER }),
+      app.request('/issues?includeTotal=false', { headers: AUTH_HEADER }),
+    ]);
+
+    expect(parseServerTiming(withTotal.headers.get('Server-Timing')).db.desc).toBe('2 queries');
+    expect(parseServerTiming(withoutTotal.headers.get('Server-Timing')).db.desc).toBe(
+      '1 queries'
+    );
+  });
+
+  it('returns 404 from /dashboard/metrics when metrics are not enabled', async () => {
+    const res = await buildApp().request('/dashboard/metrics', { headers: AUTH_HEADER });
+    expect(res.status).toBe(404);
+  });
+
+  it('records per-route histograms keyed by route pattern', async () => {
+    const app = buildApp(new RequestMetrics());
+    const [issue] = await getTestDb()
+      .insert(issues)
+      .values({ title: 'One', type: 'task' })
+      .returning();
+
+    await app.request('/issues', { headers: AUTH_HEADER });
+    await app.request('/issues', { headers: AUTH_HEADER });
+    await app.request(`/issues/${issue.id}`, { headers: AUTH_HEADER });
+    await app.request('/issues/missing', { headers: AUTH_HEADER });
+
+    const res = await app.request('/dashboard/metrics', { headers: AUTH_HEADER });
+    expect(res.status).toBe(200);
+    const { data } = await res.json();
+
+    const list = data.routes.find((r: { route: string }) => r.route === 'GET /issues');
+    expect(list.count).toBe(2);
+    expect(list.meanQueries).toBe(2);
+    expect(list.histogram).toHaveLength(LATENCY_BUCKETS_MS.length + 1);
+    const histogramTotal = list.histogram.reduce(
+      (sum: number, bucket: { count: number }) => sum + bucket.count,
+      0
+    );
+    expect(histogramTotal).toBe(2);
+
+    const detail = data.routes.find((r: { route: string }) => r.route === 'GET /issues/:id');
+    expect(detail.count).toBe(2);
+  });
+});
+
+describe('RequestMetrics', () => {
+  it('estimates percentiles from bucket bounds', () => {
+    const metrics = new RequestMetrics();
+    const sample = { status: 200, dbMs: 1, queries: 1 };
+    for (let i = 0; i < 98; i++) metrics.record('GET /x', { ...sample, durationMs: 3 });
+    metrics.record('GET /x', { ...sample, durationMs: 40 });
+    metrics.record('GET /x', { ...sample, durationMs: 9000 });
+
+    const [route] = metrics.snapshot().routes;
+    expect(route.p50Ms).toBe(5);
+    expect(route.p95Ms).toBe(5);
+    expect(route.p99Ms).toBe(50);
+    expect(route.maxMs).toBe(9000);
+    expect(route.histogram[route.histogram.length - 1]).toEqual({ leMs: null, count: 1 });
+  });
+});
@@ -6,6 +6,7 @@ import path from 'node:path';
 import { fileURLToPath } from 'node:url';
 import { afterEach, beforeEach } from 'vitest';
 import * as schema from '../db/schema';
+import { instrumentClient, queryCounter } from '../lib/query-metrics';
 
 // Set the API key env var so auth middleware passes in all tests.
 // This mirrors the LOOP_API_KEY secret used in production.
@@ -35,13 +36,14 @@ export function getTestDb(): DbType {
 
 /**
  * Creates an isolated in-memory PGlite database with the full schema applied
- * via Drizzle migrations.
+ * via Drizzle migrations. The client is instrumented like the production one, so
+ * `requestTiming()` reports query counts in tests too.
  *
  * @returns A Drizzle `PgliteDatabase` instance backed by in-memory PGlite.
  */
 async function createIsolatedDb(): Promise<DbType> {
-  const client = new PGlite();
-  const instance = drizzle(client, { schema });
+  const client = instrumentClient(new PGlite());
+  const instance = drizzle(client, { schema, logger: queryCounter });
 
   // Apply all pending migrations so the schema matches production.
   // Run `npm run db:generate` to regenerate migrations after schema changes.
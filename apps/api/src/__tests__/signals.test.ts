@@ -7,6 +7,7 @@ import { signals } from '../db/schema/signals';
 import { issues } from '../db/schema/issues';
 import { apiKeyAuth } from '../middleware/auth';
 import { signalRoutes } from '../routes/signals';
+import { ingestSignals, type SignalInput } from '../lib/signal-ingest';
 import { withTestDb, getTestDb, type TestAppEnv } from './setup';
 
 const AUTH_HEADER = { Authorization: 'Bearer loop_test-api-key' };
@@ -244,3 +245,168 @@ describe('Signal Ingestion', () => {
     expect(res.status).toBe(400);
   });
 });
+
+// ─── Deduplication ───────────────────────────────────────────────────────────
+
+describe('Signal deduplication', () => {
+  withTestDb();
+
+  it('coalesces a repeat into the existing signal and issue', async () => {
+    const app = createSignalApp();
+    const first = await postSignal(app, { sourceId: 'err-1' });
+    const repeat = await postSignal(app, {
+      sourceId: 'err-1',
+      payload: { message: 'Something broke again' },
+    });
+
+    expect(first.res.status).toBe(201);
+    expect(repeat.res.status).toBe(200);
+    expect(repeat.body.data.deduplicated).toBe(true);
+    expect(repeat.body.data.signal.id).toBe(first.body.data.signal.id);
+    expect(repeat.body.data.issue.id).toBe(first.body.data.issue.id);
+
+    const db = getTestDb();
+    const [signal] = await db.select().from(signals);
+    expect(signal.occurrences).toBe(2);
+    expect(signal.payload).toEqual({ message: 'Something broke again' });
+    expect(await db.select().from(issues)).toHaveLength(1);
+  });
+
+  it('keeps signals with a different type or no sourceId separate', async () => {
+    const app = createSignalApp();
+    await postSignal(app, { sourceId: 'err-1' });
+    const otherType = await postSignal(app, { sourceId: 'err-1', type: 'warning' });
+    await postSignal(app);
+    const noSourceId = await postSignal(app);
+
+    expect(otherType.res.status).toBe(201);
+    expect(noSourceId.res.status).toBe(201);
+    expect(await getTestDb().select().from(signals)).toHaveLength(4);
+  });
+
+  it('creates a new issue once the linked issue is closed', async () => {
+    const app = createSignalApp();
+    const first = await postSignal(app, { sourceId: 'err-1' });
+    await getTestDb()
+      .update(issues)
+      .set({ status: 'done' })
+      .where(eq(issues.id, first.body.data.issue.id));
+
+    const repeat = await postSignal(app, { sourceId: 'err-1' });
+
+    expect(repeat.res.status).toBe(201);
+    expect(repeat.body.data.issue.id).not.toBe(first.body.data.issue.id);
+  });
+
+  it('only coalesces within the dedup window', async () => {
+    const db = getTestDb();
+    const input: SignalInput = {
+      source: 'sentry',
+      sourceId: 'err-1',
+      type: 'error',
+      severity: 'high',
+      payload: {},
+      projectId: null,
+      title: 'Sentry error',
+    };
+
+    const [first] = await ingestSignals(db, [input], { dedupWindowMs: 60_000 });
+    await db
+      .update(signals)
+      .set({ lastSeenAt: new Date(Date.now() - 120_000) })
+      .where(eq(signals.id, first.signal.id));
+
+    const [late] = await ingestSignals(db, [input], { dedupWindowMs: 60_000 });
+    expect(late.deduplicated).toBe(false);
+
+    const disabled = await ingestSignals(db, [input, input], { dedupWindowMs: 0 });
+    expect(disabled.map((r) => r.deduplicated)).toEqual([false, false]);
+    expect(await db.select().from(signals)).toHaveLength(4);
+  });
+});
+
+// ─── POST /api/signals/batch ─────────────────────────────────────────────────
+
+describe('POST /api/signals/batch', () => {
+  withTestDb();
+
+  async function postBatch(app: Hono<TestAppEnv>, batch: Record<string, unknown>[]) {
+    const res = await app.request('/api/signals/batch', {
+      method: 'POST',
+      headers: JSON_HEADERS,
+      body: JSON.stringify({ signals: batch }),
+    });
+    return { res, body: await res.json() };
+  }
+
+  const signal = (overrides: Record<string, unknown> = {}) => ({
+    source: 'sentry',
+    type: 'error',
+    severity: 'high',
+    payload: { message: 'Boom' },
+    ...overrides,
+  });
+
+  it('creates one signal and issue per distinct key and reports results in order', async () => {
+    const app = createSignalApp();
+    const { res, body } = await postBatch(app, [
+      signal({ sourceId: 'a' }),
+      signal({ sourceId: 'b' }),
+      signal({ sourceId: 'a', payload: { message: 'Boom again' } }),
+      signal(),
+    ]);
+
+    expect(res.status).toBe(201);
+    expect(body.created).toBe(3);
+    expect(body.deduplicated).toBe(1);
+    expect(body.data.map((r: { deduplicated: boolean }) => r.deduplicated)).toEqual([
+      false,
+      false,
+      true,
+      false,
+    ]);
+    expect(body.data[2].signalId).toBe(body.data[0].signalId);
+
+    const db = getTestDb();
+    const [signalA] = await db.select().from(signals).where(eq(signals.id, body.data[0].signalId));
+    expect(signalA.occurrences).toBe(2);
+    expect(signalA.payload).toEqual({ message: 'Boom again' });
+
+    const [issueA] = await db.select().from(issues).where(eq(issues.id, body.data[0].issueId));
+    expect(issueA.priority).toBe(2);
+    expect(issueA.status).toBe('triage');
+    expect(await db.select().from(issues)).toHaveLength(3);
+  });
+
+  it('coalesces a batch into signals from earlier requests and returns 200', async () => {
+    const app = createSignalApp();
+    const single = await postSignal(app, signal({ sourceId: 'storm' }));
+
+    const { res, body } = await postBatch(
+      app,
+      Array.from({ length: 20 }, () => signal({ sourceId: 'storm' }))
+    );
+
+    expect(res.status).toBe(200);
+    expect(body.created).toBe(0);
+    expect(body.deduplicated).toBe(20);
+    const issueIds = new Set(body.data.map((r: { issueId: string }) => r.issueId));
+    expect([...issueIds]).toEqual([single.body.data.issue.id]);
+
+    const [stored] = await getTestDb().select().from(signals);
+    expect(stored.occurrences).toBe(21);
+  });
+
+  it('rejects an empty batch', async () => {
+    const { res } = await postBatch(createSignalApp(), []);
+    expect(res.status).toBe(400);
+  });
+
+  it('rejects the whole batch when one signal is invalid', async () => {
+    const app = createSignalApp();
+    const { res } = await postBatch(app, [signal(), signal({ severity: 'ultra' })]);
+
+    expect(res.status).toBe(400);
+    expect(await getTestDb().select().from(signals)).toHaveLength(0);
+  });
+});
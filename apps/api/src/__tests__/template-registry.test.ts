@@ -0,0 +1,138 @@
+import { describe, it, expect } from 'vitest';
+import { selectTemplate, type IssueContext } from '../lib/prompt-engine';
+import {
+  buildTemplateIndex,
+  selectFromIndex,
+  selectPreviewFromIndex,
+  type RegisteredTemplate,
+} from '../lib/template-registry';
+import { LruCache } from '../lib/lru-cache';
+
+const baseContext: IssueContext = {
+  type: 'signal',
+  signalSource: 'posthog',
+  labels: ['frontend', 'urgent'],
+  projectId: 'proj_1',
+  hasFailedSessions: false,
+  hypothesisConfidence: null,
+};
+
+let position = 0;
+const makeTemplate = (overrides: Partial<RegisteredTemplate>): RegisteredTemplate => ({
+  id: `tpl_${position}`,
+  slug: `tpl-${position}`,
+  name: 'Template',
+  conditions: {},
+  specificity: 10,
+  projectId: null,
+  activeVersionId: 'ver_1',
+  position: position++,
+  ...overrides,
+});
+
+describe('selectFromIndex', () => {
+  it('matches templates in every bucket the context points to', () => {
+    const templates = [
+      makeTemplate({ id: 'generic', specificity: 1 }),
+      makeTemplate({ id: 'by-type', conditions: { type: 'signal' }, specificity: 20 }),
+      makeTemplate({ id: 'by-source', conditions: { signalSource: 'posthog' }, specificity: 30 }),
+      makeTemplate({ id: 'by-label', conditions: { labels: ['urgent'] }, specificity: 40 }),
+      makeTemplate({ id: 'other-type', conditions: { type: 'task' }, specificity: 99 }),
+    ];
+    const index = buildTemplateIndex(templates);
+
+    expect(selectFromIndex(index, baseContext)?.id).toBe('by-label');
+  });
+
+  it('skips templates without an active version', () => {
+    const index = buildTemplateIndex([
+      makeTemplate({ id: 'inactive', specificity: 100, activeVersionId: null }),
+      makeTemplate({ id: 'active', specificity: 1 }),
+    ]);
+
+    expect(selectFromIndex(index, baseContext)?.id).toBe('active');
+  });
+
+  it('agrees with a full selectTemplate scan on a mixed template set', () => {
+    const templates = [
+      makeTemplate({ id: 'a', conditions: { type: 'signal', signalSource: 'posthog' } }),
+      makeTemplate({ id: 'b', conditions: { type: 'signal' }, specificity: 10 }),
+      makeTemplate({ id: 'c', conditions: { projectId: 'proj_1' }, projectId: 'proj_1' }),
+      makeTemplate({ id: 'd', conditions: { labels: ['frontend', 'missing'] }, specificity: 90 }),
+      makeTemplate({ id: 'e', conditions: { hasFailedSessions: false }, specificity: 10 }),
+      makeTemplate({ id: 'f', conditions: { projectId: 'proj_2' }, projectId: 'proj_2' }),
+    ];
+    const index = buildTemplateIndex(templates);
+
+    const contexts: IssueContext[] = [
+      baseContext,
+      { ...baseContext, projectId: null },
+      { ...baseContext, projectId: 'proj_2', signalSource: null },
+      { ...baseContext, type: 'task', labels: [] },
+      { ...baseContext, labels: ['frontend', 'missing'] },
+    ];
+
+    for (const context of contexts) {
+      expect(selectFromIndex(index, context)?.id).toBe(selectTemplate(templates, context)?.id);
+    }
+  });
+
+  it('falls back to a type-only template when nothing else matches', () => {
+    const index = buildTemplateIndex([
+      makeTemplate({ id: 'task-default', conditions: { type: 'task' } }),
+    ]);
+
+    expect(selectFromIndex(index, { ...baseContext, type: 'task' })?.id).toBe('task-default');
+    expect(selectFromIndex(index, baseContext)).toBeNull();
+  });
+});
+
+describe('selectPreviewFromIndex', () => {
+  it('prefers a matching template over the type-condition fallback', () => {
+    const index = buildTemplateIndex([
+      makeTemplate({ id: 'task-sentry', conditions: { type: 'task', signalSource: 'sentry' } }),
+      makeTemplate({ id: 'task-default', conditions: { type: 'task' } }),
+    ]);
+
+    expect(selectPreviewFromIndex(index, { ...baseContext, type: 'task' })?.id).toBe(
+      'task-default'
+    );
+  });
+
+  it('falls back to the first template conditioned on the issue type', () => {
+    const index = buildTemplateIndex([
+      makeTemplate({ id: 'signal-sentry', conditions: { type: 'signal', signalSource: 'sentry' } }),
+      makeTemplate({ id: 'signal-labelled', conditions: { type: 'signal', labels: ['backend'] } }),
+      makeTemplate({ id: 'task-sentry', conditions: { type: 'task', signalSource: 'sentry' } }),
+    ]);
+
+    expect(selectFromIndex(index, baseContext)).toBeNull();
+    expect(selectPreviewFromIndex(index, baseContext)?.id).toBe('signal-sentry');
+    expect(selectPreviewFromIndex(index, { ...baseContext, type: 'plan' })).toBeNull();
+  });
+});
+
+describe('LruCache', () => {
+  it('evicts the least recently used entry when full', () => {
+    const cache = new LruCache<string, number>(2);
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a');
+    cache.set('c', 3);
+
+    expect(cache.has('a')).toBe(true);
+    expect(cache.has('b')).toBe(false);
+    expect(cache.has('c')).toBe(true);
+    expect(cache.size).toBe(2);
+  });
+
+  it('replacing a key does not evict other entries', () => {
+    const cache = new LruCache<string, number>(2);
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.set('a', 10);
+
+    expect(cache.get('a')).toBe(10);
+    expect(cache.get('b')).toBe(2);
+  });
+});
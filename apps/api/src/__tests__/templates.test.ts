@@ -151,6 +151,26 @@ describe('templates CRUD', () => {
     expect(data).toHaveLength(2);
   });
 
+  it('pages by cursor without a total when includeTotal=false', async () => {
+    const app = buildApp();
+    const slugs: string[] = [];
+    let cursor: string | null = null;
+    do {
+      const query: string = cursor ? `&cursor=${cursor}` : '';
+      const res = await app.request(`/templates?limit=2&includeTotal=false${query}`, {
+        headers: AUTH_HEADER,
+      });
+      const body = await res.json();
+      expect(body).not.toHaveProperty('total');
+      slugs.push(...body.data.map((t: { slug: string }) => t.slug));
+      cursor = body.nextCursor;
+    } while (cursor);
+
+    // The 5 seeded default templates, each exactly once
+    expect(slugs).toHaveLength(5);
+    expect(new Set(slugs).size).toBe(5);
+  });
+
   // ─── GET /templates/:id ─────────────────────────────────────────────────
 
   it('gets a template by id', async () => {
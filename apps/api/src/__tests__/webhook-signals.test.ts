@@ -2,6 +2,7 @@ import { createHmac } from 'node:crypto';
 import { Hono } from 'hono';
 import { HTTPException } from 'hono/http-exception';
 import { describe, expect, it, beforeEach, afterEach } from 'vitest';
+import { signals } from '../db/schema';
 import { webhookRoutes } from '../routes/webhooks';
 import { withTestDb, getTestDb, type TestAppEnv } from './setup';
 
@@ -247,10 +248,11 @@ describe('POST /api/signals/github', () => {
     expect(body.data.issue.priority).toBe(1);
   });
 
-  it('sets sourceId from event type and action', async () => {
+  it('sets sourceId from event type, action, and the entity', async () => {
     const app = createWebhookApp();
     const payload = {
       action: 'opened',
+      issue: { number: 42 },
       repository: { full_name: 'dork-labs/loop' },
       sender: { login: 'octocat' },
     };
@@ -258,7 +260,62 @@ describe('POST /api/signals/github', () => {
     const res = await githubRequest(app, payload, 'issues');
     const body = await res.json();
 
-    expect(body.data.signal.sourceId).toBe('issues.opened');
+    expect(body.data.signal.sourceId).toBe('issues.opened:dork-labs/loop#42');
+  });
+
+  it('keeps events for different pull requests with the same action apart', async () => {
+    const app = createWebhookApp();
+    const pullRequest = (number: number) => ({
+      action: 'opened',
+      pull_request: { number, title: `PR ${number}` },
+      repository: { full_name: 'dork-labs/loop' },
+      sender: { login: 'octocat' },
+    });
+
+    const first = await githubRequest(app, pullRequest(1), 'pull_request');
+    const second = await githubRequest(app, pullRequest(2), 'pull_request');
+
+    expect(first.status).toBe(201);
+    expect(second.status).toBe(201);
+    const [a, b] = [(await first.json()).data, (await second.json()).data];
+    expect(a.signal.id).not.toBe(b.signal.id);
+    expect(a.issue.id).not.toBe(b.issue.id);
+    expect(b.signal.payload.pull_request.number).toBe(2);
+
+    const rows = await getTestDb().select().from(signals);
+    expect(rows).toHaveLength(2);
+  });
+
+  it('coalesces repeat deliveries for the same pull request', async () => {
+    const app = createWebhookApp();
+    const payload = {
+      action: 'synchronize',
+      pull_request: { number: 7 },
+      repository: { full_name: 'dork-labs/loop' },
+      sender: { login: 'octocat' },
+    };
+
+    const first = await githubRequest(app, payload, 'pull_request');
+    const second = await githubRequest(app, payload, 'pull_request');
+
+    expect(first.status).toBe(201);
+    expect(second.status).toBe(200);
+    expect((await second.json()).data.deduplicated).toBe(true);
+  });
+
+  it('does not deduplicate events without an entity', async () => {
+    const app = createWebhookApp();
+    const payload = {
+      repository: { full_name: 'dork-labs/loop' },
+      sender: { login: 'octocat' },
+    };
+
+    const first = await githubRequest(app, payload, 'push');
+    const second = await githubRequest(app, payload, 'push');
+
+    expect(first.status).toBe(201);
+    expect(second.status).toBe(201);
+    expect((await first.json()).data.signal.sourceId).toBeNull();
   });
 
   it('rejects requests with invalid signature', async () => {
@@ -435,6 +492,26 @@ describe('POST /api/signals/sentry', () => {
     expect(body.data.signal.sourceId).toBe('99999');
   });
 
+  it('coalesces repeated deliveries for the same Sentry issue', async () => {
+    const app = createWebhookApp();
+    const payload = (count: number) => ({
+      action: 'created',
+      data: { issue: { id: '77777', title: 'Storm', count, level: 'error' } },
+    });
+
+    const first = await sentryRequest(app, payload(1));
+    const repeat = await sentryRequest(app, payload(250));
+    const firstBody = await first.json();
+    const repeatBody = await repeat.json();
+
+    expect(first.status).toBe(201);
+    expect(repeat.status).toBe(200);
+    expect(repeatBody.data.deduplicated).toBe(true);
+    expect(repeatBody.data.issue.id).toBe(firstBody.data.issue.id);
+    expect(repeatBody.data.signal.occurrences).toBe(2);
+    expect(repeatBody.data.signal.payload.data.issue.count).toBe(250);
+  });
+
   it('rejects requests with invalid signature', async () => {
     const app = createWebhookApp();
 
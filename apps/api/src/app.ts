@@ -3,6 +3,8 @@ import { cors } from 'hono/cors';
 import { HTTPException } from 'hono/http-exception';
 import { ZodError } from 'zod';
 import { apiKeyAuth } from './middleware/auth';
+import { idempotency } from './middleware/idempotency';
+import { requestTiming } from './middleware/request-timing';
 import { db } from './db';
 import { issueRoutes } from './routes/issues';
 import { projectRoutes } from './routes/projects';
@@ -15,8 +17,12 @@ import { templateRoutes } from './routes/templates';
 import { promptReviewRoutes } from './routes/prompt-reviews';
 import { dispatchRoutes } from './routes/dispatch';
 import { dashboardRoutes } from './routes/dashboard';
+import { eventRoutes } from './routes/events';
 import { webhookRoutes } from './routes/webhooks';
 import { openapiRoutes } from './routes/openapi';
+import { MemoryIdempotencyStore, PostgresIdempotencyStore } from './lib/idempotency-store';
+import { RequestMetrics } from './lib/request-metrics';
+import { env } from './env';
 import type { AppEnv } from './types';
 
 const app = new Hono<AppEnv>();
@@ -27,7 +33,8 @@ app.use(
   cors({
     origin: ['http://localhost:5668', 'https://app.looped.me'],
     allowMethods: ['GET', 'POST', 'PATCH', 'DELETE', 'OPTIONS'],
-    allowHeaders: ['Authorization', 'Content-Type'],
+    allowHeaders: ['Authorization', 'Content-Type', 'Idempotency-Key'],
+    exposeHeaders: ['Idempotent-Replayed', 'Server-Timing'],
     maxAge: 86400,
   })
 );
@@ -57,12 +64,26 @@ app.route('/api/openapi.json', openapiRoutes);
 const api = new Hono<AppEnv>();
 api.use('*', apiKeyAuth);
 
+/** Server-Timing for every API request; per-route histograms only with REQUEST_METRICS. */
+api.use('*', requestTiming({ metrics: env.REQUEST_METRICS ? new RequestMetrics() : undefined }));
+
 /** Inject the production database into every request context. */
 api.use('*', async (c, next) => {
   c.set('db', db);
   await next();
 });
 
+/** Replay responses for retried mutations that carry an `Idempotency-Key`. */
+api.use(
+  '*',
+  idempotency({
+    store:
+      env.IDEMPOTENCY_STORE === 'postgres'
+        ? new PostgresIdempotencyStore(db)
+        : new MemoryIdempotencyStore(),
+  })
+);
+
 // ─── Core CRUD routes ─────────────────────────────────────────────────────────
 api.route('/issues', issueRoutes);
 api.route('/issues', issueRelationRoutes);
@@ -76,14 +97,21 @@ api.route('/templates', templateRoutes);
 api.route('/prompt-reviews', promptReviewRoutes);
 api.route('/dispatch', dispatchRoutes);
 api.route('/dashboard', dashboardRoutes);
+api.route('/events', eventRoutes);
 
 app.route('/api', api);
 
 // ─── MCP transport (auth handled via internal ky client Bearer token) ────────
 import { createMcpHandler } from '@dork-labs/loop-mcp/http';
-import { env } from './env';
 app.route('/mcp', createMcpHandler({ apiKey: env.LOOP_API_KEY }));
 
+// ─── Event fan-out across API instances (optional) ───────────────────────────
+import { eventBus } from './lib/event-bus';
+import { connectPgEventTransport } from './lib/pg-event-transport';
+if (env.EVENTS_DATABASE_URL) {
+  await eventBus.connect(await connectPgEventTransport(env.EVENTS_DATABASE_URL));
+}
+
 // ─── Webhook routes (provider-specific auth, not apiKeyAuth) ────────────────
 const webhooks = new Hono<AppEnv>();
 
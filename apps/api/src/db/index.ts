@@ -1,19 +1,21 @@
 import * as schema from './schema';
 import { env } from '../env';
+import { instrumentClient, queryCounter } from '../lib/query-metrics';
 import type { AnyDb } from '../types';
 
 let db: AnyDb;
 
+// Drivers are instrumented so Server-Timing can report per-request query counts and DB time
 if (env.NODE_ENV === 'production') {
   const { neon } = await import('@neondatabase/serverless');
   const { drizzle } = await import('drizzle-orm/neon-http');
-  const sql = neon(env.DATABASE_URL);
-  db = drizzle(sql, { schema }) as unknown as AnyDb;
+  const sql = instrumentClient(neon(env.DATABASE_URL));
+  db = drizzle(sql, { schema, logger: queryCounter }) as unknown as AnyDb;
 } else {
   const pg = await import('pg');
   const { drizzle } = await import('drizzle-orm/node-postgres');
-  const pool = new pg.default.Pool({ connectionString: env.DATABASE_URL });
-  db = drizzle(pool, { schema }) as unknown as AnyDb;
+  const pool = instrumentClient(new pg.default.Pool({ connectionString: env.DATABASE_URL }));
+  db = drizzle(pool, { schema, logger: queryCounter }) as unknown as AnyDb;
 }
 
 export { db };
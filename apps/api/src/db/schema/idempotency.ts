@@ -0,0 +1,21 @@
+import { text, jsonb, integer, index, pgTable, timestamp } from 'drizzle-orm/pg-core';
+
+/**
+ * Idempotency keys table — responses recorded for requests sent with an `Idempotency-Key`
+ * header, shared by every API instance when the Postgres idempotency store is enabled.
+ * A row with a null `responseStatus` is a request still in flight.
+ */
+export const idempotencyKeys = pgTable(
+  'idempotency_keys',
+  {
+    key: text('key').primaryKey(),
+    /** Hash of method, path and body; a reused key with a different request is rejected. */
+    fingerprint: text('fingerprint').notNull(),
+    responseStatus: integer('response_status'),
+    responseHeaders: jsonb('response_headers').$type<Record<string, string>>(),
+    responseBody: text('response_body'),
+    createdAt: timestamp('created_at', { withTimezone: true, mode: 'date' }).defaultNow().notNull(),
+    expiresAt: timestamp('expires_at', { withTimezone: true, mode: 'date' }).notNull(),
+  },
+  (table) => [index('idx_idempotency_keys_expires_at').on(table.expiresAt)]
+);
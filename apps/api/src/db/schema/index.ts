@@ -3,3 +3,4 @@ export * from './issues';
 export * from './projects';
 export * from './signals';
 export * from './prompts';
+export * from './idempotency';
@@ -4,13 +4,16 @@ import {
   text,
   integer,
   serial,
+  boolean,
+  doublePrecision,
   jsonb,
   timestamp,
   index,
   uniqueIndex,
   primaryKey,
+  type AnyPgColumn,
 } from 'drizzle-orm/pg-core';
-import { relations } from 'drizzle-orm';
+import { relations, sql } from 'drizzle-orm';
 import { timestamps, softDelete, cuid2Id } from './_helpers';
 
 // ─── Enum value arrays (for Zod reuse) ───────────────────────────────────────
@@ -62,6 +65,15 @@ export type PullRequestRef = {
   mergedAt?: string;
 };
 
+// ─── Dispatch queue predicate ─────────────────────────────────────────────────
+
+/** Rows eligible for dispatch; shared by the partial queue indexes. */
+const dispatchableIssue = (table: {
+  status: AnyPgColumn;
+  deletedAt: AnyPgColumn;
+  isBlocked: AnyPgColumn;
+}) => sql`${table.status} = 'todo' AND ${table.deletedAt} IS NULL AND ${table.isBlocked} = false`;
+
 // ─── Issues table ─────────────────────────────────────────────────────────────
 
 export const issues = pgTable(
@@ -84,6 +96,11 @@ export const issues = pgTable(
     commits: jsonb('commits').$type<CommitRef[]>(),
     pullRequests: jsonb('pull_requests').$type<PullRequestRef[]>(),
     completedAt: timestamp('completed_at', { withTimezone: true, mode: 'date' }),
+    // Dispatch ordering, maintained by database triggers (see lib/priority-scoring.ts).
+    // Base score is priority + type + goal weight; rank folds in age so it never goes stale.
+    dispatchScoreBase: integer('dispatch_score_base').notNull().default(0),
+    dispatchRank: doublePrecision('dispatch_rank').notNull().default(0),
+    isBlocked: boolean('is_blocked').notNull().default(false),
     ...timestamps,
     ...softDelete,
   },
@@ -93,6 +110,17 @@ export const issues = pgTable(
     index('idx_issues_type').on(table.type),
     index('idx_issues_status').on(table.status),
     uniqueIndex('idx_issues_number').on(table.number),
+    index('idx_issues_dispatch_queue').on(table.dispatchRank).where(dispatchableIssue(table)),
+    index('idx_issues_dispatch_queue_project')
+      .on(table.projectId, table.dispatchRank)
+      .where(dispatchableIssue(table)),
+    // Keyset pagination of live issues in (created_at, id) order, globally and per project
+    index('idx_issues_created_at_id')
+      .on(table.createdAt, table.id)
+      .where(sql`${table.deletedAt} IS NULL`),
+    index('idx_issues_project_created_at_id')
+      .on(table.projectId, table.createdAt, table.id)
+      .where(sql`${table.deletedAt} IS NULL`),
   ]
 );
 
@@ -49,6 +49,11 @@ export const promptVersions = pgTable(
     completionRate: doublePrecision('completion_rate'),
     avgDurationMs: doublePrecision('avg_duration_ms'),
     reviewScore: doublePrecision('review_score'),
+    // Running review aggregate, maintained with review_score by lib/review-aggregate.ts
+    reviewCount: integer('review_count').notNull().default(0),
+    claritySum: integer('clarity_sum').notNull().default(0),
+    completenessSum: integer('completeness_sum').notNull().default(0),
+    relevanceSum: integer('relevance_sum').notNull().default(0),
     createdAt: timestamp('created_at', { withTimezone: true, mode: 'date' }).defaultNow().notNull(),
   },
   (table) => [
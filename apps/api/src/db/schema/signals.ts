@@ -1,4 +1,4 @@
-import { text, jsonb, index, pgEnum } from 'drizzle-orm/pg-core';
+import { text, jsonb, integer, index, pgEnum } from 'drizzle-orm/pg-core';
 import { pgTable } from 'drizzle-orm/pg-core';
 import { timestamp } from 'drizzle-orm/pg-core';
 import { cuid2Id } from './_helpers';
@@ -17,11 +17,17 @@ export const signals = pgTable(
     severity: signalSeverityEnum('severity').notNull(),
     payload: jsonb('payload').notNull(),
     issueId: text('issue_id').notNull(),
+    /** Deliveries coalesced into this signal, including the first. */
+    occurrences: integer('occurrences').notNull().default(1),
     createdAt: timestamp('created_at', { withTimezone: true, mode: 'date' }).defaultNow().notNull(),
+    lastSeenAt: timestamp('last_seen_at', { withTimezone: true, mode: 'date' })
+      .defaultNow()
+      .notNull(),
   },
   (table) => [
     index('idx_signals_issue_id').on(table.issueId),
     index('idx_signals_source').on(table.source),
     index('idx_signals_payload_gin').using('gin', table.payload),
+    index('idx_signals_dedup').on(table.source, table.sourceId, table.type, table.lastSeenAt),
   ]
 );
@@ -10,6 +10,13 @@ export const apiEnvSchema = z.object({
   GITHUB_WEBHOOK_SECRET: z.string().optional(),
   SENTRY_CLIENT_SECRET: z.string().optional(),
   POSTHOG_WEBHOOK_SECRET: z.string().optional(),
+  SIGNAL_DEDUP_WINDOW_SECONDS: z.coerce.number().int().min(0).default(900),
+  EVENTS_DATABASE_URL: z.string().url().optional(),
+  IDEMPOTENCY_STORE: z.enum(['memory', 'postgres']).default('memory'),
+  REQUEST_METRICS: z
+    .enum(['true', 'false'])
+    .default('false')
+    .transform((value) => value === 'true'),
 });
 
 export type Env = z.infer<typeof apiEnvSchema>;
@@ -39,6 +46,10 @@ if (isTest) {
     GITHUB_WEBHOOK_SECRET: undefined,
     SENTRY_CLIENT_SECRET: undefined,
     POSTHOG_WEBHOOK_SECRET: undefined,
+    SIGNAL_DEDUP_WINDOW_SECONDS: 900,
+    EVENTS_DATABASE_URL: undefined,
+    IDEMPOTENCY_STORE: 'memory',
+    REQUEST_METRICS: false,
   };
 } else {
   const result = apiEnvSchema.safeParse(process.env);
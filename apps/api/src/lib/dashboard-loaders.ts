@@ -0,0 +1,194 @@
+import { and, desc, eq, getTableColumns, gt, inArray, isNull, lte, or, sql } from 'drizzle-orm';
+import type { AnyPgColumn } from 'drizzle-orm/pg-core';
+import { issues, issueRelations } from '../db/schema/issues';
+import { promptTemplates, promptVersions } from '../db/schema/prompts';
+import { REVIEW_MIN_SAMPLES } from './review-aggregate';
+import type { AnyDb } from '../types';
+
+// ─── Constants ───────────────────────────────────────────────────────────────
+
+/** Number of most recent versions returned per template on the prompt health view. */
+export const RECENT_VERSION_LIMIT = 5;
+
+// ─── Helpers ─────────────────────────────────────────────────────────────────
+
+function groupBy<T, K>(rows: T[], keyOf: (row: T) => K): Map<K, T[]> {
+  const groups = new Map<K, T[]>();
+  for (const row of rows) {
+    const key = keyOf(row);
+    const group = groups.get(key);
+    if (group) group.push(row);
+    else groups.set(key, [row]);
+  }
+  return groups;
+}
+
+/** Per-template mean of one review dimension, from the versions' running sums. */
+function reviewAverage(sum: AnyPgColumn) {
+  return sql<number>`sum(${sum})::float8 / sum(${promptVersions.reviewCount})`;
+}
+
+/** Drop the window-function rank from a version row. */
+function withoutRecency<T extends { recency: number }>({ recency: _recency, ...version }: T) {
+  return version;
+}
+
+// ─── Activity ────────────────────────────────────────────────────────────────
+
+/**
+ * Load signal chains for the activity view: the most recently updated root issues,
+ * their children and the children's relations. Runs three queries regardless of how
+ * many roots or children are returned, then assembles the chains in memory.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param limit - Maximum number of root issues
+ * @returns Chains sorted by latest activity across the root and its children
+ */
+export async function loadActivityChains(db: AnyDb, limit: number) {
+  const rootIssues = await db
+    .select()
+    .from(issues)
+    .where(and(isNull(issues.deletedAt), isNull(issues.parentId)))
+    .orderBy(desc(issues.updatedAt))
+    .limit(limit);
+
+  const rootIds = rootIssues.map((root) => root.id);
+  const children =
+    rootIds.length > 0
+      ? await db
+          .select()
+          .from(issues)
+          .where(and(isNull(issues.deletedAt), inArray(issues.parentId, rootIds)))
+          .orderBy(issues.createdAt)
+      : [];
+
+  const childIds = children.map((child) => child.id);
+  const relations =
+    childIds.length > 0
+      ? await db.select().from(issueRelations).where(inArray(issueRelations.issueId, childIds))
+      : [];
+
+  const childrenByParent = groupBy(children, (child) => child.parentId);
+  const relationsByIssue = groupBy(relations, (relation) => relation.issueId);
+
+  const chains = rootIssues.map((root) => {
+    const rootChildren = childrenByParent.get(root.id) ?? [];
+
+    // Latest activity is the most recent updatedAt across root + children
+    const latestActivity = [root, ...rootChildren]
+      .map((issue) => new Date(issue.updatedAt).getTime())
+      .reduce((max, t) => Math.max(max, t), 0);
+
+    return {
+      root,
+      children: rootChildren.map((child) => ({
+        issue: child,
+        relations: relationsByIssue.get(child.id) ?? [],
+      })),
+      latestActivity: new Date(latestActivity).toISOString(),
+    };
+  });
+
+  chains.sort(
+    (a, b) => new Date(b.latestActivity).getTime() - new Date(a.latestActivity).getTime()
+  );
+
+  return chains;
+}
+
+// ─── Prompt health ───────────────────────────────────────────────────────────
+
+/**
+ * Load prompt template health: each template with its active version, most recent
+ * versions and review averages. Versions come from a single window-function query
+ * and review averages from the per-version review aggregates, summed per template, so
+ * the cost is three queries no matter how many templates or reviews exist.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ */
+export async function loadPromptHealth(db: AnyDb) {
+  const templates = await db
+    .select()
+    .from(promptTemplates)
+    .where(isNull(promptTemplates.deletedAt));
+
+  if (templates.length === 0) return [];
+  const templateIds = templates.map((template) => template.id);
+
+  // Rank versions per template so the newest N and the active one come back in one pass
+  const ranked = db
+    .select({
+      ...getTableColumns(promptVersions),
+      recency: sql<number>`(row_number() over (
+        partition by ${promptVersions.templateId} order by ${promptVersions.version} desc
+      ))::int`.as('recency'),
+    })
+    .from(promptVersions)
+    .where(inArray(promptVersions.templateId, templateIds))
+    .as('ranked');
+
+  const [versionRows, reviewRows] = await Promise.all([
+    db
+      .select()
+      .from(ranked)
+      .where(or(lte(ranked.recency, RECENT_VERSION_LIMIT), eq(ranked.status, 'active')))
+      .orderBy(ranked.templateId, desc(ranked.version)),
+    db
+      .select({
+        templateId: promptVersions.templateId,
+        totalReviews: sql<number>`sum(${promptVersions.reviewCount})::int`,
+        avgClarity: reviewAverage(promptVersions.claritySum),
+        avgCompleteness: reviewAverage(promptVersions.completenessSum),
+        avgRelevance: reviewAverage(promptVersions.relevanceSum),
+      })
+      .from(promptVersions)
+      .where(
+        and(inArray(promptVersions.templateId, templateIds), gt(promptVersions.reviewCount, 0))
+      )
+      .groupBy(promptVersions.templateId),
+  ]);
+
+  const versionsByTemplate = groupBy(versionRows, (row) => row.templateId);
+  const reviewsByTemplate = new Map(reviewRows.map((row) => [row.templateId, row]));
+
+  return templates.map((template) => {
+    const rows = versionsByTemplate.get(template.id) ?? [];
+    const recentVersions = rows
+      .filter((row) => row.recency <= RECENT_VERSION_LIMIT)
+      .map(withoutRecency);
+    const active = rows.find((row) => row.status === 'active');
+    const activeVersion = active ? withoutRecency(active) : null;
+
+    const summary = reviewsByTemplate.get(template.id) ?? {
+      totalReviews: 0,
+      avgClarity: null,
+      avgCompleteness: null,
+      avgRelevance: null,
+    };
+
+    // Use EWMA score from the active version (stored as reviewScore in schema)
+    const compositeScore = activeVersion?.reviewScore ?? null;
+    const completionRate = activeVersion?.completionRate ?? null;
+
+    // Flag templates needing attention: low score (once it rests on enough reviews) or
+    // low completion rate
+    const scoreIsStable = (activeVersion?.reviewCount ?? 0) >= REVIEW_MIN_SAMPLES;
+    const needsAttention =
+      (scoreIsStable && compositeScore !== null && compositeScore < 3.0) ||
+      (completionRate !== null && completionRate < 0.5);
+
+    return {
+      template,
+      activeVersion,
+      recentVersions,
+      reviewSummary: {
+        totalReviews: summary.totalReviews,
+        avgClarity: summary.avgClarity,
+        avgCompleteness: summary.avgCompleteness,
+        avgRelevance: summary.avgRelevance,
+        compositeScore,
+      },
+      needsAttention,
+    };
+  });
+}
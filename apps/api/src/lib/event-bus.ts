@@ -0,0 +1,253 @@
+import { createId } from '@paralleldrive/cuid2';
+import type { issues } from '../db/schema/issues';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** Every event type published on the bus, in the order they are documented. */
+export const loopEventTypeValues = [
+  'issue.created',
+  'issue.updated',
+  'issue.deleted',
+  'issue.claimed',
+  'signal.ingested',
+  'template.promoted',
+] as const;
+
+export type LoopEventType = (typeof loopEventTypeValues)[number];
+
+/** Compact issue summary carried by issue events. */
+export interface IssueEventData {
+  issueId: string;
+  number: number;
+  title: string;
+  type: string;
+  status: string;
+  priority: number;
+  projectId: string | null;
+}
+
+/** Payload for each event type. Payloads are deltas, not full rows. */
+export interface LoopEventDataMap {
+  'issue.created': IssueEventData;
+  'issue.updated': IssueEventData & { fields: string[] };
+  'issue.deleted': { issueId: string };
+  'issue.claimed': IssueEventData;
+  'signal.ingested': {
+    signalId: string;
+    issueId: string;
+    source: string;
+    type: string;
+    severity: string;
+    deduplicated: boolean;
+  };
+  'template.promoted': {
+    templateId: string;
+    slug: string;
+    versionId: string;
+    version: number;
+    previousVersionId: string | null;
+  };
+}
+
+/** A published event. `id` is unique across API instances and doubles as the SSE event ID. */
+export type LoopEvent<T extends LoopEventType = LoopEventType> = {
+  [K in T]: { id: string; type: K; data: LoopEventDataMap[K]; timestamp: string };
+}[T];
+
+export type LoopEventListener = (event: LoopEvent) => void;
+
+/**
+ * Carries events between API instances. The bus hands every locally published event to
+ * `send`, and delivers whatever `listen` receives to local subscribers. Implementations
+ * must not echo an instance's own events back to it.
+ */
+export interface EventTransport {
+  send(event: LoopEvent): Promise<void>;
+  /** Start receiving remote events. Resolves with a function that stops listening. */
+  listen(onEvent: (event: LoopEvent) => void): Promise<() => Promise<void>>;
+}
+
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+/** Number of recent events kept for `Last-Event-ID` replay. */
+export const EVENT_HISTORY_SIZE = 256;
+
+/** Events a single subscription buffers before dropping the oldest. */
+export const MAX_BUFFERED_EVENTS = 1000;
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+/** Build the issue summary published with issue events. */
+export function toIssueEventData(issue: typeof issues.$inferSelect): IssueEventData {
+  return {
+    issueId: issue.id,
+    number: issue.number,
+    title: issue.title,
+    type: issue.type,
+    status: issue.status,
+    priority: issue.priority,
+    projectId: issue.projectId,
+  };
+}
+
+// ─── Bus ────────────────────────────────────────────────────────────────────
+
+/**
+ * In-process publish/subscribe hub for change events. Route handlers publish after
+ * their writes succeed; the SSE endpoint and long-polling dispatch subscribe. With a
+ * transport attached, events also fan out to (and arrive from) other API instances.
+ */
+export class EventBus {
+  private readonly listeners = new Map<LoopEventListener, ReadonlySet<LoopEventType> | null>();
+  private readonly history: LoopEvent[] = [];
+  private transport: EventTransport | null = null;
+
+  constructor(private readonly historySize = EVENT_HISTORY_SIZE) {}
+
+  /**
+   * Publish an event to local subscribers and, when attached, to the transport.
+   * Transport failures are logged rather than thrown so a publish never fails a request.
+   */
+  publish<T extends LoopEventType>(type: T, data: LoopEventDataMap[T]): LoopEvent<T> {
+    const event = {
+      id: createId(),
+      type,
+      data,
+      timestamp: new Date().toISOString(),
+    } as LoopEvent<T>;
+
+    this.deliver(event);
+    this.transport?.send(event).catch((err) => {
+      console.error('Failed to forward event to transport', err);
+    });
+
+    return event;
+  }
+
+  /**
+   * Register a listener, optionally limited to some event types.
+   *
+   * @returns A function that removes the listener
+   */
+  subscribe(listener: LoopEventListener, types?: readonly LoopEventType[]): () => void {
+    this.listeners.set(listener, types && types.length > 0 ? new Set(types) : null);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  /**
+   * Events published after `lastEventId`, oldest first. Returns nothing when the ID is
+   * unknown or has already rolled out of the history window.
+   */
+  replay(lastEventId: string | undefined, types?: readonly LoopEventType[]): LoopEvent[] {
+    if (!lastEventId) return [];
+    const index = this.history.findIndex((event) => event.id === lastEventId);
+    if (index === -1) return [];
+    const missed = this.history.slice(index + 1);
+    return types && types.length > 0 ? missed.filter((e) => types.includes(e.type)) : missed;
+  }
+
+  /**
+   * Attach a cross-instance transport and start listening on it.
+   *
+   * @returns A function that detaches the transport and stops listening
+   */
+  async connect(transport: EventTransport): Promise<() => Promise<void>> {
+    const stop = await transport.listen((event) => this.deliver(event));
+    this.transport = transport;
+    return async () => {
+      if (this.transport === transport) this.transport = null;
+      await stop();
+    };
+  }
+
+  private deliver(event: LoopEvent): void {
+    this.history.push(event);
+    if (this.history.length > this.historySize) this.history.shift();
+
+    for (const [listener, types] of this.listeners) {
+      if (types && !types.has(event.type)) continue;
+      try {
+        listener(event);
+      } catch (err) {
+        console.error('Event listener failed', err);
+      }
+    }
+  }
+}
+
+/**
+ * A buffered subscription that can be awaited event by event or iterated with
+ * `for await`. Listening starts on construction, so nothing published between
+ * subscribing and the first `take()` is missed. One consumer at a time.
+ */
+export class EventSubscription implements AsyncIterable<LoopEvent> {
+  private readonly buffer: LoopEvent[] = [];
+  private waiter: ((event: LoopEvent | null) => void) | null = null;
+  private closed = false;
+  private readonly unsubscribe: () => void;
+
+  constructor(
+    bus: EventBus,
+    types?: readonly LoopEventType[],
+    private readonly maxBuffered = MAX_BUFFERED_EVENTS
+  ) {
+    this.unsubscribe = bus.subscribe((event) => this.push(event), types);
+  }
+
+  /**
+   * Resolve with the next event, or `null` once `timeoutMs` elapses or the
+   * subscription is closed.
+   */
+  take(timeoutMs = Infinity): Promise<LoopEvent | null> {
+    if (this.buffer.length > 0) return Promise.resolve(this.buffer.shift()!);
+    if (this.closed) return Promise.resolve(null);
+
+    return new Promise((resolve) => {
+      const timer = Number.isFinite(timeoutMs)
+        ? setTimeout(() => {
+            this.waiter = null;
+            resolve(null);
+          }, timeoutMs)
+        : undefined;
+      this.waiter = (event) => {
+        clearTimeout(timer);
+        resolve(event);
+      };
+    });
+  }
+
+  /** Stop listening and release a pending `take()` with `null`. */
+  close(): void {
+    if (this.closed) return;
+    this.closed = true;
+    this.unsubscribe();
+    this.release(null);
+  }
+
+  async *[Symbol.asyncIterator](): AsyncIterator<LoopEvent> {
+    for (;;) {
+      const event = await this.take();
+      if (!event) return;
+      yield event;
+    }
+  }
+
+  private push(event: LoopEvent): void {
+    if (this.release(event)) return;
+    this.buffer.push(event);
+    if (this.buffer.length > this.maxBuffered) this.buffer.shift();
+  }
+
+  private release(event: LoopEvent | null): boolean {
+    const waiter = this.waiter;
+    if (!waiter) return false;
+    this.waiter = null;
+    waiter(event);
+    return true;
+  }
+}
+
+/** Process-wide bus shared by route handlers, the events route and the dispatch long-poll. */
+export const eventBus = new EventBus();
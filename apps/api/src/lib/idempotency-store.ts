@@ -0,0 +1,213 @@
+import { and, eq, isNull, lt } from 'drizzle-orm';
+import { idempotencyKeys } from '../db/schema/idempotency';
+import { LruCache } from './lru-cache';
+import type { AnyDb } from '../types';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** A response captured for replay. */
+export interface StoredResponse {
+  status: number;
+  headers: Record<string, string>;
+  body: string;
+}
+
+/** What a store holds for a key: the request fingerprint and, once finished, its response. */
+export interface IdempotencyRecord {
+  fingerprint: string;
+  /** Null while the original request is still being processed. */
+  response: StoredResponse | null;
+}
+
+/**
+ * Backing storage for the idempotency middleware. Implementations must make `reserve`
+ * atomic so that exactly one caller wins a key.
+ */
+export interface IdempotencyStore {
+  /**
+   * Claim `key` for a new request. Resolves with `null` when the caller now owns the key,
+   * or with the existing record when the key is already taken. Expired records and
+   * reservations abandoned for longer than the lock timeout count as free.
+   */
+  reserve(key: string, fingerprint: string): Promise<IdempotencyRecord | null>;
+  /** Read the record for a key, if any. */
+  get(key: string): Promise<IdempotencyRecord | null>;
+  /** Record the final response for a reserved key. */
+  complete(key: string, response: StoredResponse): Promise<void>;
+  /** Drop a reservation whose request failed, so a retry can run again. */
+  release(key: string): Promise<void>;
+}
+
+export interface IdempotencyStoreOptions {
+  /** How long a completed response stays replayable. Defaults to 24 hours. */
+  ttlMs?: number;
+  /** How long a reservation may stay in flight before another request may take it over. */
+  lockTimeoutMs?: number;
+}
+
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+/** Default replay window for completed responses. */
+export const IDEMPOTENCY_TTL_MS = 24 * 60 * 60 * 1000;
+
+/** Default time after which an unfinished reservation is considered abandoned. */
+export const IDEMPOTENCY_LOCK_TIMEOUT_MS = 60_000;
+
+/** Default number of keys held by the in-memory store. */
+export const MEMORY_STORE_MAX_KEYS = 10_000;
+
+/** Minimum interval between sweeps of expired rows in the Postgres store. */
+const PURGE_INTERVAL_MS = 60_000;
+
+// ─── In-memory store ────────────────────────────────────────────────────────
+
+interface MemoryEntry {
+  record: IdempotencyRecord;
+  expiresAt: number;
+}
+
+/**
+ * Single-instance store backed by {@link LruCache}. Keys expire after `ttlMs`, and the
+ * least recently used keys are evicted beyond `maxKeys`. This is the default store.
+ */
+export class MemoryIdempotencyStore implements IdempotencyStore {
+  private readonly entries: LruCache<string, MemoryEntry>;
+  private readonly ttlMs: number;
+  private readonly lockTimeoutMs: number;
+
+  constructor(options: IdempotencyStoreOptions & { maxKeys?: number } = {}) {
+    this.entries = new LruCache(options.maxKeys ?? MEMORY_STORE_MAX_KEYS);
+    this.ttlMs = options.ttlMs ?? IDEMPOTENCY_TTL_MS;
+    this.lockTimeoutMs = options.lockTimeoutMs ?? IDEMPOTENCY_LOCK_TIMEOUT_MS;
+  }
+
+  async reserve(key: string, fingerprint: string): Promise<IdempotencyRecord | null> {
+    const existing = this.live(key);
+    if (existing) return existing.record;
+    this.entries.set(key, {
+      record: { fingerprint, response: null },
+      expiresAt: Date.now() + this.lockTimeoutMs,
+    });
+    return null;
+  }
+
+  async get(key: string): Promise<IdempotencyRecord | null> {
+    return this.live(key)?.record ?? null;
+  }
+
+  async complete(key: string, response: StoredResponse): Promise<void> {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+    this.entries.set(key, {
+      record: { fingerprint: entry.record.fingerprint, response },
+      expiresAt: Date.now() + this.ttlMs,
+    });
+  }
+
+  async release(key: string): Promise<void> {
+    this.entries.delete(key);
+  }
+
+  private live(key: string): MemoryEntry | undefined {
+    const entry = this.entries.get(key);
+    if (entry && entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+    return entry;
+  }
+}
+
+// ─── Postgres store ─────────────────────────────────────────────────────────
+
+/**
+ * Store backed by the `idempotency_keys` table, so retries that land on a different API
+ * instance still replay. Reservation is a single `INSERT ... ON CONFLICT DO UPDATE` that
+ * only takes over expired or abandoned rows; expired rows are swept at most once a
+ * minute per instance.
+ */
+export class PostgresIdempotencyStore implements IdempotencyStore {
+  private readonly ttlMs: number;
+  private readonly lockTimeoutMs: number;
+  private lastPurge = 0;
+
+  constructor(
+    private readonly db: AnyDb,
+    options: IdempotencyStoreOptions = {}
+  ) {
+    this.ttlMs = options.ttlMs ?? IDEMPOTENCY_TTL_MS;
+    this.lockTimeoutMs = options.lockTimeoutMs ?? IDEMPOTENCY_LOCK_TIMEOUT_MS;
+  }
+
+  async reserve(key: string, fingerprint: string): Promise<IdempotencyRecord | null> {
+    await this.purgeExpired();
+
+    const now = new Date();
+    const reservation = {
+      fingerprint,
+      responseStatus: null,
+      responseHeaders: null,
+      responseBody: null,
+      createdAt: now,
+      expiresAt: new Date(now.getTime() + this.lockTimeoutMs),
+    };
+    const claimed = await this.db
+      .insert(idempotencyKeys)
+      .values({ key, ...reservation })
+      .onConflictDoUpdate({
+        target: idempotencyKeys.key,
+        set: reservation,
+        setWhere: lt(idempotencyKeys.expiresAt, now),
+      })
+      .returning({ key: idempotencyKeys.key });
+
+    if (claimed.length > 0) return null;
+    return this.get(key);
+  }
+
+  async get(key: string): Promise<IdempotencyRecord | null> {
+    const [row] = await this.db
+      .select()
+      .from(idempotencyKeys)
+      .where(eq(idempotencyKeys.key, key));
+    if (!row) return null;
+
+    return {
+      fingerprint: row.fingerprint,
+      response:
+        row.responseStatus === null
+          ? null
+          : {
+              status: row.responseStatus,
+              headers: row.responseHeaders ?? {},
+              body: row.responseBody ?? '',
+            },
+    };
+  }
+
+  async complete(key: string, response: StoredResponse): Promise<void> {
+    await this.db
+      .update(idempotencyKeys)
+      .set({
+        responseStatus: response.status,
+        responseHeaders: response.headers,
+        responseBody: response.body,
+        expiresAt: new Date(Date.now() + this.ttlMs),
+      })
+      .where(eq(idempotencyKeys.key, key));
+  }
+
+  async release(key: string): Promise<void> {
+    await this.db
+      .delete(idempotencyKeys)
+      .where(and(eq(idempotencyKeys.key, key), isNull(idempotencyKeys.responseStatus)));
+  }
+
+  /** Delete expired rows, throttled so the sweep does not run on every request. */
+  private async purgeExpired(): Promise<void> {
+    const now = Date.now();
+    if (now - this.lastPurge < PURGE_INTERVAL_MS) return;
+    this.lastPurge = now;
+    await this.db.delete(idempotencyKeys).where(lt(idempotencyKeys.expiresAt, new Date(now)));
+  }
+}
@@ -0,0 +1,54 @@
+/**
+ * Bounded least-recently-used cache backed by a Map's insertion order.
+ * Reads refresh an entry's recency; writes past `maxSize` evict the oldest entry.
+ */
+export class LruCache<K, V> {
+  private readonly entries = new Map<K, V>();
+
+  constructor(private readonly maxSize: number) {
+    if (maxSize < 1) {
+      throw new RangeError('LruCache maxSize must be at least 1');
+    }
+  }
+
+  /** Number of entries currently held. */
+  get size(): number {
+    return this.entries.size;
+  }
+
+  /** Return the cached value and mark it as most recently used. */
+  get(key: K): V | undefined {
+    if (!this.entries.has(key)) return undefined;
+    const value = this.entries.get(key)!;
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    return value;
+  }
+
+  /** Check for a key without affecting recency. */
+  has(key: K): boolean {
+    return this.entries.has(key);
+  }
+
+  /** Insert or replace a value, evicting the least recently used entry when full. */
+  set(key: K, value: V): this {
+    if (this.entries.has(key)) {
+      this.entries.delete(key);
+    } else if (this.entries.size >= this.maxSize) {
+      const oldest = this.entries.keys().next().value as K;
+      this.entries.delete(oldest);
+    }
+    this.entries.set(key, value);
+    return this;
+  }
+
+  /** Remove a single entry. Returns true if it was present. */
+  delete(key: K): boolean {
+    return this.entries.delete(key);
+  }
+
+  /** Remove every entry. */
+  clear(): void {
+    this.entries.clear();
+  }
+}
@@ -60,6 +60,16 @@ const PaginationQuerySchema = z.object({
     example: 0,
   }),
 });
+const CursorQuerySchema = z.object({
+  cursor: z.string().optional().openapi({
+    description: 'Opaque `nextCursor` from the previous page; cannot be combined with offset',
+    example: 'WyJjcmVhdGVkQXQiLCIyMDI2LTAyLTIwIDEyOjAwOjAwKzAwIiwiY3VpZDJfYWJjMTIzIl0',
+  }),
+  includeTotal: z.enum(['true', 'false']).default('true').openapi({
+    description: 'Set to `false` to skip counting all matching records and omit `total`',
+    example: 'false',
+  }),
+});
 
 // ─── Issues ───────────────────────────────────────────────────────────────────
 
@@ -225,7 +235,9 @@ const SignalSchema = registry.register(
       .record(z.string(), z.unknown())
       .openapi({ example: { event: 'error_rate', value: 0.22 } }),
     issueId: IdSchema,
+    occurrences: z.number().int().openapi({ example: 1 }),
     createdAt: DateTimeSchema,
+    lastSeenAt: DateTimeSchema,
   })
 );
 
@@ -273,6 +285,10 @@ const PromptVersionSchema = registry.register(
     completionRate: z.number().nullable().openapi({ example: null }),
     avgDurationMs: z.number().nullable().openapi({ example: null }),
     reviewScore: z.number().nullable().openapi({ example: null }),
+    reviewCount: z.number().int().openapi({ example: 0 }),
+    claritySum: z.number().int().openapi({ example: 0 }),
+    completenessSum: z.number().int().openapi({ example: 0 }),
+    relevanceSum: z.number().int().openapi({ example: 0 }),
     createdAt: DateTimeSchema,
   })
 );
@@ -310,6 +326,20 @@ function paginatedResponse<T extends z.ZodTypeAny>(schema: T) {
   });
 }
 
+/**
+ * Wraps a cursor-paginated list response: `{ data: T[], nextCursor: string | null, total? }`.
+ * `total` is omitted when the request passes `includeTotal=false`.
+ */
+function cursorPaginatedResponse<T extends z.ZodTypeAny>(schema: T) {
+  return z.object({
+    data: z.array(schema),
+    nextCursor: z.string().nullable().openapi({
+      description: 'Pass as `cursor` to fetch the next page; null on the last page',
+    }),
+    total: z.number().int().optional().openapi({ example: 42 }),
+  });
+}
+
 /** Error response shape returned by the global error handler. */
 const ErrorSchema = z.object({
   error: z.string().openapi({ example: 'Issue not found' }),
@@ -394,6 +424,11 @@ registry.registerPath({
       parentId: z.string().optional().openapi({ example: 'cuid2_parent' }),
       limit: z.coerce.number().int().min(1).max(200).default(50).openapi({ example: 50 }),
       offset: z.coerce.number().int().min(0).default(0).openapi({ example: 0 }),
+      orderBy: z.enum(['createdAt', 'number']).default('createdAt').openapi({
+        description: 'Sort by creation time (ties broken by ID) or by issue number',
+        example: 'createdAt',
+      }),
+      ...CursorQuerySchema.shape,
     }),
   },
   responses: {
@@ -401,7 +436,7 @@ registry.registerPath({
       description: 'Paginated list of issues',
       content: {
         'application/json': {
-          schema: paginatedResponse(IssueSchema),
+          schema: cursorPaginatedResponse(IssueSchema),
         },
       },
     },
@@ -941,37 +976,54 @@ registry.registerPath({
 
 // ─── Signals endpoints ────────────────────────────────────────────────────────
 
+const IngestSignalBodySchema = z.object({
+  source: z.string().min(1).openapi({ example: 'posthog' }),
+  sourceId: z.string().optional().openapi({ example: 'evt_12345' }),
+  type: z.string().min(1).openapi({ example: 'error_rate' }),
+  severity: z.enum(signalSeverityValues).openapi({ example: 'high' }),
+  payload: z
+    .record(z.string(), z.unknown())
+    .openapi({ example: { event: 'error_rate', value: 0.22 } }),
+  projectId: z.string().optional(),
+});
+
+const IngestSignalResultSchema = z.object({
+  signal: SignalSchema,
+  issue: IssueSchema,
+  deduplicated: z.boolean().openapi({ example: false }),
+});
+
 registry.registerPath({
   method: 'post',
   path: '/api/signals',
   tags: ['Signals'],
   summary: 'Ingest a signal',
-  description: 'Creates a signal and atomically creates a linked triage issue.',
+  description:
+    'Creates a signal and atomically creates a linked triage issue. Repeats of the same (source, sourceId, type) within SIGNAL_DEDUP_WINDOW_SECONDS are coalesced into the existing signal and issue.',
   security: [{ bearerAuth: [] }],
   request: {
     body: {
       content: {
         'application/json': {
-          schema: z.object({
-            source: z.string().min(1).openapi({ example: 'posthog' }),
-            sourceId: z.string().optional().openapi({ example: 'evt_12345' }),
-            type: z.string().min(1).openapi({ example: 'error_rate' }),
-            severity: z.enum(signalSeverityValues).openapi({ example: 'high' }),
-            payload: z
-              .record(z.string(), z.unknown())
-              .openapi({ example: { event: 'error_rate', value: 0.22 } }),
-            projectId: z.string().optional(),
-          }),
+          schema: IngestSignalBodySchema,
         },
       },
     },
   },
   responses: {
+    200: {
+      description: 'Repeat coalesced into an existing signal and issue',
+      content: {
+        'application/json': {
+          schema: dataResponse(IngestSignalResultSchema),
+        },
+      },
+    },
     201: {
       description: 'Signal and linked issue created',
       content: {
         'application/json': {
-          schema: dataResponse(z.object({ signal: SignalSchema, issue: IssueSchema })),
+          schema: dataResponse(IngestSignalResultSchema),
         },
       },
     },
@@ -979,6 +1031,43 @@ registry.registerPath({
   },
 });
 
+registry.registerPath({
+  method: 'post',
+  path: '/api/signals/batch',
+  tags: ['Signals'],
+  summary: 'Ingest a batch of signals',
+  description:
+    'Ingests up to 500 signals in one transaction using multi-row inserts, with the same deduplication as single ingestion. Returns one entry per input, in order.',
+  security: [{ bearerAuth: [] }],
+  request: {
+    body: {
+      content: {
+        'application/json': {
+          schema: z.object({ signals: z.array(IngestSignalBodySchema).min(1).max(500) }),
+        },
+      },
+    },
+  },
+  responses: {
+    201: {
+      description: 'At least one new signal was created',
+      content: {
+        'application/json': {
+          schema: z.object({
+            data: z.array(
+              z.object({ signalId: IdSchema, issueId: IdSchema, deduplicated: z.boolean() })
+            ),
+            created: z.number().int().openapi({ example: 3 }),
+            deduplicated: z.number().int().openapi({ example: 47 }),
+          }),
+        },
+      },
+    },
+    200: { description: 'Every signal was coalesced into an existing one' },
+    422: { description: 'Validation error' },
+  },
+});
+
 // ─── Templates endpoints ──────────────────────────────────────────────────────
 
 registry.registerPath({
@@ -987,11 +1076,11 @@ registry.registerPath({
   tags: ['Templates'],
   summary: 'List prompt templates',
   security: [{ bearerAuth: [] }],
-  request: { query: PaginationQuerySchema },
+  request: { query: PaginationQuerySchema.merge(CursorQuerySchema) },
   responses: {
     200: {
       description: 'Paginated list of prompt templates',
-      content: { 'application/json': { schema: paginatedResponse(PromptTemplateSchema) } },
+      content: { 'application/json': { schema: cursorPaginatedResponse(PromptTemplateSchema) } },
     },
   },
 });
@@ -1249,31 +1338,31 @@ registry.registerPath({
 
 // ─── Prompt reviews endpoint ──────────────────────────────────────────────────
 
+const CreateReviewBodySchema = z.object({
+  versionId: IdSchema.openapi({ description: 'The prompt version being reviewed' }),
+  issueId: IdSchema.openapi({ description: 'The issue this prompt was used for' }),
+  clarity: z.number().int().min(1).max(5).openapi({ example: 4 }),
+  completeness: z.number().int().min(1).max(5).openapi({ example: 5 }),
+  relevance: z.number().int().min(1).max(5).openapi({ example: 3 }),
+  feedback: z
+    .string()
+    .optional()
+    .openapi({ example: 'Instructions were clear but missing error handling steps.' }),
+  authorType: z.enum(authorTypeValues).openapi({ example: 'agent' }),
+});
+
 registry.registerPath({
   method: 'post',
   path: '/api/prompt-reviews',
   tags: ['Prompt Reviews'],
   summary: 'Submit a prompt review',
   description:
-    "Submits a quality review for a prompt version. Updates the version's EWMA review score and triggers an improvement issue if quality degrades below threshold.",
+    "Submits a quality review for a prompt version. Atomically updates the version's review count, per-dimension sums and EWMA review score, and triggers an improvement issue if quality degrades below threshold.",
   security: [{ bearerAuth: [] }],
   request: {
     body: {
       content: {
-        'application/json': {
-          schema: z.object({
-            versionId: IdSchema.openapi({ description: 'The prompt version being reviewed' }),
-            issueId: IdSchema.openapi({ description: 'The issue this prompt was used for' }),
-            clarity: z.number().int().min(1).max(5).openapi({ example: 4 }),
-            completeness: z.number().int().min(1).max(5).openapi({ example: 5 }),
-            relevance: z.number().int().min(1).max(5).openapi({ example: 3 }),
-            feedback: z
-              .string()
-              .optional()
-              .openapi({ example: 'Instructions were clear but missing error handling steps.' }),
-            authorType: z.enum(authorTypeValues).openapi({ example: 'agent' }),
-          }),
-        },
+        'application/json': { schema: CreateReviewBodySchema },
       },
     },
   },
@@ -1287,6 +1376,33 @@ registry.registerPath({
   },
 });
 
+registry.registerPath({
+  method: 'post',
+  path: '/api/prompt-reviews/batch',
+  tags: ['Prompt Reviews'],
+  summary: 'Submit a batch of prompt reviews',
+  description:
+    'Submits up to 200 reviews in one transaction, with one aggregate update per version. Reviews for the same version are applied to its EWMA score in submission order. Returns the created reviews in input order.',
+  security: [{ bearerAuth: [] }],
+  request: {
+    body: {
+      content: {
+        'application/json': {
+          schema: z.object({ reviews: z.array(CreateReviewBodySchema).min(1).max(200) }),
+        },
+      },
+    },
+  },
+  responses: {
+    201: {
+      description: 'Reviews submitted',
+      content: { 'application/json': { schema: z.object({ data: z.array(PromptReviewSchema) }) } },
+    },
+    404: { description: 'A version in the batch was not found; nothing was written' },
+    422: { description: 'Validation error' },
+  },
+});
+
 // ─── Dispatch endpoints ───────────────────────────────────────────────────────
 
 const DispatchIssueSchema = z.object({
@@ -1298,13 +1414,30 @@ const DispatchIssueSchema = z.object({
   status: z.enum(issueStatusValues).openapi({ example: 'in_progress' }),
 });
 
+const DispatchResultSchema = z.object({
+  issue: DispatchIssueSchema,
+  prompt: z
+    .string()
+    .nullable()
+    .openapi({ description: 'Hydrated prompt text, or null if no template matched' }),
+  meta: z
+    .object({
+      templateSlug: z.string().openapi({ example: 'signal-triage' }),
+      templateId: IdSchema,
+      versionId: IdSchema,
+      versionNumber: z.number().int().openapi({ example: 1 }),
+      reviewUrl: z.string().openapi({ example: 'POST /api/prompt-reviews' }),
+    })
+    .nullable(),
+});
+
 registry.registerPath({
   method: 'get',
   path: '/api/dispatch/next',
   tags: ['Dispatch'],
   summary: 'Claim the highest-priority unblocked issue',
   description:
-    'Atomically claims the highest-priority unblocked todo issue using FOR UPDATE SKIP LOCKED, sets it to in_progress, selects the best matching template, and returns a hydrated prompt. Returns 204 when queue is empty.',
+    'Atomically claims the highest-priority unblocked todo issue using FOR UPDATE SKIP LOCKED, sets it to in_progress, selects the best matching template, and returns a hydrated prompt. When `count` is set, claims up to that many issues in one statement and returns them as `{ data: [...] }` in priority order. Returns 204 when queue is empty.',
   security: [{ bearerAuth: [] }],
   request: {
     query: z.object({
@@ -1315,29 +1448,38 @@ registry.registerPath({
           description: 'Restrict dispatch to issues in this project',
           example: 'cuid2_proj',
         }),
+      count: z.coerce
+        .number()
+        .int()
+        .min(1)
+        .max(50)
+        .optional()
+        .openapi({
+          description: 'Batch mode: claim up to this many issues in a single round trip',
+          example: 10,
+        }),
+      wait: z.coerce
+        .number()
+        .int()
+        .min(0)
+        .max(30)
+        .default(0)
+        .openapi({
+          description:
+            'Long-poll: when nothing is claimable, wait up to this many seconds for work to arrive before returning 204',
+          example: 20,
+        }),
     }),
   },
   responses: {
     200: {
-      description: 'Claimed issue with hydrated prompt',
+      description: 'Claimed issue with hydrated prompt, or a batch of them when `count` is set',
       content: {
         'application/json': {
-          schema: z.object({
-            issue: DispatchIssueSchema,
-            prompt: z
-              .string()
-              .nullable()
-              .openapi({ description: 'Hydrated prompt text, or null if no template matched' }),
-            meta: z
-              .object({
-                templateSlug: z.string().openapi({ example: 'signal-triage' }),
-                templateId: IdSchema,
-                versionId: IdSchema,
-                versionNumber: z.number().int().openapi({ example: 1 }),
-                reviewUrl: z.string().openapi({ example: 'POST /api/prompt-reviews' }),
-              })
-              .nullable(),
-          }),
+          schema: z.union([
+            DispatchResultSchema,
+            z.object({ data: z.array(DispatchResultSchema) }),
+          ]),
         },
       },
     },
@@ -1359,6 +1501,7 @@ registry.registerPath({
       projectId: z.string().optional().openapi({ example: 'cuid2_proj' }),
       limit: z.coerce.number().int().min(1).max(200).default(50).openapi({ example: 50 }),
       offset: z.coerce.number().int().min(0).default(0).openapi({ example: 0 }),
+      includeTotal: CursorQuerySchema.shape.includeTotal,
     }),
   },
   responses: {
@@ -1379,7 +1522,7 @@ registry.registerPath({
                 }),
               })
             ),
-            total: z.number().int().openapi({ example: 25 }),
+            total: z.number().int().optional().openapi({ example: 25 }),
           }),
         },
       },
@@ -1516,6 +1659,86 @@ registry.registerPath({
   },
 });
 
+registry.registerPath({
+  method: 'get',
+  path: '/api/dashboard/metrics',
+  tags: ['Dashboard'],
+  summary: 'Per-route request metrics',
+  description:
+    'Returns latency histograms, percentiles, mean DB time and query counts per route since the API instance started. Only available when the API runs with `REQUEST_METRICS=true`.',
+  security: [{ bearerAuth: [] }],
+  responses: {
+    200: {
+      description: 'Request metrics',
+      content: {
+        'application/json': {
+          schema: dataResponse(
+            z.object({
+              since: DateTimeSchema,
+              routes: z.array(
+                z.object({
+                  route: z.string().openapi({ example: 'GET /api/issues/:id' }),
+                  count: z.number().int().openapi({ example: 340 }),
+                  errors: z.number().int().openapi({ description: '5xx responses', example: 0 }),
+                  meanMs: z.number().openapi({ example: 8.42 }),
+                  maxMs: z.number().openapi({ example: 61.3 }),
+                  p50Ms: z.number().openapi({ example: 10 }),
+                  p95Ms: z.number().openapi({ example: 25 }),
+                  p99Ms: z.number().openapi({ example: 50 }),
+                  meanDbMs: z.number().openapi({ example: 5.1 }),
+                  meanQueries: z.number().openapi({ example: 2 }),
+                  maxQueries: z.number().int().openapi({ example: 2 }),
+                  histogram: z
+                    .array(
+                      z.object({
+                        leMs: z.number().nullable(),
+                        count: z.number().int(),
+                      })
+                    )
+                    .openapi({
+                      description:
+                        'Requests per latency bucket; `leMs: null` counts requests slower than the last bound',
+                    }),
+                })
+              ),
+            })
+          ),
+        },
+      },
+    },
+    401: { description: 'Unauthorized' },
+    404: { description: 'Request metrics are not enabled' },
+  },
+});
+
+// ─── Events endpoint ──────────────────────────────────────────────────────────
+
+registry.registerPath({
+  method: 'get',
+  path: '/api/events',
+  tags: ['Events'],
+  summary: 'Stream change events',
+  description:
+    'Server-sent event stream of `issue.created`, `issue.updated`, `issue.deleted`, `issue.claimed`, `signal.ingested` and `template.promoted` events. Each SSE message uses the event type as its `event` name and the event ID as its `id`; `data` is the JSON event `{ id, type, data, timestamp }`. Reconnect with `Last-Event-ID` to receive recently missed events.',
+  security: [{ bearerAuth: [] }],
+  request: {
+    query: z.object({
+      types: z.string().optional().openapi({
+        description: 'Comma-separated event types to receive (default: all)',
+        example: 'issue.created,issue.updated',
+      }),
+    }),
+  },
+  responses: {
+    200: {
+      description: 'Event stream',
+      content: { 'text/event-stream': { schema: z.string() } },
+    },
+    400: { description: 'Unknown event type' },
+    401: { description: 'Unauthorized' },
+  },
+});
+
 // ─── Webhook endpoints ────────────────────────────────────────────────────────
 
 registry.registerPath({
@@ -1658,6 +1881,7 @@ export function generateOpenApiDocument() {
       { name: 'Prompt Reviews', description: 'Quality reviews for prompt versions' },
       { name: 'Dispatch', description: 'AI agent work dispatch and queue preview' },
       { name: 'Dashboard', description: 'Aggregated system health metrics' },
+      { name: 'Events', description: 'Server-sent change events' },
       {
         name: 'Webhooks',
         description: 'Provider-specific inbound webhooks (PostHog, GitHub, Sentry)',
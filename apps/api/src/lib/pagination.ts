@@ -0,0 +1,112 @@
+import { asc, sql } from 'drizzle-orm';
+import type { SQL } from 'drizzle-orm';
+import type { AnyPgColumn } from 'drizzle-orm/pg-core';
+import { HTTPException } from 'hono/http-exception';
+import { z } from 'zod';
+
+// ─── Query parameters ───────────────────────────────────────────────────────
+
+/** `includeTotal` query parameter — `false` skips the `count()` over the full filter. */
+export const includeTotalParam = z
+  .enum(['true', 'false'])
+  .default('true')
+  .transform((value) => value === 'true');
+
+/** `cursor` query parameter — the opaque `nextCursor` returned by the previous page. */
+export const cursorParam = z.string().min(1).max(512).optional();
+
+// ─── Keysets ────────────────────────────────────────────────────────────────
+
+/** `timestamptz::text` output, e.g. `2026-01-31 09:15:02.123456+00`. */
+const POSTGRES_TIMESTAMP = /^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d{1,6})?[+-]\d{2}(:\d{2})?$/;
+
+/**
+ * A stable sort order that can resume after a given row. Rows are selected with
+ * an extra `sortKey` column (the exact sort value as text) from which the next
+ * cursor is built, so timestamps keep their full microsecond precision.
+ */
+export interface Keyset {
+  /** Selected alongside each row as `sortKey`. */
+  sortKey: SQL<string>;
+  /** ORDER BY expressions; the last one is unique so the order is total. */
+  orderBy: SQL[];
+  /** Condition matching the rows that come after `cursor`. Throws 400 on a bad cursor. */
+  after(cursor: string): SQL;
+  /** Cursor that resumes after `row`. */
+  cursorFor(row: { sortKey: string; id: string }): string;
+}
+
+/** Keyset over `(created_at, id)`, oldest first. */
+export function createdAtKeyset(table: { createdAt: AnyPgColumn; id: AnyPgColumn }): Keyset {
+  return {
+    sortKey: sql<string>`${table.createdAt}::text`,
+    orderBy: [asc(table.createdAt), asc(table.id)],
+    after(cursor) {
+      const [createdAt, id] = decodeCursor(cursor, 'createdAt');
+      if (!POSTGRES_TIMESTAMP.test(createdAt)) throw invalidCursor();
+      return sql`(${table.createdAt}, ${table.id}) > (${createdAt}::timestamptz, ${id})`;
+    },
+    cursorFor: (row) => encodeCursor('createdAt', row.sortKey, row.id),
+  };
+}
+
+/** Keyset over a unique serial `number` column, lowest first. */
+export function numberKeyset(table: { number: AnyPgColumn }): Keyset {
+  return {
+    sortKey: sql<string>`${table.number}::text`,
+    orderBy: [asc(table.number)],
+    after(cursor) {
+      const [number] = decodeCursor(cursor, 'number');
+      if (!/^\d+$/.test(number)) throw invalidCursor();
+      return sql`${table.number} > ${Number(number)}`;
+    },
+    cursorFor: (row) => encodeCursor('number', row.sortKey, row.id),
+  };
+}
+
+/**
+ * Turn rows fetched with `LIMIT limit + 1` into a page: the extra row only signals
+ * that another page exists. `sortKey` is stripped from the returned rows.
+ */
+export function toPage<T extends { sortKey: string; id: string }>(
+  rows: T[],
+  limit: number,
+  keyset: Keyset
+): { data: Omit<T, 'sortKey'>[]; nextCursor: string | null } {
+  const page = rows.slice(0, limit);
+  const last = page[page.length - 1];
+  return {
+    data: page.map(({ sortKey: _sortKey, ...row }) => row),
+    nextCursor: rows.length > limit && last ? keyset.cursorFor(last) : null,
+  };
+}
+
+// ─── Cursor encoding ────────────────────────────────────────────────────────
+
+/** Cursors are base64url JSON naming the keyset they belong to, so they cannot be mixed. */
+function encodeCursor(kind: string, sortKey: string, id: string): string {
+  return Buffer.from(JSON.stringify([kind, sortKey, id])).toString('base64url');
+}
+
+function decodeCursor(cursor: string, kind: string): [sortKey: string, id: string] {
+  let parsed: unknown;
+  try {
+    parsed = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+  } catch {
+    throw invalidCursor();
+  }
+  if (
+    !Array.isArray(parsed) ||
+    parsed.length !== 3 ||
+    parsed[0] !== kind ||
+    typeof parsed[1] !== 'string' ||
+    typeof parsed[2] !== 'string'
+  ) {
+    throw invalidCursor();
+  }
+  return [parsed[1], parsed[2]];
+}
+
+function invalidCursor(): HTTPException {
+  return new HTTPException(400, { message: 'Invalid cursor' });
+}
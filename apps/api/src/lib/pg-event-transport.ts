@@ -0,0 +1,261 @@
+import { createId } from '@paralleldrive/cuid2';
+import { env } from '../env';
+import type { EventTransport, LoopEvent } from './event-bus';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** Notification delivered by a LISTENing connection. */
+export interface PgNotification {
+  channel: string;
+  payload?: string;
+}
+
+/**
+ * The slice of a dedicated Postgres connection the transport needs. `pg.Client` and the
+ * Neon serverless `Client` both satisfy it.
+ */
+export interface NotifyConnection {
+  query(text: string, values?: unknown[]): Promise<unknown>;
+  on(event: 'notification', listener: (message: PgNotification) => void): unknown;
+  removeListener?(event: 'notification', listener: (message: PgNotification) => void): unknown;
+}
+
+/**
+ * A connection the transport opens and owns, and so can watch and replace. `pg.Client`
+ * and the Neon serverless `Client` both emit `error` and `end` when the session drops.
+ */
+export interface ManagedConnection extends NotifyConnection {
+  on(event: 'notification', listener: (message: PgNotification) => void): unknown;
+  on(event: 'error', listener: (err: Error) => void): unknown;
+  on(event: 'end', listener: () => void): unknown;
+  end(): Promise<unknown>;
+}
+
+export interface ReconnectOptions {
+  /** NOTIFY channel name; defaults to {@link EVENT_CHANNEL}. */
+  channel?: string;
+  /** Delay before the first reconnect attempt; doubles after each failure. */
+  initialDelayMs?: number;
+  /** Upper bound on the delay between reconnect attempts. */
+  maxDelayMs?: number;
+}
+
+/** Wire format: the event plus the sending instance, so senders can skip their own echo. */
+interface Envelope {
+  origin: string;
+  event: LoopEvent;
+}
+
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+/** NOTIFY channel shared by every API instance. */
+export const EVENT_CHANNEL = 'loop_events';
+
+/** Postgres rejects NOTIFY payloads of 8000 bytes or more. */
+const MAX_NOTIFY_PAYLOAD_BYTES = 7999;
+
+/** First delay before reopening a dropped LISTEN connection. */
+export const RECONNECT_INITIAL_DELAY_MS = 500;
+
+/** Longest delay between attempts to reopen a dropped LISTEN connection. */
+export const RECONNECT_MAX_DELAY_MS = 30_000;
+
+// ─── Transport ──────────────────────────────────────────────────────────────
+
+/**
+ * Fan events out between API instances with Postgres LISTEN/NOTIFY. Every instance
+ * LISTENs on one channel; publishing runs `pg_notify` with the event and this instance's
+ * origin ID, and notifications carrying our own origin are ignored.
+ *
+ * The connection must be a dedicated session (not a transaction-pooled one), since
+ * LISTEN registrations are tied to the backend connection.
+ *
+ * @param connection - A connected client reserved for event traffic
+ * @param channel - NOTIFY channel name; defaults to {@link EVENT_CHANNEL}
+ */
+export function createPgEventTransport(
+  connection: NotifyConnection,
+  channel = EVENT_CHANNEL
+): EventTransport {
+  const origin = createId();
+
+  return {
+    send: (event) => notify(connection, channel, origin, event),
+
+    async listen(onEvent) {
+      const onNotification = notificationHandler(channel, origin, onEvent);
+
+      connection.on('notification', onNotification);
+      await connection.query(`LISTEN ${quoteIdentifier(channel)}`);
+
+      return async () => {
+        connection.removeListener?.('notification', onNotification);
+        await connection.query(`UNLISTEN ${quoteIdentifier(channel)}`);
+      };
+    },
+  };
+}
+
+/**
+ * LISTEN/NOTIFY transport over connections it opens itself, so it survives a dropped
+ * session. When the connection emits `error` or `end`, the failure is logged and a new
+ * connection is opened with exponential backoff, then LISTEN runs again on it. Events
+ * sent by other instances while disconnected are not recovered, and events published
+ * locally meanwhile are not forwarded (the bus logs the failed send).
+ *
+ * @param open - Opens and connects a new dedicated session
+ * @param options - Channel and reconnect backoff
+ */
+export function createReconnectingPgEventTransport(
+  open: () => Promise<ManagedConnection>,
+  options: ReconnectOptions = {}
+): EventTransport {
+  const channel = options.channel ?? EVENT_CHANNEL;
+  const initialDelayMs = options.initialDelayMs ?? RECONNECT_INITIAL_DELAY_MS;
+  const maxDelayMs = options.maxDelayMs ?? RECONNECT_MAX_DELAY_MS;
+  const origin = createId();
+
+  let connection: ManagedConnection | null = null;
+  let onNotification: ((message: PgNotification) => void) | null = null;
+  let retryTimer: ReturnType<typeof setTimeout> | null = null;
+  let failures = 0;
+  let stopped = false;
+
+  /** Open a session, watch it for drops and LISTEN on it. */
+  async function attach(): Promise<void> {
+    const next = await open();
+    let dropped = false;
+    const onDrop = (err?: Error) => {
+      if (dropped || stopped) return;
+      dropped = true;
+      if (connection === next) connection = null;
+      next.end().catch(() => {});
+      console.error('Event notification connection lost, reconnecting', err ?? '');
+      scheduleReconnect();
+    };
+
+    next.on('error', onDrop);
+    next.on('end', () => onDrop());
+    next.on('notification', onNotification!);
+    try {
+      await next.query(`LISTEN ${quoteIdentifier(channel)}`);
+    } catch (err) {
+      dropped = true;
+      next.end().catch(() => {});
+      throw err;
+    }
+
+    // Stopped while reconnecting: nobody will close this session later
+    if (stopped) {
+      await next.end();
+      return;
+    }
+    connection = next;
+    failures = 0;
+  }
+
+  function scheduleReconnect(): void {
+    const delay = Math.min(initialDelayMs * 2 ** failures, maxDelayMs);
+    failures += 1;
+    retryTimer = setTimeout(() => {
+      retryTimer = null;
+      if (stopped) return;
+      attach().catch((err) => {
+        console.error('Event notification reconnect failed, retrying', err);
+        scheduleReconnect();
+      });
+    }, delay);
+  }
+
+  return {
+    async send(event) {
+      if (!connection) throw new Error('Event notification connection is down');
+      await notify(connection, channel, origin, event);
+    },
+
+    async listen(onEvent) {
+      onNotification = notificationHandler(channel, origin, onEvent);
+      await attach();
+
+      return async () => {
+        stopped = true;
+        if (retryTimer) clearTimeout(retryTimer);
+        const current = connection;
+        connection = null;
+        if (current) {
+          try {
+            await current.query(`UNLISTEN ${quoteIdentifier(channel)}`);
+          } finally {
+            await current.end();
+          }
+        }
+      };
+    },
+  };
+}
+
+/**
+ * Open dedicated connections to `url` for a reconnecting LISTEN/NOTIFY transport.
+ * Mirrors `db/index.ts`: the Neon serverless WebSocket client in production, `pg`
+ * elsewhere.
+ *
+ * @param url - Direct (non-pooled) Postgres connection string
+ */
+export async function connectPgEventTransport(url: string): Promise<EventTransport> {
+  let createClient: () => ManagedConnection & { connect(): Promise<unknown> };
+
+  if (env.NODE_ENV === 'production') {
+    const { Client, neonConfig } = await import('@neondatabase/serverless');
+    const { default: ws } = await import('ws');
+    neonConfig.webSocketConstructor = ws;
+    createClient = () => new Client(url);
+  } else {
+    const pg = await import('pg');
+    createClient = () => new pg.default.Client({ connectionString: url });
+  }
+
+  return createReconnectingPgEventTransport(async () => {
+    const client = createClient();
+    await client.connect();
+    return client;
+  });
+}
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+/** NOTIFY `channel` with an event, skipping payloads Postgres would reject. */
+async function notify(
+  connection: NotifyConnection,
+  channel: string,
+  origin: string,
+  event: LoopEvent
+): Promise<void> {
+  const payload = JSON.stringify({ origin, event } satisfies Envelope);
+  if (Buffer.byteLength(payload) > MAX_NOTIFY_PAYLOAD_BYTES) {
+    console.warn(`Event ${event.id} (${event.type}) exceeds the NOTIFY payload limit`);
+    return;
+  }
+  await connection.query('SELECT pg_notify($1, $2)', [channel, payload]);
+}
+
+/** Build a notification listener that delivers other instances' events to `onEvent`. */
+function notificationHandler(
+  channel: string,
+  origin: string,
+  onEvent: (event: LoopEvent) => void
+): (message: PgNotification) => void {
+  return (message) => {
+    if (message.channel !== channel || !message.payload) return;
+    try {
+      const envelope = JSON.parse(message.payload) as Envelope;
+      if (envelope.origin !== origin) onEvent(envelope.event);
+    } catch (err) {
+      console.error('Ignoring malformed event notification', err);
+    }
+  };
+}
+
+/** Quote a channel name for LISTEN/UNLISTEN, which do not accept bind parameters. */
+function quoteIdentifier(name: string): string {
+  return `"${name.replace(/"/g, '""')}"`;
+}
@@ -1,6 +1,6 @@
 import Handlebars from 'handlebars';
 import { z } from 'zod';
-import { eq, and, ne, isNull } from 'drizzle-orm';
+import { eq, and, inArray, isNull } from 'drizzle-orm';
 import {
   issueTypeValues,
   issues,
@@ -11,6 +11,7 @@ import {
   issueRelations,
 } from '../db/schema';
 import { PARTIALS } from './partials';
+import { LruCache } from './lru-cache';
 import { env } from '../env';
 import type { AnyDb } from '../types';
 
@@ -108,10 +109,10 @@ export interface TemplateCandidate {
  * 3. Sort: project-specific first, then by specificity descending
  * 4. Return first match, or null
  */
-export function selectTemplate(
-  templates: TemplateCandidate[],
+export function selectTemplate<T extends TemplateCandidate>(
+  templates: T[],
   context: IssueContext
-): TemplateCandidate | null {
+): T | null {
   const matching = templates
     .filter((t) => t.activeVersionId !== null)
     .filter((t) => matchesConditions(t.conditions, context))
@@ -152,8 +153,13 @@ export interface HydrationContext {
 
 // ─── Handlebars Setup ─────────────────────────────────────────────────────────
 
-/** Compiled template cache, keyed by version ID */
-const templateCache = new Map<string, Handlebars.TemplateDelegate>();
+/** Maximum number of compiled template delegates kept in memory. */
+export const COMPILED_TEMPLATE_CACHE_SIZE = 500;
+
+/** Compiled template cache, keyed by version ID. Bounded with LRU eviction. */
+const templateCache = new LruCache<string, Handlebars.TemplateDelegate>(
+  COMPILED_TEMPLATE_CACHE_SIZE
+);
 
 /** Register shared partials and helpers. Call once at module load. */
 export function initHandlebars(): void {
@@ -209,9 +215,16 @@ export function hydrateTemplate(
 
 // ─── Context Assembly ─────────────────────────────────────────────────────────
 
+/** A claimed issue paired with the template and version selected to render it. */
+export interface HydrationTarget {
+  issue: typeof issues.$inferSelect;
+  template: { id: string; slug: string };
+  version: { id: string; version: number };
+}
+
 /**
  * Assemble the full HydrationContext for a given issue from the database.
- * Runs parallel queries via Promise.all where possible to minimize latency.
+ * Delegates to {@link buildHydrationContexts} with a single target.
  *
  * @param db - Driver-agnostic Drizzle database instance
  * @param issue - The issue row to build context for
@@ -224,83 +237,137 @@ export async function buildHydrationContext(
   template: { id: string; slug: string },
   version: { id: string; version: number }
 ): Promise<HydrationContext> {
-  const [parentResult, labelResults, blockingResults, blockedByResults] = await Promise.all([
-    issue.parentId
-      ? db.select().from(issues).where(eq(issues.id, issue.parentId))
-      : Promise.resolve([]),
-    db
-      .select({ name: labels.name, color: labels.color })
-      .from(issueLabels)
-      .innerJoin(labels, eq(issueLabels.labelId, labels.id))
-      .where(eq(issueLabels.issueId, issue.id)),
-    db
-      .select({ id: issues.id, number: issues.number, title: issues.title })
-      .from(issueRelations)
-      .innerJoin(issues, eq(issueRelations.relatedIssueId, issues.id))
-      .where(and(eq(issueRelations.issueId, issue.id), eq(issueRelations.type, 'blocks'))),
-    db
-      .select({ id: issues.id, number: issues.number, title: issues.title })
-      .from(issueRelations)
-      .innerJoin(issues, eq(issueRelations.relatedIssueId, issues.id))
-      .where(and(eq(issueRelations.issueId, issue.id), eq(issueRelations.type, 'blocked_by'))),
-  ]);
-
-  const [siblingsOrChildren, projectResult] = await Promise.all([
-    issue.parentId
-      ? db
-          .select()
-          .from(issues)
-          .where(
-            and(
-              eq(issues.parentId, issue.parentId!),
-              ne(issues.id, issue.id),
-              isNull(issues.deletedAt)
-            )
+  const [context] = await buildHydrationContexts(db, [{ issue, template, version }]);
+  return context;
+}
+
+/**
+ * Assemble HydrationContexts for many issues at once using set-based queries.
+ * The number of queries is constant regardless of how many targets are passed,
+ * so batch dispatch does not pay a per-issue round trip.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param targets - Issues with their selected template and version identities
+ * @returns One context per target, in the same order as `targets`
+ */
+export async function buildHydrationContexts(
+  db: AnyDb,
+  targets: HydrationTarget[]
+): Promise<HydrationContext[]> {
+  if (targets.length === 0) return [];
+
+  const issueIds = targets.map((t) => t.issue.id);
+  const parentIds = unique(targets.map((t) => t.issue.parentId));
+  const projectIds = unique(targets.map((t) => t.issue.projectId));
+  // Siblings share a parent; children point at the issue itself.
+  const familyParentIds = unique([...parentIds, ...issueIds]);
+
+  const [parentRows, labelRows, relationRows, familyRows, projectRows, goalRows] =
+    await Promise.all([
+      parentIds.length > 0
+        ? db.select().from(issues).where(inArray(issues.id, parentIds))
+        : Promise.resolve([]),
+      db
+        .select({ issueId: issueLabels.issueId, name: labels.name, color: labels.color })
+        .from(issueLabels)
+        .innerJoin(labels, eq(issueLabels.labelId, labels.id))
+        .where(inArray(issueLabels.issueId, issueIds)),
+      db
+        .select({
+          issueId: issueRelations.issueId,
+          type: issueRelations.type,
+          id: issues.id,
+          number: issues.number,
+          title: issues.title,
+        })
+        .from(issueRelations)
+        .innerJoin(issues, eq(issueRelations.relatedIssueId, issues.id))
+        .where(
+          and(
+            inArray(issueRelations.issueId, issueIds),
+            inArray(issueRelations.type, ['blocks', 'blocked_by'])
           )
-      : db
-          .select()
-          .from(issues)
-          .where(and(eq(issues.parentId, issue.id), isNull(issues.deletedAt))),
-    issue.projectId
-      ? db.select().from(projects).where(eq(projects.id, issue.projectId))
-      : Promise.resolve([]),
-  ]);
-
-  const parent = parentResult[0] ?? null;
-  const project = projectResult[0] ?? null;
-
-  let goal = null;
-  if (project) {
-    const [goalResult] = await db.select().from(goals).where(eq(goals.projectId, project.id));
-    goal = goalResult ?? null;
-  }
+        ),
+      db
+        .select()
+        .from(issues)
+        .where(and(inArray(issues.parentId, familyParentIds), isNull(issues.deletedAt))),
+      projectIds.length > 0
+        ? db.select().from(projects).where(inArray(projects.id, projectIds))
+        : Promise.resolve([]),
+      projectIds.length > 0
+        ? db.select().from(goals).where(inArray(goals.projectId, projectIds))
+        : Promise.resolve([]),
+    ]);
 
-  const previousSessions: Array<{ status: string; agentSummary: string | null }> = [];
-  if (issue.agentSummary) {
-    previousSessions.push({ status: issue.status, agentSummary: issue.agentSummary });
+  const parentById = new Map(parentRows.map((p) => [p.id, p]));
+  const projectById = new Map(projectRows.map((p) => [p.id, p]));
+  const goalByProjectId = new Map<string, (typeof goalRows)[number]>();
+  for (const goal of goalRows) {
+    if (goal.projectId && !goalByProjectId.has(goal.projectId)) {
+      goalByProjectId.set(goal.projectId, goal);
+    }
   }
+  const labelsByIssueId = groupBy(labelRows, (l) => l.issueId);
+  const relationsByIssueId = groupBy(relationRows, (r) => r.issueId);
+  const familyByParentId = groupBy(familyRows, (f) => f.parentId!);
 
-  const siblings = issue.parentId ? siblingsOrChildren : [];
-  const children = issue.parentId ? [] : siblingsOrChildren;
-
-  return {
-    issue: issue as unknown as Record<string, unknown>,
-    parent: parent as Record<string, unknown> | null,
-    siblings: siblings as Record<string, unknown>[],
-    children: children as Record<string, unknown>[],
-    project: project as Record<string, unknown> | null,
-    goal: goal as Record<string, unknown> | null,
-    labels: labelResults,
-    blocking: blockingResults,
-    blockedBy: blockedByResults,
-    previousSessions,
-    loopUrl: env.LOOP_URL,
-    loopToken: env.LOOP_API_KEY,
-    meta: {
-      templateId: template.id,
-      templateSlug: template.slug,
-      versionId: version.id,
-      versionNumber: version.version,
-    },
-  };
+  return targets.map(({ issue, template, version }) => {
+    const parent = issue.parentId ? (parentById.get(issue.parentId) ?? null) : null;
+    const project = issue.projectId ? (projectById.get(issue.projectId) ?? null) : null;
+    const goal = project ? (goalByProjectId.get(project.id) ?? null) : null;
+    const relations = relationsByIssueId.get(issue.id) ?? [];
+
+    const siblings = issue.parentId
+      ? (familyByParentId.get(issue.parentId) ?? []).filter((s) => s.id !== issue.id)
+      : [];
+    const children = issue.parentId ? [] : (familyByParentId.get(issue.id) ?? []);
+
+    const previousSessions: Array<{ status: string; agentSummary: string | null }> = [];
+    if (issue.agentSummary) {
+      previousSessions.push({ status: issue.status, agentSummary: issue.agentSummary });
+    }
+
+    return {
+      issue: issue as unknown as Record<string, unknown>,
+      parent: parent as Record<string, unknown> | null,
+      siblings: siblings as Record<string, unknown>[],
+      children: children as Record<string, unknown>[],
+      project: project as Record<string, unknown> | null,
+      goal: goal as Record<string, unknown> | null,
+      labels: (labelsByIssueId.get(issue.id) ?? []).map(({ name, color }) => ({ name, color })),
+      blocking: relations
+        .filter((r) => r.type === 'blocks')
+        .map(({ id, number, title }) => ({ id, number, title })),
+      blockedBy: relations
+        .filter((r) => r.type === 'blocked_by')
+        .map(({ id, number, title }) => ({ id, number, title })),
+      previousSessions,
+      loopUrl: env.LOOP_URL,
+      loopToken: env.LOOP_API_KEY,
+      meta: {
+        templateId: template.id,
+        templateSlug: template.slug,
+        versionId: version.id,
+        versionNumber: version.version,
+      },
+    };
+  });
+}
+
+/** Deduplicate a list of nullable IDs, dropping nulls. */
+function unique(ids: Array<string | null>): string[] {
+  return [...new Set(ids.filter((id): id is string => id !== null))];
+}
+
+/** Group rows into a Map keyed by the given selector. */
+function groupBy<T>(rows: T[], key: (row: T) => string): Map<string, T[]> {
+  const grouped = new Map<string, T[]>();
+  for (const row of rows) {
+    const k = key(row);
+    const bucket = grouped.get(k);
+    if (bucket) bucket.push(row);
+    else grouped.set(k, [row]);
+  }
+  return grouped;
 }
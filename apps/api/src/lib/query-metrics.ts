@@ -0,0 +1,129 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+import type { Logger } from 'drizzle-orm/logger';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** Database work attributed to one request. */
+export interface QueryStats {
+  /** Statements issued through Drizzle. */
+  count: number;
+  /** Time spent waiting on the driver, summed over statements (overlapping ones add up). */
+  durationMs: number;
+}
+
+// ─── Request scope ──────────────────────────────────────────────────────────
+
+const scope = new AsyncLocalStorage<QueryStats>();
+
+/**
+ * Run `fn` with `stats` as the current request's query counters. Every query issued by
+ * an instrumented database from within `fn`, including in awaited callbacks, is added
+ * to `stats`.
+ */
+export function trackQueries<T>(stats: QueryStats, fn: () => T): T {
+  return scope.run(stats, fn);
+}
+
+/**
+ * Drizzle logger that counts statements against the current request. Pass it as the
+ * `logger` option when creating the Drizzle instance. Queries issued outside
+ * {@link trackQueries} are ignored.
+ */
+export const queryCounter: Logger = {
+  logQuery() {
+    const stats = scope.getStore();
+    if (stats) stats.count += 1;
+  },
+};
+
+// ─── Driver instrumentation ─────────────────────────────────────────────────
+
+/**
+ * Wrap a driver client so the time each query takes is added to the current request's
+ * {@link QueryStats}. Works with the clients Drizzle is given here: a node-postgres
+ * `Pool` (and the pooled clients it hands out for transactions), a PGlite instance
+ * (and its transaction handles), and a Neon HTTP `sql` function.
+ *
+ * Results are passed through untouched apart from their `then`, so lazy query objects
+ * such as Neon's still execute only when awaited and can still be batched.
+ */
+export function instrumentClient<T extends object>(client: T): T {
+  return new Proxy(client, {
+    apply(target, thisArg, args) {
+      return timed(() => Reflect.apply(target as (...a: unknown[]) => unknown, thisArg, args));
+    },
+    get(target, property) {
+      const value = Reflect.get(target, property, target);
+      if (typeof value !== 'function' || property === 'constructor') return value;
+
+      if (property === 'query') {
+        return (...args: unknown[]) => timed(() => value.apply(target, args));
+      }
+      if (property === 'connect') {
+        // node-postgres transactions run on a client checked out of the pool
+        return async (...args: unknown[]) => {
+          const connection = await value.apply(target, args);
+          return connection && typeof connection === 'object'
+            ? instrumentClient(connection)
+            : connection;
+        };
+      }
+      if (property === 'transaction') {
+        // PGlite passes a transaction handle to a callback; Neon takes an array of queries
+        return (first: unknown, ...rest: unknown[]) =>
+          typeof first === 'function'
+            ? value.call(target, (tx: object) => first(instrumentClient(tx)), ...rest)
+            : value.call(target, first, ...rest);
+      }
+      return value.bind(target);
+    },
+  });
+}
+
+/** Run a driver call, adding its duration to the current request once it settles. */
+function timed(run: () => unknown): unknown {
+  const stats = scope.getStore();
+  if (!stats) return run();
+
+  const start = performance.now();
+  const result = run();
+  if (!isThenable(result)) {
+    stats.durationMs += performance.now() - start;
+    return result;
+  }
+
+  let settled = false;
+  const settle = () => {
+    if (settled) return;
+    settled = true;
+    stats.durationMs += performance.now() - start;
+  };
+
+  return new Proxy(result, {
+    get(target, property) {
+      const value = Reflect.get(target, property, target);
+      if (property !== 'then') return typeof value === 'function' ? value.bind(target) : value;
+      return (onFulfilled?: (v: unknown) => unknown, onRejected?: (e: unknown) => unknown) =>
+        value.call(
+          target,
+          (resolved: unknown) => {
+            settle();
+            return onFulfilled ? onFulfilled(resolved) : resolved;
+          },
+          (error: unknown) => {
+            settle();
+            if (onRejected) return onRejected(error);
+            throw error;
+          }
+        );
+    },
+  });
+}
+
+function isThenable(value: unknown): value is PromiseLike<unknown> & object {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    typeof (value as { then?: unknown }).then === 'function'
+  );
+}
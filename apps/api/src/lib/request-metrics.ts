@@ -0,0 +1,124 @@
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+/** Upper bounds of the latency histogram buckets, in milliseconds. */
+export const LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000] as const;
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** Measurements for one completed request. */
+export interface RequestSample {
+  status: number;
+  durationMs: number;
+  dbMs: number;
+  queries: number;
+}
+
+/** Aggregated measurements for one route, as served by `/api/dashboard/metrics`. */
+export interface RouteMetricsSnapshot {
+  /** Method and route pattern, e.g. `GET /api/issues/:id`. */
+  route: string;
+  count: number;
+  errors: number;
+  meanMs: number;
+  maxMs: number;
+  /** Percentiles estimated from the histogram: the upper bound of the bucket they fall in. */
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  meanDbMs: number;
+  meanQueries: number;
+  maxQueries: number;
+  /** Requests per bucket; `leMs: null` counts requests slower than the last bound. */
+  histogram: Array<{ leMs: number | null; count: number }>;
+}
+
+interface RouteStats {
+  count: number;
+  errors: number;
+  totalMs: number;
+  maxMs: number;
+  dbMs: number;
+  queries: number;
+  maxQueries: number;
+  buckets: number[];
+}
+
+// ─── Registry ───────────────────────────────────────────────────────────────
+
+/**
+ * In-process per-route latency histograms and query counts. Memory is bounded by the
+ * number of route patterns, since requests are keyed by pattern rather than URL.
+ */
+export class RequestMetrics {
+  private readonly routes = new Map<string, RouteStats>();
+  private readonly startedAt = new Date();
+
+  /** Add one request to the stats for `route`. */
+  record(route: string, sample: RequestSample): void {
+    let stats = this.routes.get(route);
+    if (!stats) {
+      stats = {
+        count: 0,
+        errors: 0,
+        totalMs: 0,
+        maxMs: 0,
+        dbMs: 0,
+        queries: 0,
+        maxQueries: 0,
+        buckets: new Array(LATENCY_BUCKETS_MS.length + 1).fill(0),
+      };
+      this.routes.set(route, stats);
+    }
+
+    stats.count += 1;
+    if (sample.status >= 500) stats.errors += 1;
+    stats.totalMs += sample.durationMs;
+    stats.maxMs = Math.max(stats.maxMs, sample.durationMs);
+    stats.dbMs += sample.dbMs;
+    stats.queries += sample.queries;
+    stats.maxQueries = Math.max(stats.maxQueries, sample.queries);
+
+    const bucket = LATENCY_BUCKETS_MS.findIndex((bound) => sample.durationMs <= bound);
+    stats.buckets[bucket === -1 ? LATENCY_BUCKETS_MS.length : bucket] += 1;
+  }
+
+  /** Per-route summaries, busiest route first. */
+  snapshot(): { since: string; routes: RouteMetricsSnapshot[] } {
+    const routes = [...this.routes.entries()].map(([route, stats]) => ({
+      route,
+      count: stats.count,
+      errors: stats.errors,
+      meanMs: round(stats.totalMs / stats.count),
+      maxMs: round(stats.maxMs),
+      p50Ms: percentile(stats, 0.5),
+      p95Ms: percentile(stats, 0.95),
+      p99Ms: percentile(stats, 0.99),
+      meanDbMs: round(stats.dbMs / stats.count),
+      meanQueries: round(stats.queries / stats.count),
+      maxQueries: stats.maxQueries,
+      histogram: stats.buckets.map((count, index) => ({
+        leMs: LATENCY_BUCKETS_MS[index] ?? null,
+        count,
+      })),
+    }));
+    routes.sort((a, b) => b.count - a.count || a.route.localeCompare(b.route));
+    return { since: this.startedAt.toISOString(), routes };
+  }
+}
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+function round(value: number): number {
+  return Math.round(value * 100) / 100;
+}
+
+/** Upper bound of the bucket holding quantile `q`; the observed max past the last bound. */
+function percentile(stats: RouteStats, q: number): number {
+  const rank = Math.ceil(q * stats.count);
+  let seen = 0;
+  for (let index = 0; index < LATENCY_BUCKETS_MS.length; index++) {
+    seen += stats.buckets[index];
+    if (seen >= rank) return Math.min(LATENCY_BUCKETS_MS[index], round(stats.maxMs));
+  }
+  return round(stats.maxMs);
+}
@@ -0,0 +1,287 @@
+import { and, eq, inArray, isNull, sql } from 'drizzle-orm';
+import { createId } from '@paralleldrive/cuid2';
+import { HTTPException } from 'hono/http-exception';
+import { promptTemplates, promptVersions, promptReviews } from '../db/schema/prompts';
+import type { authorTypeValues } from '../db/schema/issues';
+import { issues, labels, issueLabels } from '../db/schema/issues';
+import { eventBus, toIssueEventData } from './event-bus';
+import type { AnyDb } from '../types';
+
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+/** Smoothing factor for exponentially weighted moving average of review scores. */
+export const EWMA_ALPHA = 0.3;
+
+/** Minimum review score threshold for a version to be considered well-reviewed. */
+export const REVIEW_SCORE_THRESHOLD = 3.5;
+
+/** Number of reviews after which the EWMA score is considered stable. */
+export const REVIEW_COUNT_THRESHOLD = 15;
+
+/** Minimum number of reviews required before score-based decisions are made. */
+export const REVIEW_MIN_SAMPLES = 3;
+
+/** Upper bound on reviews accepted by a single batch request. */
+export const MAX_REVIEW_BATCH = 200;
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+export interface ReviewInput {
+  versionId: string;
+  issueId: string;
+  clarity: number;
+  completeness: number;
+  relevance: number;
+  feedback?: string;
+  authorType: (typeof authorTypeValues)[number];
+}
+
+/** A version's aggregate after a write, as returned by {@link recordReviews}. */
+export interface VersionAggregate {
+  id: string;
+  templateId: string;
+  version: number;
+  reviewCount: number;
+  reviewScore: number | null;
+}
+
+export interface RecordedReviews {
+  /** Created reviews, in input order. */
+  reviews: Array<typeof promptReviews.$inferSelect>;
+  /** Updated aggregate of every version that received a review. */
+  versions: VersionAggregate[];
+}
+
+/**
+ * The EWMA update for a run of composites applied in order, reduced to constants so it
+ * can be applied to the stored score in one statement: `score * decay + increment`, or
+ * `seeded` when the version has no score yet (the first review sets it directly).
+ */
+interface EwmaStep {
+  decay: number;
+  increment: number;
+  seeded: number;
+}
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+/** Composite score of a review: the mean of its three dimensions. */
+export function compositeScore(
+  review: Pick<ReviewInput, 'clarity' | 'completeness' | 'relevance'>
+): number {
+  return (review.clarity + review.completeness + review.relevance) / 3;
+}
+
+/** Fold composites, oldest first, into a single {@link EwmaStep}. */
+function foldEwma(composites: number[]): EwmaStep {
+  let decay = 1;
+  let increment = 0;
+  let seeded = composites[0];
+  composites.forEach((composite, index) => {
+    decay *= 1 - EWMA_ALPHA;
+    increment = EWMA_ALPHA * composite + (1 - EWMA_ALPHA) * increment;
+    if (index > 0) seeded = EWMA_ALPHA * composite + (1 - EWMA_ALPHA) * seeded;
+  });
+  return { decay, increment, seeded };
+}
+
+// ─── Recording ──────────────────────────────────────────────────────────────
+
+/**
+ * Insert reviews and fold them into their versions' running aggregate.
+ *
+ * Each version's `review_count`, per-dimension sums and EWMA `review_score` are updated
+ * by one grouped UPDATE computed from the stored values, so concurrent writers serialize
+ * on the row lock instead of overwriting each other's read. Reviews for the same version
+ * are applied to the EWMA in input order. The update and the multi-row review INSERT
+ * share a transaction; a batch naming an unknown version is rejected with 404 as a whole.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param inputs - Validated reviews in submission order
+ */
+export async function recordReviews(db: AnyDb, inputs: ReviewInput[]): Promise<RecordedReviews> {
+  if (inputs.length === 0) return { reviews: [], versions: [] };
+
+  const byVersion = new Map<string, ReviewInput[]>();
+  for (const input of inputs) {
+    const group = byVersion.get(input.versionId);
+    if (group) group.push(input);
+    else byVersion.set(input.versionId, [input]);
+  }
+  const versionIds = [...byVersion.keys()].sort();
+
+  return db.transaction(async (tx: AnyDb) => {
+    if (versionIds.length > 1) {
+      // Take row locks in id order so overlapping batches cannot deadlock
+      await tx
+        .select({ id: promptVersions.id })
+        .from(promptVersions)
+        .where(inArray(promptVersions.id, versionIds))
+        .orderBy(promptVersions.id)
+        .for('update');
+    }
+
+    const values = sql.join(
+      versionIds.map((versionId) => {
+        const group = byVersion.get(versionId)!;
+        const step = foldEwma(group.map(compositeScore));
+        const sum = (key: 'clarity' | 'completeness' | 'relevance') =>
+          group.reduce((total, review) => total + review[key], 0);
+        return sql`(${versionId}, ${group.length}::int, ${sum('clarity')}::int,
+          ${sum('completeness')}::int, ${sum('relevance')}::int, ${step.decay}::float8,
+          ${step.increment}::float8, ${step.seeded}::float8)`;
+      }),
+      sql`, `
+    );
+
+    const columns = sql.raw(
+      'version_id, n, clarity, completeness, relevance, decay, increment, seeded'
+    );
+    const versions = await tx
+      .update(promptVersions)
+      .set({
+        reviewCount: sql`${promptVersions.reviewCount} + v.n`,
+        claritySum: sql`${promptVersions.claritySum} + v.clarity`,
+        completenessSum: sql`${promptVersions.completenessSum} + v.completeness`,
+        relevanceSum: sql`${promptVersions.relevanceSum} + v.relevance`,
+        reviewScore: sql`CASE WHEN ${promptVersions.reviewScore} IS NULL THEN v.seeded
+          ELSE ${promptVersions.reviewScore} * v.decay + v.increment END`,
+      })
+      .from(sql`(VALUES ${values}) AS v(${columns})`)
+      .where(sql`${promptVersions.id} = v.version_id`)
+      .returning({
+        id: promptVersions.id,
+        templateId: promptVersions.templateId,
+        version: promptVersions.version,
+        reviewCount: promptVersions.reviewCount,
+        reviewScore: promptVersions.reviewScore,
+      });
+
+    if (versions.length < versionIds.length) {
+      throw new HTTPException(404, { message: 'Version not found' });
+    }
+
+    // IDs are assigned up front so results never rely on RETURNING order
+    const ids = inputs.map(() => createId());
+    const inserted = await tx
+      .insert(promptReviews)
+      .values(inputs.map((input, index) => ({ ...input, id: ids[index] })))
+      .returning();
+    const reviewById = new Map(inserted.map((row) => [row.id, row]));
+
+    return { reviews: ids.map((id) => reviewById.get(id)!), versions };
+  });
+}
+
+// ─── Improvement loop ───────────────────────────────────────────────────────
+
+/** Whether a version's aggregate calls for an improvement issue. */
+export function needsImprovement(
+  version: Pick<VersionAggregate, 'reviewCount' | 'reviewScore'>
+): boolean {
+  if (version.reviewCount < REVIEW_MIN_SAMPLES) return false;
+  return (
+    (version.reviewScore !== null && version.reviewScore < REVIEW_SCORE_THRESHOLD) ||
+    version.reviewCount >= REVIEW_COUNT_THRESHOLD
+  );
+}
+
+/**
+ * Open an improvement issue for each version whose aggregate crosses the review
+ * thresholds, unless its template already has an open one. Reads only the aggregates
+ * returned by {@link recordReviews}; templates are loaded just for versions that trigger.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param versions - Aggregates returned by {@link recordReviews}
+ */
+export async function triggerImprovementIssues(
+  db: AnyDb,
+  versions: VersionAggregate[]
+): Promise<void> {
+  const triggered = versions.filter(needsImprovement);
+  if (triggered.length === 0) return;
+
+  const templates = await db
+    .select()
+    .from(promptTemplates)
+    .where(inArray(promptTemplates.id, [...new Set(triggered.map((v) => v.templateId))]));
+  const templateById = new Map(templates.map((template) => [template.id, template]));
+
+  for (const version of triggered) {
+    const template = templateById.get(version.templateId);
+    if (template) await createImprovementIssue(db, template, version);
+  }
+}
+
+/** Create the improvement issue for one version, skipping templates that already have one. */
+async function createImprovementIssue(
+  db: AnyDb,
+  template: typeof promptTemplates.$inferSelect,
+  version: VersionAggregate
+): Promise<void> {
+  const score = version.reviewScore ?? 0;
+
+  // Check if an improvement issue already exists (prevent duplicates)
+  const existingImprovementTitle = `Improve prompt template: ${template.slug}`;
+  const [existingIssue] = await db
+    .select({ id: issues.id })
+    .from(issues)
+    .where(
+      and(
+        sql`${issues.title} LIKE ${existingImprovementTitle + '%'}`,
+        sql`${issues.status} NOT IN ('done', 'canceled')`,
+        isNull(issues.deletedAt)
+      )
+    );
+
+  if (existingIssue) return;
+
+  const [improvementIssue] = await db
+    .insert(issues)
+    .values({
+      title: `Improve prompt template: ${template.slug} (avg review ${score.toFixed(1)}/5, ${version.reviewCount} reviews since v${version.version})`,
+      type: 'task',
+      status: 'todo',
+      priority: 3,
+      description: [
+        `## Prompt Improvement Required`,
+        ``,
+        `Template **${template.slug}** (${template.name}) has degraded quality.`,
+        ``,
+        `- EWMA Score: ${score.toFixed(2)}/5`,
+        `- Review Count: ${version.reviewCount}`,
+        `- Version: v${version.version}`,
+        `- Version ID: ${version.id}`,
+        ``,
+        `## Action Required`,
+        ``,
+        `1. Review recent feedback on this template`,
+        `2. Create a new version addressing the issues`,
+        `3. Promote the new version to active`,
+      ].join('\n'),
+    })
+    .returning();
+
+  // Create/find "prompt-improvement" and "meta" labels, link to issue
+  for (const labelName of ['prompt-improvement', 'meta']) {
+    await db
+      .insert(labels)
+      .values({
+        name: labelName,
+        color: labelName === 'meta' ? '#6b7280' : '#f59e0b',
+      })
+      .onConflictDoNothing();
+    const [label] = await db
+      .select({ id: labels.id })
+      .from(labels)
+      .where(eq(labels.name, labelName));
+    if (label) {
+      await db
+        .insert(issueLabels)
+        .values({ issueId: improvementIssue.id, labelId: label.id })
+        .onConflictDoNothing();
+    }
+  }
+
+  eventBus.publish('issue.created', toIssueEventData(improvementIssue));
+}
@@ -0,0 +1,326 @@
+import { and, desc, eq, gte, isNull, notInArray, sql } from 'drizzle-orm';
+import { createId } from '@paralleldrive/cuid2';
+import { signals } from '../db/schema/signals';
+import { issues } from '../db/schema/issues';
+import type { signalSeverityValues } from '../db/schema/signals';
+import { env } from '../env';
+import { eventBus, toIssueEventData } from './event-bus';
+import type { AnyDb } from '../types';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+export type Severity = (typeof signalSeverityValues)[number];
+
+/** A normalized signal ready to be written, produced by the generic and webhook routes. */
+export interface SignalInput {
+  source: string;
+  sourceId: string | null;
+  type: string;
+  severity: Severity;
+  payload: Record<string, unknown>;
+  projectId: string | null;
+  /** Title of the triage issue created when the signal is not a repeat. */
+  title: string;
+}
+
+/** Outcome for one input signal. */
+export interface IngestedSignal {
+  signal: typeof signals.$inferSelect;
+  issue: typeof issues.$inferSelect;
+  /** True when the input was folded into an existing signal instead of creating one. */
+  deduplicated: boolean;
+}
+
+export interface IngestOptions {
+  /**
+   * Repeats of the same `(source, sourceId, type)` seen within this many milliseconds of the
+   * previous occurrence are coalesced. Zero disables deduplication.
+   */
+  dedupWindowMs: number;
+}
+
+/** Inputs sharing a dedup key, in arrival order. */
+interface SignalGroup {
+  key: string | null;
+  indexes: number[];
+  /** Most recent input in the group; its payload wins. */
+  latest: SignalInput;
+}
+
+// ─── Constants ──────────────────────────────────────────────────────────────
+
+/** Severity → triage issue priority. */
+export const SEVERITY_PRIORITY_MAP: Record<Severity, number> = {
+  critical: 1,
+  high: 2,
+  medium: 3,
+  low: 4,
+};
+
+/** Upper bound on signals accepted by a single batch request. */
+export const MAX_SIGNAL_BATCH = 500;
+
+/** Dedup window configured by `SIGNAL_DEDUP_WINDOW_SECONDS`. */
+function defaultOptions(): IngestOptions {
+  return { dedupWindowMs: env.SIGNAL_DEDUP_WINDOW_SECONDS * 1000 };
+}
+
+// ─── Helpers ────────────────────────────────────────────────────────────────
+
+/** Signals without a sourceId cannot be correlated and are never deduplicated. */
+function dedupKey(input: SignalInput): string | null {
+  if (input.sourceId === null) return null;
+  return JSON.stringify([input.source, input.sourceId, input.type]);
+}
+
+/** Group inputs by dedup key, preserving the order in which each key first appeared. */
+function groupInputs(inputs: SignalInput[], dedup: boolean): SignalGroup[] {
+  const groups: SignalGroup[] = [];
+  const byKey = new Map<string, SignalGroup>();
+
+  inputs.forEach((input, index) => {
+    const key = dedup ? dedupKey(input) : null;
+    const existing = key !== null ? byKey.get(key) : undefined;
+    if (existing) {
+      existing.indexes.push(index);
+      existing.latest = input;
+      return;
+    }
+    const group = { key, indexes: [index], latest: input };
+    groups.push(group);
+    if (key !== null) byKey.set(key, group);
+  });
+
+  return groups;
+}
+
+// ─── Pipeline ───────────────────────────────────────────────────────────────
+
+/**
+ * Write a batch of signals with their triage issues, coalescing repeats.
+ *
+ * Inputs sharing `(source, sourceId, type)` are merged in memory first, then matched
+ * against the most recent open signal for that key inside the dedup window. Matches
+ * bump the stored signal's `occurrences`, refresh its payload and `lastSeenAt`, and
+ * copy the payload onto the linked issue. Everything else is written with one
+ * multi-row INSERT per table. The whole batch runs in a single transaction, with
+ * per-key advisory locks so concurrent deliveries of the same event do not race.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param inputs - Normalized signals in arrival order
+ * @param options - Deduplication window; defaults to `SIGNAL_DEDUP_WINDOW_SECONDS`
+ * @returns One result per input, in the same order
+ */
+export async function ingestSignals(
+  db: AnyDb,
+  inputs: SignalInput[],
+  options: IngestOptions = defaultOptions()
+): Promise<IngestedSignal[]> {
+  if (inputs.length === 0) return [];
+
+  const dedup = options.dedupWindowMs > 0;
+  const groups = groupInputs(inputs, dedup);
+  const keyed = groups.filter((g): g is SignalGroup & { key: string } => g.key !== null);
+
+  const results = await db.transaction(async (tx: AnyDb) => {
+    const now = new Date();
+    const existingByKey = new Map<
+      string,
+      { signal: typeof signals.$inferSelect; issue: typeof issues.$inferSelect }
+    >();
+
+    if (keyed.length > 0) {
+      // Serialize writers per key; sorted to keep lock order consistent across batches
+      const lockKeys = sql.join(
+        keyed
+          .map((g) => g.key)
+          .sort()
+          .map((key) => sql`(${key})`),
+        sql`, `
+      );
+      await tx.execute(sql`
+        SELECT pg_advisory_xact_lock(hashtext(v.k))
+        FROM (VALUES ${lockKeys}) AS v(k)
+        ORDER BY v.k
+      `);
+
+      const tuples = sql.join(
+        keyed.map(({ latest }) => sql`(${latest.source}, ${latest.sourceId}, ${latest.type})`),
+        sql`, `
+      );
+      const matches = await tx
+        .selectDistinctOn([signals.source, signals.sourceId, signals.type], {
+          signal: signals,
+          issue: issues,
+        })
+        .from(signals)
+        .innerJoin(issues, eq(signals.issueId, issues.id))
+        .where(
+          and(
+            sql`(${signals.source}, ${signals.sourceId}, ${signals.type}) IN (${tuples})`,
+            gte(signals.lastSeenAt, new Date(now.getTime() - options.dedupWindowMs)),
+            isNull(issues.deletedAt),
+            notInArray(issues.status, ['done', 'canceled'])
+          )
+        )
+        .orderBy(signals.source, signals.sourceId, signals.type, desc(signals.lastSeenAt));
+
+      for (const match of matches) {
+        const { source, sourceId, type } = match.signal;
+        existingByKey.set(JSON.stringify([source, sourceId, type]), match);
+      }
+    }
+
+    const results: IngestedSignal[] = new Array(inputs.length);
+    const coalesced: Array<{ group: SignalGroup; signalId: string; issueId: string }> = [];
+    const created: Array<{ group: SignalGroup; signalId: string; issueId: string }> = [];
+
+    for (const group of groups) {
+      const match = group.key !== null ? existingByKey.get(group.key) : undefined;
+      if (match) {
+        coalesced.push({ group, signalId: match.signal.id, issueId: match.issue.id });
+        const signal = {
+          ...match.signal,
+          payload: group.latest.payload,
+          occurrences: match.signal.occurrences + group.indexes.length,
+          lastSeenAt: now,
+        };
+        const issue = { ...match.issue, signalPayload: group.latest.payload, updatedAt: now };
+        for (const index of group.indexes) {
+          results[index] = { signal, issue, deduplicated: true };
+        }
+      } else {
+        created.push({ group, signalId: createId(), issueId: createId() });
+      }
+    }
+
+    if (coalesced.length > 0) {
+      // One grouped UPDATE per table, driven by a VALUES list of per-key changes
+      const seenAt = now.toISOString();
+      const signalValues = sql.join(
+        coalesced.map(({ group, signalId }) => {
+          const payload = JSON.stringify(group.latest.payload);
+          return sql`(${signalId}, ${group.indexes.length}::int, ${payload}::jsonb)`;
+        }),
+        sql`, `
+      );
+      await tx.execute(sql`
+        UPDATE signals
+        SET occurrences = signals.occurrences + v.n,
+          payload = v.payload,
+          last_seen_at = ${seenAt}::timestamptz
+        FROM (VALUES ${signalValues}) AS v(id, n, payload)
+        WHERE signals.id = v.id
+      `);
+
+      const issueValues = sql.join(
+        coalesced.map(({ group, issueId }) => {
+          const payload = JSON.stringify(group.latest.payload);
+          return sql`(${issueId}, ${payload}::jsonb)`;
+        }),
+        sql`, `
+      );
+      await tx.execute(sql`
+        UPDATE issues
+        SET signal_payload = v.payload, updated_at = ${seenAt}::timestamptz
+        FROM (VALUES ${issueValues}) AS v(id, payload)
+        WHERE issues.id = v.id
+      `);
+    }
+
+    if (created.length > 0) {
+      // IDs are assigned up front so linking signals to issues never relies on RETURNING order
+      const insertedIssues = await tx
+        .insert(issues)
+        .values(
+          created.map(({ group, issueId }) => ({
+            id: issueId,
+            title: group.latest.title,
+            type: 'signal' as const,
+            status: 'triage' as const,
+            priority: SEVERITY_PRIORITY_MAP[group.latest.severity],
+            projectId: group.latest.projectId,
+            signalSource: group.latest.source,
+            signalPayload: group.latest.payload,
+          }))
+        )
+        .returning();
+
+      const insertedSignals = await tx
+        .insert(signals)
+        .values(
+          created.map(({ group, signalId, issueId }) => ({
+            id: signalId,
+            source: group.latest.source,
+            sourceId: group.latest.sourceId,
+            type: group.latest.type,
+            severity: group.latest.severity,
+            payload: group.latest.payload,
+            issueId,
+            occurrences: group.indexes.length,
+          }))
+        )
+        .returning();
+
+      const issueById = new Map(insertedIssues.map((row) => [row.id, row]));
+      const signalById = new Map(insertedSignals.map((row) => [row.id, row]));
+
+      for (const { group, signalId, issueId } of created) {
+        const signal = signalById.get(signalId)!;
+        const issue = issueById.get(issueId)!;
+        group.indexes.forEach((index, position) => {
+          results[index] = { signal, issue, deduplicated: position > 0 };
+        });
+      }
+    }
+
+    return results;
+  });
+
+  publishIngested(results);
+  return results;
+}
+
+/**
+ * Publish one `signal.ingested` per input, plus one issue event per touched issue. The
+ * first result for a new issue is never deduplicated; one coalesced into an existing
+ * issue always is.
+ */
+function publishIngested(results: IngestedSignal[]): void {
+  const announced = new Set<string>();
+  for (const { signal, issue, deduplicated } of results) {
+    if (!announced.has(issue.id)) {
+      announced.add(issue.id);
+      if (deduplicated) {
+        const data = { ...toIssueEventData(issue), fields: ['signalPayload'] };
+        eventBus.publish('issue.updated', data);
+      } else {
+        eventBus.publish('issue.created', toIssueEventData(issue));
+      }
+    }
+    eventBus.publish('signal.ingested', {
+      signalId: signal.id,
+      issueId: issue.id,
+      source: signal.source,
+      type: signal.type,
+      severity: signal.severity,
+      deduplicated,
+    });
+  }
+}
+
+/**
+ * Ingest a single signal through the batch pipeline.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param input - Normalized signal
+ * @param options - Deduplication window; defaults to `SIGNAL_DEDUP_WINDOW_SECONDS`
+ */
+export async function ingestSignal(
+  db: AnyDb,
+  input: SignalInput,
+  options: IngestOptions = defaultOptions()
+): Promise<IngestedSignal> {
+  const [result] = await ingestSignals(db, [input], options);
+  return result;
+}
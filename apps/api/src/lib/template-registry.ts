@@ -0,0 +1,321 @@
+import { inArray, isNull } from 'drizzle-orm';
+import { promptTemplates, promptVersions } from '../db/schema';
+import { LruCache } from './lru-cache';
+import { selectTemplate } from './prompt-engine';
+import type { IssueContext, TemplateCandidate, TemplateConditions } from './prompt-engine';
+import type { AnyDb } from '../types';
+
+// ─── Constants ───────────────────────────────────────────────────────────────
+
+/**
+ * Maximum age of the in-process template index before it is reloaded.
+ * Route handlers invalidate eagerly; the TTL bounds staleness when another
+ * API instance changes templates.
+ */
+export const TEMPLATE_INDEX_TTL_MS = 30_000;
+
+/** Maximum number of active version bodies kept in memory per database. */
+export const VERSION_CACHE_SIZE = 500;
+
+// ─── Types ───────────────────────────────────────────────────────────────────
+
+/** A selectable template held by the registry. */
+export interface RegisteredTemplate extends TemplateCandidate {
+  name: string;
+  /** Position in load order, used to keep tie-breaking identical to a full scan. */
+  position: number;
+}
+
+/** Immutable content of a prompt version needed to render a prompt. */
+export interface CachedVersion {
+  id: string;
+  templateId: string;
+  version: number;
+  content: string;
+}
+
+/**
+ * Templates bucketed by their most selective indexed condition. Every template
+ * lives in exactly one bucket, and can only match a context whose value for that
+ * key equals the bucket key, so selection only needs to look at the buckets the
+ * context points to.
+ */
+interface TemplateIndex {
+  loadedAt: number;
+  byProjectId: Map<string, RegisteredTemplate[]>;
+  bySignalSource: Map<string, RegisteredTemplate[]>;
+  byType: Map<string, RegisteredTemplate[]>;
+  byLabel: Map<string, RegisteredTemplate[]>;
+  unconditioned: RegisteredTemplate[];
+  /** Templates whose only condition is `type`, used as the dispatch fallback. */
+  typeDefaults: Map<string, RegisteredTemplate[]>;
+  /** Every template with a `type` condition, in load order, used as the preview fallback. */
+  typeConditioned: Map<string, RegisteredTemplate[]>;
+}
+
+interface RegistryState {
+  index: TemplateIndex | null;
+  loading: Promise<TemplateIndex> | null;
+  generation: number;
+  versions: LruCache<string, CachedVersion>;
+}
+
+// ─── State ───────────────────────────────────────────────────────────────────
+
+/**
+ * Registry state per database instance. Keyed weakly so isolated test databases
+ * never share cached templates and are garbage-collected with their state.
+ */
+const registries = new WeakMap<AnyDb, RegistryState>();
+
+function stateFor(db: AnyDb): RegistryState {
+  let state = registries.get(db);
+  if (!state) {
+    state = {
+      index: null,
+      loading: null,
+      generation: 0,
+      versions: new LruCache(VERSION_CACHE_SIZE),
+    };
+    registries.set(db, state);
+  }
+  return state;
+}
+
+// ─── Index construction ──────────────────────────────────────────────────────
+
+function pushTo(map: Map<string, RegisteredTemplate[]>, key: string, t: RegisteredTemplate) {
+  const bucket = map.get(key);
+  if (bucket) bucket.push(t);
+  else map.set(key, [t]);
+}
+
+/** Build a bucketed index from the loaded template list. */
+export function buildTemplateIndex(templates: RegisteredTemplate[]): TemplateIndex {
+  const index: TemplateIndex = {
+    loadedAt: Date.now(),
+    byProjectId: new Map(),
+    bySignalSource: new Map(),
+    byType: new Map(),
+    byLabel: new Map(),
+    unconditioned: [],
+    typeDefaults: new Map(),
+    typeConditioned: new Map(),
+  };
+
+  for (const t of templates) {
+    // Templates without an active version can never be selected
+    if (t.activeVersionId === null) continue;
+
+    const { conditions } = t;
+    if (conditions.projectId !== undefined) {
+      pushTo(index.byProjectId, conditions.projectId, t);
+    } else if (conditions.signalSource !== undefined) {
+      pushTo(index.bySignalSource, conditions.signalSource, t);
+    } else if (conditions.type !== undefined) {
+      pushTo(index.byType, conditions.type, t);
+    } else if (conditions.labels !== undefined && conditions.labels.length > 0) {
+      pushTo(index.byLabel, conditions.labels[0], t);
+    } else {
+      index.unconditioned.push(t);
+    }
+
+    if (conditions.type !== undefined && Object.keys(conditions).length === 1) {
+      pushTo(index.typeDefaults, conditions.type, t);
+    }
+    if (conditions.type !== undefined) {
+      pushTo(index.typeConditioned, conditions.type, t);
+    }
+  }
+
+  return index;
+}
+
+/**
+ * Select the best template for a context from an index. Produces the same result
+ * as running `selectTemplate` over the full list followed by the type-default
+ * fallback, but only touches the buckets relevant to the context.
+ */
+export function selectFromIndex(
+  index: TemplateIndex,
+  context: IssueContext
+): RegisteredTemplate | null {
+  const buckets = [
+    index.unconditioned,
+    index.byType.get(context.type),
+    context.signalSource !== null ? index.bySignalSource.get(context.signalSource) : undefined,
+    context.projectId !== null ? index.byProjectId.get(context.projectId) : undefined,
+    ...[...new Set(context.labels)].map((label) => index.byLabel.get(label)),
+  ];
+
+  const candidates = buckets
+    .flatMap((bucket) => bucket ?? [])
+    .sort((a, b) => a.position - b.position);
+
+  return (
+    selectTemplate(candidates, context) ??
+    selectTemplate(index.typeDefaults.get(context.type) ?? [], context)
+  );
+}
+
+/**
+ * Select the template the preview endpoint shows for a context. Like
+ * {@link selectFromIndex}, but when nothing matches it falls back to the first
+ * template whose `type` condition equals the issue type, even if its other
+ * conditions do not match.
+ */
+export function selectPreviewFromIndex(
+  index: TemplateIndex,
+  context: IssueContext
+): RegisteredTemplate | null {
+  return selectFromIndex(index, context) ?? index.typeConditioned.get(context.type)?.[0] ?? null;
+}
+
+async function loadIndex(db: AnyDb): Promise<TemplateIndex> {
+  const rows = await db
+    .select({
+      id: promptTemplates.id,
+      slug: promptTemplates.slug,
+      name: promptTemplates.name,
+      conditions: promptTemplates.conditions,
+      specificity: promptTemplates.specificity,
+      projectId: promptTemplates.projectId,
+      activeVersionId: promptTemplates.activeVersionId,
+    })
+    .from(promptTemplates)
+    .where(isNull(promptTemplates.deletedAt));
+
+  return buildTemplateIndex(
+    rows.map((t, position) => ({
+      ...t,
+      conditions: (t.conditions ?? {}) as TemplateConditions,
+      position,
+    }))
+  );
+}
+
+async function getIndex(db: AnyDb): Promise<TemplateIndex> {
+  const state = stateFor(db);
+  if (state.index && Date.now() - state.index.loadedAt < TEMPLATE_INDEX_TTL_MS) {
+    return state.index;
+  }
+  if (state.loading) return state.loading;
+
+  const generation = state.generation;
+  const loading = loadIndex(db).finally(() => {
+    if (state.loading === loading) state.loading = null;
+  });
+  state.loading = loading;
+
+  const index = await loading;
+  // Discard the result if an invalidation raced with the load
+  if (state.generation === generation) {
+    state.index = index;
+  }
+  return index;
+}
+
+// ─── Public API ──────────────────────────────────────────────────────────────
+
+/**
+ * Select the best matching template for an issue context using the cached index.
+ * Loads the index from the database on first use or after invalidation.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param context - Issue context built for template matching
+ */
+export async function resolveTemplate(
+  db: AnyDb,
+  context: IssueContext
+): Promise<RegisteredTemplate | null> {
+  return selectFromIndex(await getIndex(db), context);
+}
+
+/**
+ * Select the template to preview for an issue context using the cached index,
+ * with the preview's looser type-condition fallback.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param context - Issue context built for template matching
+ */
+export async function resolvePreviewTemplate(
+  db: AnyDb,
+  context: IssueContext
+): Promise<RegisteredTemplate | null> {
+  return selectPreviewFromIndex(await getIndex(db), context);
+}
+
+/**
+ * Resolve templates for many issue contexts with a single index lookup.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param contexts - Issue contexts built for template matching
+ * @returns One selection per context, in the same order
+ */
+export async function resolveTemplates(
+  db: AnyDb,
+  contexts: IssueContext[]
+): Promise<Array<RegisteredTemplate | null>> {
+  const index = await getIndex(db);
+  return contexts.map((context) => selectFromIndex(index, context));
+}
+
+/**
+ * Fetch version content by ID, serving from the LRU cache where possible.
+ * Version content is immutable, so cached entries never go stale; only the
+ * versions missing from the cache are queried, in a single statement.
+ *
+ * @param db - Driver-agnostic Drizzle database instance
+ * @param versionIds - Version IDs to fetch
+ */
+export async function getTemplateVersions(
+  db: AnyDb,
+  versionIds: string[]
+): Promise<Map<string, CachedVersion>> {
+  const { versions } = stateFor(db);
+  const result = new Map<string, CachedVersion>();
+  const missing: string[] = [];
+
+  for (const id of new Set(versionIds)) {
+    const cached = versions.get(id);
+    if (cached) result.set(id, cached);
+    else missing.push(id);
+  }
+
+  if (missing.length > 0) {
+    const rows = await db
+      .select({
+        id: promptVersions.id,
+        templateId: promptVersions.templateId,
+        version: promptVersions.version,
+        content: promptVersions.content,
+      })
+      .from(promptVersions)
+      .where(inArray(promptVersions.id, missing));
+
+    for (const row of rows) {
+      versions.set(row.id, row);
+      result.set(row.id, row);
+    }
+  }
+
+  return result;
+}
+
+/**
+ * Drop the cached template index so the next selection reloads it.
+ * Call after any write that changes templates or their active version.
+ */
+export function invalidateTemplates(db: AnyDb): void {
+  const state = registries.get(db);
+  if (!state) return;
+  state.index = null;
+  state.generation++;
+}
+
+/** Evict specific versions from the version cache. */
+export function invalidateTemplateVersions(db: AnyDb, versionIds: string[]): void {
+  const state = registries.get(db);
+  if (!state) return;
+  for (const id of versionIds) state.versions.delete(id);
+}
@@ -0,0 +1,155 @@
+import { createMiddleware } from 'hono/factory';
+import { HTTPException } from 'hono/http-exception';
+import { createHash } from 'node:crypto';
+import { MemoryIdempotencyStore } from '../lib/idempotency-store';
+import type { IdempotencyStore, StoredResponse } from '../lib/idempotency-store';
+import type { AppEnv } from '../types';
+
+/** Methods whose effects are deduplicated by `Idempotency-Key`. */
+const IDEMPOTENT_METHODS = new Set(['POST', 'PATCH', 'DELETE']);
+
+/** Longest accepted `Idempotency-Key` value. */
+export const MAX_IDEMPOTENCY_KEY_LENGTH = 255;
+
+/** Default time to wait for a request with the same key running on another instance. */
+export const IDEMPOTENCY_LOCK_WAIT_MS = 5_000;
+
+/** Interval between store reads while waiting on another instance. */
+const LOCK_POLL_INTERVAL_MS = 100;
+
+/** Response headers stored with a completed response and sent again on replay. */
+const REPLAYED_HEADERS = ['Content-Type', 'Location'];
+
+export interface IdempotencyOptions {
+  /** Where keys and responses are kept. Defaults to a {@link MemoryIdempotencyStore}. */
+  store?: IdempotencyStore;
+  /** How long to wait for an in-progress request on another instance before returning 409. */
+  lockWaitMs?: number;
+}
+
+/** A request currently running on this instance, shared with concurrent retries. */
+interface InFlight {
+  fingerprint: string;
+  result: Promise<StoredResponse | null>;
+}
+
+/**
+ * Honors the `Idempotency-Key` header on POST, PATCH and DELETE requests, so client
+ * retries (the SDK sends a key and retries on 429/500/503) never apply a mutation twice.
+ *
+ * - The first request with a key runs normally; its response is stored unless it is a
+ *   5xx, and later requests with the same key get that response replayed with an
+ *   `Idempotent-Replayed: true` header.
+ * - Concurrent requests with the same key on this instance wait for the first one and
+ *   share its result instead of racing it. On another instance they poll the store for
+ *   up to `lockWaitMs`, then receive 409.
+ * - Reusing a key with a different method, path or body is rejected with 422.
+ *
+ * Requests without the header pass through untouched.
+ */
+export function idempotency(options: IdempotencyOptions = {}) {
+  const store = options.store ?? new MemoryIdempotencyStore();
+  const lockWaitMs = options.lockWaitMs ?? IDEMPOTENCY_LOCK_WAIT_MS;
+  const inFlight = new Map<string, InFlight>();
+
+  return createMiddleware<AppEnv>(async (c, next) => {
+    const key = c.req.header('Idempotency-Key');
+    if (!key || !IDEMPOTENT_METHODS.has(c.req.method)) return next();
+    if (key.length > MAX_IDEMPOTENCY_KEY_LENGTH) {
+      throw new HTTPException(400, {
+        message: `Idempotency-Key must be at most ${MAX_IDEMPOTENCY_KEY_LENGTH} characters`,
+      });
+    }
+
+    const url = new URL(c.req.url);
+    const fingerprint = createHash('sha256')
+      .update(`${c.req.method} ${url.pathname}${url.search}\n`)
+      .update(await c.req.text())
+      .digest('hex');
+
+    let running = inFlight.get(key);
+    while (running) {
+      if (running.fingerprint !== fingerprint) throw keyReused();
+      const response = await running.result;
+      if (response) return replay(response);
+      // The original failed and released the key; the first waiter to resume runs next
+      running = inFlight.get(key);
+    }
+
+    // Register before the first await on the store so local retries coalesce here
+    let settle!: (response: StoredResponse | null) => void;
+    inFlight.set(key, { fingerprint, result: new Promise((resolve) => (settle = resolve)) });
+    let stored: StoredResponse | null = null;
+
+    try {
+      const existing = await store.reserve(key, fingerprint);
+      if (existing) {
+        if (existing.fingerprint !== fingerprint) throw keyReused();
+        stored = existing.response ?? (await waitForResponse(store, key, lockWaitMs));
+        if (!stored) {
+          throw new HTTPException(409, {
+            message: 'A request with this Idempotency-Key is already in progress',
+          });
+        }
+        return replay(stored);
+      }
+
+      try {
+        await next();
+      } catch (error) {
+        await store.release(key);
+        throw error;
+      }
+
+      if (c.res.status >= 500) {
+        await store.release(key);
+        return;
+      }
+
+      const headers: Record<string, string> = {};
+      for (const name of REPLAYED_HEADERS) {
+        const value = c.res.headers.get(name);
+        if (value !== null) headers[name] = value;
+      }
+      stored = { status: c.res.status, headers, body: await c.res.clone().text() };
+      await store.complete(key, stored);
+    } finally {
+      inFlight.delete(key);
+      settle(stored);
+    }
+  });
+}
+
+/** The 422 returned when a key is reused for a different request. */
+function keyReused(): HTTPException {
+  return new HTTPException(422, {
+    message: 'Idempotency-Key was already used with a different request',
+  });
+}
+
+/** Rebuild a stored response, marked as a replay. */
+function replay(response: StoredResponse): Response {
+  return new Response(response.body === '' ? null : response.body, {
+    status: response.status,
+    headers: { ...response.headers, 'Idempotent-Replayed': 'true' },
+  });
+}
+
+/**
+ * Poll the store until another instance finishes the request holding `key`.
+ * Resolves with `null` if it does not finish within `timeoutMs` or gives the key up.
+ */
+async function waitForResponse(
+  store: IdempotencyStore,
+  key: string,
+  timeoutMs: number
+): Promise<StoredResponse | null> {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, LOCK_POLL_INTERVAL_MS));
+    const record = await store.get(key);
+    if (!record) return null;
+    if (record.response) return record.response;
+  }
+  return null;
+}
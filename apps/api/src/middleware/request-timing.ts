@@ -0,0 +1,62 @@
+import { createMiddleware } from 'hono/factory';
+import type { Context } from 'hono';
+import { trackQueries } from '../lib/query-metrics';
+import type { QueryStats } from '../lib/query-metrics';
+import type { RequestMetrics } from '../lib/request-metrics';
+import type { AppEnv } from '../types';
+
+export interface RequestTimingOptions {
+  /**
+   * Registry that every request is recorded in, keyed by route pattern. When set, it is
+   * also exposed to handlers as `c.get('requestMetrics')` for `/api/dashboard/metrics`.
+   */
+  metrics?: RequestMetrics;
+}
+
+/**
+ * Reports what each request cost in a `Server-Timing` header:
+ *
+ * - `db` — time spent in database queries, with the query count as its description
+ * - `app` — the rest of the time spent in middleware and handlers
+ * - `total` — wall time from this middleware to the response
+ *
+ * Queries are attributed through the Drizzle logger and driver wrapper in
+ * `lib/query-metrics.ts`, so the database must be created with both.
+ */
+export function requestTiming(options: RequestTimingOptions = {}) {
+  return createMiddleware<AppEnv>(async (c, next) => {
+    if (options.metrics) c.set('requestMetrics', options.metrics);
+
+    const stats: QueryStats = { count: 0, durationMs: 0 };
+    const start = performance.now();
+    await trackQueries(stats, next);
+    const totalMs = performance.now() - start;
+
+    c.header(
+      'Server-Timing',
+      [
+        `db;dur=${stats.durationMs.toFixed(1)};desc="${stats.count} queries"`,
+        `app;dur=${Math.max(totalMs - stats.durationMs, 0).toFixed(1)}`,
+        `total;dur=${totalMs.toFixed(1)}`,
+      ].join(', '),
+      { append: true }
+    );
+
+    options.metrics?.record(routeKey(c), {
+      status: c.res.status,
+      durationMs: totalMs,
+      dbMs: stats.durationMs,
+      queries: stats.count,
+    });
+  });
+}
+
+/**
+ * Method and pattern of the route that handled the request, e.g. `GET /api/issues/:id`.
+ * Requests no handler matched share one key, so unknown URLs cannot grow the registry.
+ */
+function routeKey(c: Context<AppEnv>): string {
+  const handlers = c.req.matchedRoutes.filter((route) => route.method !== 'ALL');
+  const handler = handlers[handlers.length - 1];
+  return handler ? `${c.req.method} ${handler.path}` : `${c.req.method} (unmatched)`;
+}
@@ -0,0 +1,62 @@
+import { createMiddleware } from 'hono/factory';
+import { LruCache } from '../lib/lru-cache';
+import type { AnyDb, AppEnv } from '../types';
+
+/** A successful response body held for replay. */
+interface CachedResponse {
+  body: string;
+  contentType: string;
+  storedAt: number;
+}
+
+export interface ResponseCacheOptions {
+  /** How long a stored response is served without re-running the handler. */
+  ttlMs: number;
+  /** Maximum number of distinct URLs cached per database. Defaults to 100. */
+  maxEntries?: number;
+}
+
+/**
+ * Short-TTL cache for read-only GET endpoints that are polled by many clients.
+ * Successful JSON responses are stored per database instance and request URL, and
+ * replayed until `ttlMs` elapses, so concurrent pollers share one set of queries.
+ * Requests sent with `Cache-Control: no-cache` bypass the stored copy.
+ *
+ * Pair with Hono's `etag()` middleware (mounted before this one) so unchanged
+ * bodies are answered with 304 Not Modified.
+ */
+export function responseCache(options: ResponseCacheOptions) {
+  const caches = new WeakMap<AnyDb, LruCache<string, CachedResponse>>();
+
+  return createMiddleware<AppEnv>(async (c, next) => {
+    if (c.req.method !== 'GET') return next();
+
+    const db = c.get('db');
+    let cache = caches.get(db);
+    if (!cache) {
+      cache = new LruCache(options.maxEntries ?? 100);
+      caches.set(db, cache);
+    }
+
+    const key = c.req.url;
+    const bypass = c.req.header('Cache-Control')?.includes('no-cache') ?? false;
+    const cached = bypass ? undefined : cache.get(key);
+
+    // Clients must revalidate so they pick up the ETag rather than a heuristic expiry
+    c.header('Cache-Control', 'no-cache');
+
+    if (cached && Date.now() - cached.storedAt < options.ttlMs) {
+      return c.body(cached.body, 200, { 'Content-Type': cached.contentType });
+    }
+
+    await next();
+
+    if (c.res.status === 200) {
+      cache.set(key, {
+        body: await c.res.clone().text(),
+        contentType: c.res.headers.get('Content-Type') ?? 'application/json',
+        storedAt: Date.now(),
+      });
+    }
+  });
+}
@@ -1,13 +1,23 @@
 import { Hono } from 'hono';
-import { desc, eq, sql, and, isNull, gte } from 'drizzle-orm';
-import { issues, issueRelations } from '../db/schema/issues';
+import { etag } from 'hono/etag';
+import { HTTPException } from 'hono/http-exception';
+import { eq, sql, and, isNull, gte } from 'drizzle-orm';
+import { issues } from '../db/schema/issues';
 import { goals } from '../db/schema/projects';
-import { promptTemplates, promptVersions, promptReviews } from '../db/schema/prompts';
+import { loadActivityChains, loadPromptHealth } from '../lib/dashboard-loaders';
+import { responseCache } from '../middleware/response-cache';
 import type { AppEnv } from '../types';
 
+/** How long dashboard responses are shared between pollers before being recomputed. */
+export const DASHBOARD_CACHE_TTL_MS = 5_000;
+
 /** Dashboard routes — aggregated system health metrics. */
 export const dashboardRoutes = new Hono<AppEnv>();
 
+// Dashboard views poll these endpoints; serve repeats from a short-lived cache and let
+// clients revalidate with If-None-Match so unchanged payloads come back as 304s.
+dashboardRoutes.use('*', etag(), responseCache({ ttlMs: DASHBOARD_CACHE_TTL_MS }));
+
 /** GET /stats — System health metrics with issue, goal, and dispatch counts. */
 dashboardRoutes.get('/stats', async (c) => {
   const db = c.get('db');
@@ -93,51 +103,7 @@ dashboardRoutes.get('/activity', async (c) => {
   const db = c.get('db');
   const limit = Number(c.req.query('limit') ?? '20');
 
-  // 1. Query root issues (parentId IS NULL) ordered by updatedAt DESC
-  const rootIssues = await db
-    .select()
-    .from(issues)
-    .where(and(isNull(issues.deletedAt), isNull(issues.parentId)))
-    .orderBy(desc(issues.updatedAt))
-    .limit(limit);
-
-  // 2. For each root, query children with their relations
-  const chains = await Promise.all(
-    rootIssues.map(async (root) => {
-      const children = await db
-        .select()
-        .from(issues)
-        .where(and(isNull(issues.deletedAt), eq(issues.parentId, root.id)))
-        .orderBy(issues.createdAt);
-
-      const childrenWithRelations = await Promise.all(
-        children.map(async (child) => {
-          const relations = await db
-            .select()
-            .from(issueRelations)
-            .where(eq(issueRelations.issueId, child.id));
-          return { issue: child, relations };
-        })
-      );
-
-      // Latest activity is the most recent updatedAt across root + children
-      const allTimestamps = [root.updatedAt, ...children.map((ch) => ch.updatedAt)];
-      const latestActivity = allTimestamps
-        .map((t) => new Date(t).getTime())
-        .reduce((max, t) => Math.max(max, t), 0);
-
-      return {
-        root,
-        children: childrenWithRelations,
-        latestActivity: new Date(latestActivity).toISOString(),
-      };
-    })
-  );
-
-  // 3. Sort chains by latestActivity descending
-  chains.sort(
-    (a, b) => new Date(b.latestActivity).getTime() - new Date(a.latestActivity).getTime()
-  );
+  const chains = await loadActivityChains(db, limit);
 
   return c.json({
     data: chains,
@@ -147,70 +113,19 @@ dashboardRoutes.get('/activity', async (c) => {
 
 /** GET /prompts — Prompt template health data with version history and review scores. */
 dashboardRoutes.get('/prompts', async (c) => {
-  const db = c.get('db');
-
-  // Get all non-deleted templates
-  const templates = await db
-    .select()
-    .from(promptTemplates)
-    .where(isNull(promptTemplates.deletedAt));
-
-  const data = await Promise.all(
-    templates.map(async (template) => {
-      // Get recent versions (last 5) ordered by version descending
-      const versions = await db
-        .select()
-        .from(promptVersions)
-        .where(eq(promptVersions.templateId, template.id))
-        .orderBy(desc(promptVersions.version))
-        .limit(5);
-
-      // Find active version from the fetched versions
-      const activeVersion = versions.find((v) => v.status === 'active') ?? null;
-
-      // Get review aggregates for all versions of this template
-      const reviewAgg = await db
-        .select({
-          totalReviews: sql<number>`count(*)::int`,
-          avgClarity: sql<number>`avg(${promptReviews.clarity})`,
-          avgCompleteness: sql<number>`avg(${promptReviews.completeness})`,
-          avgRelevance: sql<number>`avg(${promptReviews.relevance})`,
-        })
-        .from(promptReviews)
-        .innerJoin(promptVersions, eq(promptReviews.versionId, promptVersions.id))
-        .where(eq(promptVersions.templateId, template.id));
-
-      const summary = reviewAgg[0] ?? {
-        totalReviews: 0,
-        avgClarity: null,
-        avgCompleteness: null,
-        avgRelevance: null,
-      };
-
-      // Use EWMA score from the active version (stored as reviewScore in schema)
-      const compositeScore = activeVersion?.reviewScore ?? null;
-      const completionRate = activeVersion?.completionRate ?? null;
-
-      // Flag templates needing attention: low score or low completion rate
-      const needsAttention =
-        (compositeScore !== null && compositeScore < 3.0) ||
-        (completionRate !== null && completionRate < 0.5);
-
-      return {
-        template,
-        activeVersion,
-        recentVersions: versions,
-        reviewSummary: {
-          totalReviews: summary.totalReviews,
-          avgClarity: summary.avgClarity,
-          avgCompleteness: summary.avgCompleteness,
-          avgRelevance: summary.avgRelevance,
-          compositeScore,
-        },
-        needsAttention,
-      };
-    })
-  );
-
+  const data = await loadPromptHealth(c.get('db'));
   return c.json({ data });
 });
+
+/**
+ * GET /metrics — Per-route latency histograms, query counts and DB time recorded since
+ * startup. Only available when the API runs with `REQUEST_METRICS=true`. Cached like the
+ * other dashboard endpoints, so a snapshot may be up to `DASHBOARD_CACHE_TTL_MS` old.
+ */
+dashboardRoutes.get('/metrics', (c) => {
+  const metrics = c.get('requestMetrics');
+  if (!metrics) {
+    throw new HTTPException(404, { message: 'Request metrics are not enabled' });
+  }
+  return c.json({ data: metrics.snapshot() });
+});
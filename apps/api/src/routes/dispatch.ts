@@ -1,25 +1,41 @@
 import { Hono } from 'hono';
 import { z } from 'zod';
 import { zValidator } from '@hono/zod-validator';
-import { eq, and, isNull, count, notInArray, sql } from 'drizzle-orm';
-import { issues, issueRelations, labels, issueLabels, goals } from '../db/schema';
-import { promptTemplates, promptVersions } from '../db/schema';
+import { eq, and, isNull, count, desc, inArray, sql } from 'drizzle-orm';
+import { issues, labels, issueLabels, goals } from '../db/schema';
+import { promptVersions } from '../db/schema';
 import { scoreIssue } from '../lib/priority-scoring';
 import type { ScoringInput } from '../lib/priority-scoring';
-import { selectTemplate, buildHydrationContext, hydrateTemplate } from '../lib/prompt-engine';
-import type { IssueContext, TemplateCandidate } from '../lib/prompt-engine';
-import type { AppEnv } from '../types';
+import { buildHydrationContexts, hydrateTemplate } from '../lib/prompt-engine';
+import type { IssueContext } from '../lib/prompt-engine';
+import { resolveTemplates, getTemplateVersions } from '../lib/template-registry';
+import { eventBus, EventSubscription, toIssueEventData } from '../lib/event-bus';
+import { includeTotalParam } from '../lib/pagination';
+import type { LoopEventType } from '../lib/event-bus';
+import type { AnyDb, AppEnv } from '../types';
+
+/** Upper bound on issues claimed by a single batch `/next?count=N` request. */
+export const MAX_BATCH_CLAIM = 50;
+
+/** Longest an agent may block on `/next?wait=N`, in seconds. */
+export const MAX_DISPATCH_WAIT_SECONDS = 30;
+
+/** Events that can make new work claimable and so wake a waiting `/next`. */
+const WORK_EVENT_TYPES: readonly LoopEventType[] = ['issue.created', 'issue.updated'];
 
 // ─── Validation schemas ──────────────────────────────────────────────────────
 
 const nextQuerySchema = z.object({
   projectId: z.string().optional(),
+  count: z.coerce.number().int().min(1).max(MAX_BATCH_CLAIM).optional(),
+  wait: z.coerce.number().int().min(0).max(MAX_DISPATCH_WAIT_SECONDS).default(0),
 });
 
 const queueQuerySchema = z.object({
   projectId: z.string().optional(),
   limit: z.coerce.number().int().min(1).max(200).default(50),
   offset: z.coerce.number().int().min(0).default(0),
+  includeTotal: includeTotalParam,
 });
 
 // ─── Route handler ───────────────────────────────────────────────────────────
@@ -30,154 +46,60 @@ export const dispatchRoutes = new Hono<AppEnv>();
 /**
  * GET /next — Atomically claim the highest-priority unblocked todo issue.
  * Uses FOR UPDATE SKIP LOCKED to prevent concurrent agents from claiming the same issue.
+ *
+ * With `count`, claims up to N issues in a single statement and returns `{ data: [...] }`
+ * in priority order. Context, template and version lookups are set-based, so the number
+ * of queries per batch does not grow with N.
+ *
+ * With `wait=N` (seconds), an empty queue does not return 204 straight away: the request
+ * blocks until an issue event makes work claimable or N seconds pass, replacing tight
+ * polling loops in idle agents.
  */
 dispatchRoutes.get('/next', zValidator('query', nextQuerySchema), async (c) => {
   const db = c.get('db');
-  const { projectId } = c.req.valid('query');
+  const { projectId, count: batchSize, wait } = c.req.valid('query');
+  const limit = batchSize ?? 1;
 
-  const projectFilter = projectId ? sql`AND i.project_id = ${projectId}` : sql``;
+  const claimedIssues =
+    wait > 0
+      ? await claimWhenAvailable(db, projectId, limit, wait * 1000, c.req.raw.signal)
+      : await claimIssues(db, projectId, limit);
 
-  // Atomic claim: find highest-priority unblocked todo issue and set to in_progress
-  const claimQuery = sql`
-    WITH unblocked AS (
-      SELECT i.id
-      FROM issues i
-      WHERE i.status = 'todo'
-        AND i.deleted_at IS NULL
-        AND NOT EXISTS (
-          SELECT 1 FROM issue_relations ir
-          JOIN issues blocker ON blocker.id = ir.related_issue_id
-          WHERE ir.issue_id = i.id
-            AND ir.type = 'blocked_by'
-            AND blocker.status NOT IN ('done', 'canceled')
-            AND blocker.deleted_at IS NULL
-        )
-        ${projectFilter}
-      ORDER BY
-        (CASE i.priority
-          WHEN 1 THEN 100 WHEN 2 THEN 75 WHEN 3 THEN 50
-          WHEN 4 THEN 25 ELSE 10 END)
-        + (CASE WHEN EXISTS (
-            SELECT 1 FROM projects p
-            JOIN goals g ON g.project_id = p.id
-            WHERE p.id = i.project_id AND g.status = 'active'
-          ) THEN 20 ELSE 0 END)
-        + (EXTRACT(EPOCH FROM (NOW() - i.created_at)) / 86400)::int
-        + (CASE i.type
-            WHEN 'signal' THEN 50 WHEN 'hypothesis' THEN 40
-            WHEN 'plan' THEN 30 WHEN 'task' THEN 20
-            WHEN 'monitor' THEN 10 ELSE 0 END)
-        DESC
-      LIMIT 1
-      FOR UPDATE SKIP LOCKED
-    )
-    UPDATE issues SET status = 'in_progress', updated_at = NOW()
-    FROM unblocked
-    WHERE issues.id = unblocked.id
-    RETURNING issues.*
-  `;
-
-  const claimed = (await db.execute(claimQuery)) as { rows: Record<string, unknown>[] };
-  const rows = claimed.rows;
-
-  if (rows.length === 0) {
+  if (claimedIssues.length === 0) {
     return c.body(null, 204);
   }
 
-  const raw = rows[0];
-
-  // Map snake_case DB columns to the issue shape expected by prompt engine
-  const claimedIssue = mapRowToIssue(raw);
-
-  // Build IssueContext for template selection
-  const issueContext = await buildIssueContext(db, claimedIssue);
-
-  // Fetch all active templates and select the best match
-  const allTemplates = await db
-    .select({
-      id: promptTemplates.id,
-      slug: promptTemplates.slug,
-      conditions: promptTemplates.conditions,
-      specificity: promptTemplates.specificity,
-      projectId: promptTemplates.projectId,
-      activeVersionId: promptTemplates.activeVersionId,
-    })
-    .from(promptTemplates)
-    .where(isNull(promptTemplates.deletedAt));
-
-  const candidates: TemplateCandidate[] = allTemplates.map((t) => ({
-    ...t,
-    conditions: (t.conditions ?? {}) as TemplateCandidate['conditions'],
-  }));
-
-  let selected = selectTemplate(candidates, issueContext);
-
-  // Fallback: find a default template for this issue type
-  if (!selected) {
-    selected = findDefaultTemplate(candidates, claimedIssue.type, issueContext);
+  for (const issue of claimedIssues) {
+    eventBus.publish('issue.claimed', toIssueEventData(issue as typeof issues.$inferSelect));
   }
 
-  if (!selected || !selected.activeVersionId) {
-    // No template available — return the issue without a prompt
-    return c.json({
-      issue: summarizeIssue(claimedIssue),
-      prompt: null,
-      meta: null,
-    });
-  }
+  const results = await dispatchClaimed(db, claimedIssues);
 
-  // Fetch the active version content
-  const [version] = await db
-    .select()
-    .from(promptVersions)
-    .where(eq(promptVersions.id, selected.activeVersionId));
-
-  if (!version) {
-    return c.json({
-      issue: summarizeIssue(claimedIssue),
-      prompt: null,
-      meta: null,
-    });
+  if (batchSize === undefined) {
+    return c.json(results[0]);
   }
 
-  // Build hydration context and render the prompt
-  const hydrationCtx = await buildHydrationContext(
-    db,
-    claimedIssue as typeof issues.$inferSelect,
-    { id: selected.id, slug: selected.slug },
-    { id: version.id, version: version.version }
-  );
-
-  const prompt = hydrateTemplate(version.id, version.content, hydrationCtx);
-
-  // Increment usage count on the version
-  await db
-    .update(promptVersions)
-    .set({ usageCount: sql`${promptVersions.usageCount} + 1` })
-    .where(eq(promptVersions.id, version.id));
-
-  return c.json({
-    issue: summarizeIssue(claimedIssue),
-    prompt,
-    meta: {
-      templateSlug: selected.slug,
-      templateId: selected.id,
-      versionId: version.id,
-      versionNumber: version.version,
-      reviewUrl: 'POST /api/prompt-reviews',
-    },
-  });
+  return c.json({ data: results });
 });
 
 /**
  * GET /queue — Preview the priority-ordered queue of unblocked todo issues.
  * Does not claim or modify any issues.
+ *
+ * Ordering and pagination happen in SQL on the materialized `dispatch_rank`, served by
+ * the partial dispatch-queue index, so every page is a slice of the global order.
+ * Pollers that only need the head of the queue can pass `includeTotal=false` to skip the
+ * count over every dispatchable issue.
  */
 dispatchRoutes.get('/queue', zValidator('query', queueQuerySchema), async (c) => {
   const db = c.get('db');
-  const { projectId, limit, offset } = c.req.valid('query');
+  const { projectId, limit, offset, includeTotal } = c.req.valid('query');
 
-  const conditions = [eq(issues.status, 'todo'), isNull(issues.deletedAt)];
+  const conditions = [
+    eq(issues.status, 'todo'),
+    isNull(issues.deletedAt),
+    eq(issues.isBlocked, false),
+  ];
 
   if (projectId) {
     conditions.push(eq(issues.projectId, projectId));
@@ -185,62 +107,220 @@ dispatchRoutes.get('/queue', zValidator('query', queueQuerySchema), async (c) =>
 
   const whereClause = and(...conditions);
 
-  // Fetch unblocked todo issues: exclude those with unresolved blocked_by relations
-  const blockedIssueIds = db
-    .select({ issueId: issueRelations.issueId })
-    .from(issueRelations)
-    .innerJoin(issues, eq(issueRelations.relatedIssueId, issues.id))
-    .where(
-      and(
-        eq(issueRelations.type, 'blocked_by'),
-        notInArray(issues.status, ['done', 'canceled']),
-        isNull(issues.deletedAt)
-      )
-    );
-
-  const unblockedCondition = and(whereClause, sql`${issues.id} NOT IN (${blockedIssueIds})`);
-
-  // Fetch all goal-aligned project IDs for scoring
-  const activeGoalProjects = await db
-    .select({ projectId: goals.projectId })
-    .from(goals)
-    .where(eq(goals.status, 'active'));
+  const [data, total, activeGoalProjects] = await Promise.all([
+    db
+      .select()
+      .from(issues)
+      .where(whereClause)
+      .orderBy(desc(issues.dispatchRank))
+      .limit(limit)
+      .offset(offset),
+    includeTotal
+      ? db
+          .select({ count: count() })
+          .from(issues)
+          .where(whereClause)
+          .then(([result]) => result.count)
+      : undefined,
+    // Goal-aligned project IDs for the score breakdown
+    db
+      .select({ projectId: goals.projectId })
+      .from(goals)
+      .where(and(eq(goals.status, 'active'), isNull(goals.deletedAt))),
+  ]);
 
   const activeGoalProjectIds = new Set(activeGoalProjects.map((g) => g.projectId).filter(Boolean));
 
-  const [data, totalResult] = await Promise.all([
-    db.select().from(issues).where(unblockedCondition).limit(limit).offset(offset),
-    db.select({ count: count() }).from(issues).where(unblockedCondition),
-  ]);
+  // Rows are already in dispatch order; scoring only produces the breakdown
+  const scored = data.map((issue) => {
+    const input: ScoringInput = {
+      priority: issue.priority,
+      type: issue.type,
+      createdAt: issue.createdAt,
+      hasActiveGoal: issue.projectId !== null && activeGoalProjectIds.has(issue.projectId),
+    };
+    const breakdown = scoreIssue(input);
+    return {
+      issue,
+      score: breakdown.total,
+      breakdown: {
+        priorityWeight: breakdown.priorityWeight,
+        goalBonus: breakdown.goalAlignmentBonus,
+        ageBonus: breakdown.ageBonus,
+        typeBonus: breakdown.typeBonus,
+      },
+    };
+  });
 
-  // Score each issue and sort by score descending
-  const scored = data
-    .map((issue) => {
-      const input: ScoringInput = {
-        priority: issue.priority,
-        type: issue.type,
-        createdAt: issue.createdAt,
-        hasActiveGoal: issue.projectId !== null && activeGoalProjectIds.has(issue.projectId),
-      };
-      const breakdown = scoreIssue(input);
-      return {
-        issue,
-        score: breakdown.total,
-        breakdown: {
-          priorityWeight: breakdown.priorityWeight,
-          goalBonus: breakdown.goalAlignmentBonus,
-          ageBonus: breakdown.ageBonus,
-          typeBonus: breakdown.typeBonus,
-        },
-      };
-    })
-    .sort((a, b) => b.score - a.score);
-
-  return c.json({ data: scored, total: totalResult[0].count });
+  return c.json({ data: scored, ...(total === undefined ? {} : { total }) });
 });
 
 // ─── Helpers ─────────────────────────────────────────────────────────────────
 
+type ClaimedIssue = ReturnType<typeof mapRowToIssue>;
+
+/** A single dispatch result: claimed issue summary, hydrated prompt and template meta. */
+interface DispatchResult {
+  issue: ReturnType<typeof summarizeIssue>;
+  prompt: string | null;
+  meta: {
+    templateSlug: string;
+    templateId: string;
+    versionId: string;
+    versionNumber: number;
+    reviewUrl: string;
+  } | null;
+}
+
+/**
+ * Atomically claim up to `limit` unblocked todo issues in one statement.
+ * Returns the claimed issues ordered by dispatch score, highest first.
+ *
+ * Candidates are read from the partial dispatch-queue index in `dispatch_rank` order;
+ * the rank and `is_blocked` flag are kept current by database triggers, so no scoring
+ * or relation scan happens at claim time.
+ */
+async function claimIssues(
+  db: AnyDb,
+  projectId: string | undefined,
+  limit: number
+): Promise<ClaimedIssue[]> {
+  const projectFilter = projectId ? sql`AND i.project_id = ${projectId}` : sql``;
+
+  // Atomic claim: find highest-priority unblocked todo issues and set to in_progress
+  const claimQuery = sql`
+    WITH candidates AS (
+      SELECT i.id
+      FROM issues i
+      WHERE i.status = 'todo'
+        AND i.deleted_at IS NULL
+        AND i.is_blocked = false
+        ${projectFilter}
+      ORDER BY i.dispatch_rank DESC
+      LIMIT ${limit}
+      FOR UPDATE OF i SKIP LOCKED
+    )
+    UPDATE issues SET status = 'in_progress', updated_at = NOW()
+    FROM candidates
+    WHERE issues.id = candidates.id
+    RETURNING issues.*
+  `;
+
+  const claimed = (await db.execute(claimQuery)) as { rows: Record<string, unknown>[] };
+
+  // UPDATE ... RETURNING does not preserve the CTE ordering, so restore it here.
+  return claimed.rows.map(mapRowToIssue).sort((a, b) => b.dispatchRank - a.dispatchRank);
+}
+
+/**
+ * Claim like {@link claimIssues}, but when nothing is claimable wait for issue events and
+ * retry until something is claimed, `waitMs` elapses or the client disconnects. The
+ * subscription opens before the first attempt so a change landing in between still
+ * triggers a retry.
+ */
+async function claimWhenAvailable(
+  db: AnyDb,
+  projectId: string | undefined,
+  limit: number,
+  waitMs: number,
+  signal: AbortSignal
+): Promise<ClaimedIssue[]> {
+  const deadline = Date.now() + waitMs;
+  const changes = new EventSubscription(eventBus, WORK_EVENT_TYPES);
+  const onAbort = () => changes.close();
+  signal.addEventListener('abort', onAbort);
+
+  try {
+    for (;;) {
+      const claimed = await claimIssues(db, projectId, limit);
+      if (claimed.length > 0) return claimed;
+
+      const remaining = deadline - Date.now();
+      if (remaining <= 0 || signal.aborted) return [];
+      if (!(await changes.take(remaining))) return [];
+    }
+  } finally {
+    signal.removeEventListener('abort', onAbort);
+    changes.close();
+  }
+}
+
+/**
+ * Select templates, render prompts and record usage for a set of claimed issues.
+ * Every step is set-based: templates and version content come from the in-process
+ * registry, then one hydration fan-out and one grouped usage-count UPDATE run
+ * regardless of batch size.
+ */
+async function dispatchClaimed(
+  db: AnyDb,
+  claimedIssues: ClaimedIssue[]
+): Promise<DispatchResult[]> {
+  // Select the best template per issue from the cached registry index
+  const issueContexts = await buildIssueContexts(db, claimedIssues);
+  const selections = await resolveTemplates(db, issueContexts);
+
+  // Fetch the active version content for every selected template (cached by version ID)
+  const versionById = await getTemplateVersions(
+    db,
+    selections.flatMap((s) => (s?.activeVersionId ? [s.activeVersionId] : []))
+  );
+
+  const targets = claimedIssues.flatMap((issue, i) => {
+    const selected = selections[i];
+    const version = selected ? versionById.get(selected.activeVersionId!) : undefined;
+    if (!selected || !version) return [];
+    return [
+      {
+        index: i,
+        issue: issue as typeof issues.$inferSelect,
+        template: { id: selected.id, slug: selected.slug },
+        version: { id: version.id, version: version.version, content: version.content },
+      },
+    ];
+  });
+
+  // Build hydration contexts for all renderable issues with set-based queries
+  const hydrationCtxs = await buildHydrationContexts(db, targets);
+
+  const results: DispatchResult[] = claimedIssues.map((issue) => ({
+    issue: summarizeIssue(issue),
+    prompt: null,
+    meta: null,
+  }));
+
+  const usageByVersion = new Map<string, number>();
+  targets.forEach((target, i) => {
+    results[target.index] = {
+      issue: summarizeIssue(claimedIssues[target.index]),
+      prompt: hydrateTemplate(target.version.id, target.version.content, hydrationCtxs[i]),
+      meta: {
+        templateSlug: target.template.slug,
+        templateId: target.template.id,
+        versionId: target.version.id,
+        versionNumber: target.version.version,
+        reviewUrl: 'POST /api/prompt-reviews',
+      },
+    };
+    usageByVersion.set(target.version.id, (usageByVersion.get(target.version.id) ?? 0) + 1);
+  });
+
+  // Increment usage counts for every rendered version in one grouped UPDATE
+  if (usageByVersion.size > 0) {
+    const increments = sql.join(
+      [...usageByVersion].map(([versionId, uses]) => sql`WHEN ${versionId} THEN ${uses}::int`),
+      sql` `
+    );
+    await db
+      .update(promptVersions)
+      .set({
+        usageCount: sql`${promptVersions.usageCount} + (CASE ${promptVersions.id} ${increments} ELSE 0 END)`,
+      })
+      .where(inArray(promptVersions.id, [...usageByVersion.keys()]));
+  }
+
+  return results;
+}
+
 /** Map a raw SQL row (snake_case) to the issue shape used by the prompt engine. */
 function mapRowToIssue(raw: Record<string, unknown>) {
   return {
@@ -261,6 +341,9 @@ function mapRowToIssue(raw: Record<string, unknown>) {
     commits: raw.commits as unknown[] | null,
     pullRequests: raw.pull_requests as unknown[] | null,
     completedAt: raw.completed_at ? new Date(raw.completed_at as string) : null,
+    dispatchScoreBase: raw.dispatch_score_base as number,
+    dispatchRank: Number(raw.dispatch_rank),
+    isBlocked: raw.is_blocked as boolean,
     createdAt: new Date(raw.created_at as string),
     updatedAt: new Date(raw.updated_at as string),
     deletedAt: raw.deleted_at ? new Date(raw.deleted_at as string) : null,
@@ -268,7 +351,7 @@ function mapRowToIssue(raw: Record<string, unknown>) {
 }
 
 /** Extract summary fields for the response payload. */
-function summarizeIssue(issue: ReturnType<typeof mapRowToIssue>) {
+function summarizeIssue(issue: ClaimedIssue) {
   return {
     id: issue.id,
     number: issue.number,
@@ -279,25 +362,30 @@ function summarizeIssue(issue: ReturnType<typeof mapRowToIssue>) {
   };
 }
 
-/** Build IssueContext from a claimed issue for template matching. */
-async function buildIssueContext(
-  db: import('../types').AnyDb,
-  issue: ReturnType<typeof mapRowToIssue>
-): Promise<IssueContext> {
-  const [labelRows, hasFailedSessionRows] = await Promise.all([
+/**
+ * Build IssueContexts for a set of claimed issues for template matching.
+ * Labels and failed sibling sessions are fetched for all issues in two queries.
+ */
+async function buildIssueContexts(db: AnyDb, claimed: ClaimedIssue[]): Promise<IssueContext[]> {
+  const issueIds = claimed.map((issue) => issue.id);
+  const parentIds = [
+    ...new Set(claimed.flatMap((issue) => (issue.parentId ? [issue.parentId] : []))),
+  ];
+
+  const [labelRows, failedSessionRows] = await Promise.all([
     db
-      .select({ name: labels.name })
+      .select({ issueId: issueLabels.issueId, name: labels.name })
       .from(issueLabels)
       .innerJoin(labels, eq(issueLabels.labelId, labels.id))
-      .where(eq(issueLabels.issueId, issue.id)),
+      .where(inArray(issueLabels.issueId, issueIds)),
     // Check if any sibling issues (same parent) have failed agent sessions
-    issue.parentId
+    parentIds.length > 0
       ? db
-          .select({ id: issues.id })
+          .selectDistinct({ parentId: issues.parentId })
           .from(issues)
           .where(
             and(
-              eq(issues.parentId, issue.parentId),
+              inArray(issues.parentId, parentIds),
               eq(issues.status, 'canceled'),
               isNull(issues.deletedAt),
               sql`${issues.agentSummary} IS NOT NULL`
@@ -306,32 +394,17 @@ async function buildIssueContext(
       : Promise.resolve([]),
   ]);
 
-  const hypothesisData = issue.hypothesis as { confidence?: number } | null;
-
-  return {
-    type: issue.type,
-    signalSource: issue.signalSource,
-    labels: labelRows.map((l) => l.name),
-    projectId: issue.projectId,
-    hasFailedSessions: hasFailedSessionRows.length > 0,
-    hypothesisConfidence: hypothesisData?.confidence ?? null,
-  };
-}
-
-/**
- * Fallback: find a template whose conditions match only on issue type.
- * Re-runs selectTemplate with a subset filtered to type-matching conditions.
- */
-function findDefaultTemplate(
-  candidates: TemplateCandidate[],
-  issueType: string,
-  context: IssueContext
-): TemplateCandidate | null {
-  const typeDefaults = candidates.filter(
-    (t) =>
-      t.activeVersionId !== null &&
-      t.conditions.type === issueType &&
-      Object.keys(t.conditions).length === 1
-  );
-  return selectTemplate(typeDefaults, context);
+  const parentsWithFailures = new Set(failedSessionRows.map((r) => r.parentId));
+
+  return claimed.map((issue) => {
+    const hypothesisData = issue.hypothesis as { confidence?: number } | null;
+    return {
+      type: issue.type,
+      signalSource: issue.signalSource,
+      labels: labelRows.filter((l) => l.issueId === issue.id).map((l) => l.name),
+      projectId: issue.projectId,
+      hasFailedSessions: issue.parentId !== null && parentsWithFailures.has(issue.parentId),
+      hypothesisConfidence: hypothesisData?.confidence ?? null,
+    };
+  });
 }
@@ -0,0 +1,71 @@
+import { Hono } from 'hono';
+import { streamSSE } from 'hono/streaming';
+import { z } from 'zod';
+import { zValidator } from '@hono/zod-validator';
+import { eventBus, EventSubscription, loopEventTypeValues } from '../lib/event-bus';
+import type { LoopEvent } from '../lib/event-bus';
+import type { AppEnv } from '../types';
+
+/** Interval between keep-alive comments on an idle stream. */
+export const EVENT_HEARTBEAT_MS = 15_000;
+
+/** Reconnect delay suggested to EventSource clients. */
+const EVENT_RETRY_MS = 3_000;
+
+// ─── Validation schema ──────────────────────────────────────────────────────
+
+const eventsQuerySchema = z.object({
+  /** Comma-separated event types to receive; all types when omitted. */
+  types: z
+    .string()
+    .optional()
+    .transform((value) => (value ? value.split(',').map((t) => t.trim()) : []))
+    .pipe(z.array(z.enum(loopEventTypeValues))),
+});
+
+// ─── Route handler ──────────────────────────────────────────────────────────
+
+/** Event stream routes — mounted at `/events` under the authenticated API group. */
+export const eventRoutes = new Hono<AppEnv>();
+
+/**
+ * GET / — Server-sent event stream of issue, dispatch, signal and template changes.
+ *
+ * Each message uses the event type as the SSE `event` name and the event ID as its `id`;
+ * `data` is the JSON-encoded event. Clients that reconnect with `Last-Event-ID` receive
+ * the events they missed while they are still in the recent-history window. Idle
+ * streams get a comment line every {@link EVENT_HEARTBEAT_MS} to keep proxies open.
+ */
+eventRoutes.get('/', zValidator('query', eventsQuerySchema), (c) => {
+  const { types } = c.req.valid('query');
+  const lastEventId = c.req.header('Last-Event-ID');
+
+  return streamSSE(c, async (stream) => {
+    // Subscribe before replaying so nothing published in between is lost
+    const subscription = new EventSubscription(eventBus, types);
+    stream.onAbort(() => subscription.close());
+
+    const send = (event: LoopEvent) =>
+      stream.writeSSE({ id: event.id, event: event.type, data: JSON.stringify(event) });
+
+    await stream.writeSSE({ event: 'ready', data: '{}', retry: EVENT_RETRY_MS });
+
+    const replayed = new Set<string>();
+    for (const event of eventBus.replay(lastEventId, types)) {
+      replayed.add(event.id);
+      await send(event);
+    }
+
+    while (!stream.aborted) {
+      const event = await subscription.take(EVENT_HEARTBEAT_MS);
+      if (stream.aborted) break;
+      if (!event) {
+        await stream.write(': keep-alive\n\n');
+      } else if (!replayed.has(event.id)) {
+        await send(event);
+      }
+    }
+
+    subscription.close();
+  });
+});
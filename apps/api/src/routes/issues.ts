@@ -1,7 +1,7 @@
 import { Hono } from 'hono';
 import { z } from 'zod';
 import { zValidator } from '@hono/zod-validator';
-import { eq, isNull, and, count, inArray } from 'drizzle-orm';
+import { eq, isNull, and, count, inArray, getTableColumns } from 'drizzle-orm';
 import { HTTPException } from 'hono/http-exception';
 import {
   issues,
@@ -11,6 +11,14 @@ import {
   labels,
   issueRelations,
 } from '../db/schema';
+import { eventBus, toIssueEventData } from '../lib/event-bus';
+import {
+  createdAtKeyset,
+  cursorParam,
+  includeTotalParam,
+  numberKeyset,
+  toPage,
+} from '../lib/pagination';
 import type { AppEnv } from '../types';
 
 // ─── Validation schemas ──────────────────────────────────────────────────────
@@ -59,27 +67,53 @@ const updateIssueSchema = z.object({
     .optional(),
 });
 
-const listIssuesSchema = z.object({
-  status: z.string().optional(),
-  type: z.string().optional(),
-  projectId: z.string().optional(),
-  labelId: z.string().optional(),
-  priority: z.coerce.number().int().min(0).max(4).optional(),
-  parentId: z.string().optional(),
-  limit: z.coerce.number().int().min(1).max(200).default(50),
-  offset: z.coerce.number().int().min(0).default(0),
-});
+const listIssuesSchema = z
+  .object({
+    status: z.string().optional(),
+    type: z.string().optional(),
+    projectId: z.string().optional(),
+    labelId: z.string().optional(),
+    priority: z.coerce.number().int().min(0).max(4).optional(),
+    parentId: z.string().optional(),
+    limit: z.coerce.number().int().min(1).max(200).default(50),
+    offset: z.coerce.number().int().min(0).default(0),
+    cursor: cursorParam,
+    orderBy: z.enum(['createdAt', 'number']).default('createdAt'),
+    includeTotal: includeTotalParam,
+  })
+  .refine((query) => !(query.cursor && query.offset > 0), {
+    message: 'Use either cursor or offset, not both',
+    path: ['cursor'],
+  });
 
 // ─── Route handler ───────────────────────────────────────────────────────────
 
 /** Issues CRUD routes — mounted at `/issues` under the authenticated API group. */
 export const issueRoutes = new Hono<AppEnv>();
 
-/** GET / — List issues with filtering and pagination, excluding soft-deleted. */
+/**
+ * GET / — List issues with filtering and pagination, excluding soft-deleted.
+ *
+ * Issues are ordered by `(createdAt, id)`, or by `number` with `orderBy=number`. Every
+ * page returns `nextCursor`; passing it back as `cursor` resumes after the last row with
+ * an index range scan instead of an offset, so deep pages stay cheap and do not shift
+ * when issues are inserted. `includeTotal=false` skips the `count()` over the filter.
+ */
 issueRoutes.get('/', zValidator('query', listIssuesSchema), async (c) => {
   const db = c.get('db');
-  const { status, type, projectId, labelId, priority, parentId, limit, offset } =
-    c.req.valid('query');
+  const {
+    status,
+    type,
+    projectId,
+    labelId,
+    priority,
+    parentId,
+    limit,
+    offset,
+    cursor,
+    orderBy,
+    includeTotal,
+  } = c.req.valid('query');
 
   const conditions = [isNull(issues.deletedAt)];
 
@@ -100,63 +134,36 @@ issueRoutes.get('/', zValidator('query', listIssuesSchema), async (c) => {
   if (parentId) {
     conditions.push(eq(issues.parentId, parentId));
   }
+  if (labelId) {
+    conditions.push(eq(issueLabels.labelId, labelId));
+  }
 
   const whereClause = and(...conditions);
+  const keyset = orderBy === 'number' ? numberKeyset(issues) : createdAtKeyset(issues);
+
+  const pageQuery = db
+    .select({ ...getTableColumns(issues), sortKey: keyset.sortKey })
+    .from(issues)
+    .$dynamic();
+  const countQuery = db.select({ count: count() }).from(issues).$dynamic();
 
   // When filtering by label, join through the issue_labels table
   if (labelId) {
-    const [data, totalResult] = await Promise.all([
-      db
-        .select({
-          id: issues.id,
-          number: issues.number,
-          title: issues.title,
-          description: issues.description,
-          type: issues.type,
-          status: issues.status,
-          priority: issues.priority,
-          parentId: issues.parentId,
-          projectId: issues.projectId,
-          signalSource: issues.signalSource,
-          signalPayload: issues.signalPayload,
-          hypothesis: issues.hypothesis,
-          agentSessionId: issues.agentSessionId,
-          agentSummary: issues.agentSummary,
-          commits: issues.commits,
-          pullRequests: issues.pullRequests,
-          completedAt: issues.completedAt,
-          createdAt: issues.createdAt,
-          updatedAt: issues.updatedAt,
-          deletedAt: issues.deletedAt,
-        })
-        .from(issues)
-        .innerJoin(issueLabels, eq(issues.id, issueLabels.issueId))
-        .where(and(whereClause, eq(issueLabels.labelId, labelId)))
-        .limit(limit)
-        .offset(offset)
-        .orderBy(issues.createdAt),
-      db
-        .select({ count: count() })
-        .from(issues)
-        .innerJoin(issueLabels, eq(issues.id, issueLabels.issueId))
-        .where(and(whereClause, eq(issueLabels.labelId, labelId))),
-    ]);
-
-    return c.json({ data, total: totalResult[0].count });
+    pageQuery.innerJoin(issueLabels, eq(issues.id, issueLabels.issueId));
+    countQuery.innerJoin(issueLabels, eq(issues.id, issueLabels.issueId));
   }
 
-  const [data, totalResult] = await Promise.all([
-    db
-      .select()
-      .from(issues)
-      .where(whereClause)
-      .limit(limit)
-      .offset(offset)
-      .orderBy(issues.createdAt),
-    db.select({ count: count() }).from(issues).where(whereClause),
+  // Fetch one extra row to learn whether another page follows
+  const [rows, total] = await Promise.all([
+    pageQuery
+      .where(cursor ? and(whereClause, keyset.after(cursor)) : whereClause)
+      .orderBy(...keyset.orderBy)
+      .limit(limit + 1)
+      .offset(offset),
+    includeTotal ? countQuery.where(whereClause).then(([result]) => result.count) : undefined,
   ]);
 
-  return c.json({ data, total: totalResult[0].count });
+  return c.json({ ...toPage(rows, limit, keyset), ...(total === undefined ? {} : { total }) });
 });
 
 /** POST / — Create a new issue with optional label associations. */
@@ -192,6 +199,8 @@ issueRoutes.post('/', zValidator('json', createIssueSchema), async (c) => {
       .values(labelIds.map((labelId) => ({ issueId: issue.id, labelId })));
   }
 
+  eventBus.publish('issue.created', toIssueEventData(issue));
+
   return c.json({ data: issue }, 201);
 });
 
@@ -258,6 +267,8 @@ issueRoutes.patch('/:id', zValidator('json', updateIssueSchema), async (c) => {
 
   const [updated] = await db.update(issues).set(body).where(eq(issues.id, id)).returning();
 
+  eventBus.publish('issue.updated', { ...toIssueEventData(updated), fields: Object.keys(body) });
+
   return c.json({ data: updated });
 });
 
@@ -277,5 +288,7 @@ issueRoutes.delete('/:id', async (c) => {
 
   await db.update(issues).set({ deletedAt: new Date() }).where(eq(issues.id, id));
 
+  eventBus.publish('issue.deleted', { issueId: id });
+
   return c.body(null, 204);
 });
@@ -1,8 +1,9 @@
 import { Hono } from 'hono';
 import { z } from 'zod';
 import { zValidator } from '@hono/zod-validator';
-import { signals, signalSeverityValues } from '../db/schema/signals';
-import { issues } from '../db/schema/issues';
+import { signalSeverityValues } from '../db/schema/signals';
+import { ingestSignal, ingestSignals, MAX_SIGNAL_BATCH } from '../lib/signal-ingest';
+import type { SignalInput } from '../lib/signal-ingest';
 import type { AppEnv } from '../types';
 
 // ─── Validation schema ──────────────────────────────────────────────────────
@@ -16,14 +17,9 @@ const createSignalSchema = z.object({
   projectId: z.string().optional(),
 });
 
-// ─── Severity → priority mapping ────────────────────────────────────────────
-
-const SEVERITY_PRIORITY_MAP: Record<(typeof signalSeverityValues)[number], number> = {
-  critical: 1,
-  high: 2,
-  medium: 3,
-  low: 4,
-};
+const batchSignalSchema = z.object({
+  signals: z.array(createSignalSchema).min(1).max(MAX_SIGNAL_BATCH),
+});
 
 // ─── Helpers ────────────────────────────────────────────────────────────────
 
@@ -38,51 +34,58 @@ function deriveIssueTitle(source: string, type: string, payload: Record<string,
   return `[${source}] ${type}: ${summary}`;
 }
 
+/** Normalize a validated request body into pipeline input. */
+function toSignalInput(data: z.infer<typeof createSignalSchema>): SignalInput {
+  return {
+    source: data.source,
+    sourceId: data.sourceId ?? null,
+    type: data.type,
+    severity: data.severity,
+    payload: data.payload,
+    projectId: data.projectId ?? null,
+    title: deriveIssueTitle(data.source, data.type, data.payload),
+  };
+}
+
 // ─── Route handler ──────────────────────────────────────────────────────────
 
 /**
- * Signal ingestion routes — generic POST endpoint for creating signals.
- * Each signal atomically creates a corresponding triage issue in a transaction.
+ * Signal ingestion routes — generic POST endpoints for creating signals.
+ * Each new signal atomically creates a corresponding triage issue; repeats of the same
+ * `(source, sourceId, type)` inside the dedup window are coalesced into the existing pair.
  */
 export const signalRoutes = new Hono<AppEnv>();
 
-/** POST / — Ingest a signal and atomically create a linked triage issue. */
+/**
+ * POST / — Ingest a signal and atomically create a linked triage issue.
+ * Returns 201 for a new signal, or 200 with `deduplicated: true` when it was coalesced.
+ */
 signalRoutes.post('/', zValidator('json', createSignalSchema), async (c) => {
   const data = c.req.valid('json');
   const db = c.get('db');
 
-  const priority = SEVERITY_PRIORITY_MAP[data.severity];
-  const title = deriveIssueTitle(data.source, data.type, data.payload);
+  const result = await ingestSignal(db, toSignalInput(data));
 
-  // Atomic transaction: create Issue then Signal so they're linked.
-  const result = await db.transaction(async (tx) => {
-    const [issue] = await tx
-      .insert(issues)
-      .values({
-        title,
-        type: 'signal',
-        status: 'triage',
-        priority,
-        projectId: data.projectId ?? null,
-        signalSource: data.source,
-        signalPayload: data.payload,
-      })
-      .returning();
+  return c.json({ data: result }, result.deduplicated ? 200 : 201);
+});
+
+/**
+ * POST /batch — Ingest many signals in one transaction with multi-row inserts.
+ * Returns one `{ signalId, issueId, deduplicated }` entry per input, in input order.
+ */
+signalRoutes.post('/batch', zValidator('json', batchSignalSchema), async (c) => {
+  const { signals } = c.req.valid('json');
+  const db = c.get('db');
 
-    const [signal] = await tx
-      .insert(signals)
-      .values({
-        source: data.source,
-        sourceId: data.sourceId ?? null,
-        type: data.type,
-        severity: data.severity,
-        payload: data.payload,
-        issueId: issue.id,
-      })
-      .returning();
+  const results = await ingestSignals(db, signals.map(toSignalInput));
 
-    return { signal, issue };
-  });
+  const data = results.map((r) => ({
+    signalId: r.signal.id,
+    issueId: r.issue.id,
+    deduplicated: r.deduplicated,
+  }));
+  const created = data.filter((r) => !r.deduplicated).length;
+  const status = created > 0 ? 201 : 200;
 
-  return c.json({ data: result }, 201);
+  return c.json({ data, created, deduplicated: data.length - created }, status);
 });
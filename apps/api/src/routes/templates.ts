@@ -1,7 +1,7 @@
 import { Hono } from 'hono';
 import { z } from 'zod';
 import { zValidator } from '@hono/zod-validator';
-import { eq, isNull, and, count, desc, max, sql } from 'drizzle-orm';
+import { eq, isNull, and, count, desc, max, sql, getTableColumns } from 'drizzle-orm';
 import { HTTPException } from 'hono/http-exception';
 import {
   promptTemplates,
@@ -14,13 +14,18 @@ import {
 } from '../db/schema';
 import {
   TemplateConditionsSchema,
-  selectTemplate,
   buildHydrationContext,
   hydrateTemplate,
   type IssueContext,
-  type TemplateCandidate,
-  type TemplateConditions,
 } from '../lib/prompt-engine';
+import { createdAtKeyset, cursorParam, includeTotalParam, toPage } from '../lib/pagination';
+import {
+  resolvePreviewTemplate,
+  getTemplateVersions,
+  invalidateTemplates,
+  invalidateTemplateVersions,
+} from '../lib/template-registry';
+import { eventBus } from '../lib/event-bus';
 import type { AppEnv } from '../types';
 
 // ─── Validation schemas ──────────────────────────────────────────────────────
@@ -58,30 +63,47 @@ const paginationSchema = z.object({
   offset: z.coerce.number().int().min(0).default(0),
 });
 
+const listTemplatesSchema = paginationSchema
+  .extend({ cursor: cursorParam, includeTotal: includeTotalParam })
+  .refine((query) => !(query.cursor && query.offset > 0), {
+    message: 'Use either cursor or offset, not both',
+    path: ['cursor'],
+  });
+
 // ─── Route handler ───────────────────────────────────────────────────────────
 
 /** Template and version CRUD routes — mounted at `/templates` under the authenticated API group. */
 export const templateRoutes = new Hono<AppEnv>();
 
-/** GET / — List templates with pagination, excluding soft-deleted. */
-templateRoutes.get('/', zValidator('query', paginationSchema), async (c) => {
+/**
+ * GET / — List templates with pagination, excluding soft-deleted.
+ * Supports `cursor` paging in `(createdAt, id)` order and `includeTotal=false`, as on issues.
+ */
+templateRoutes.get('/', zValidator('query', listTemplatesSchema), async (c) => {
   const db = c.get('db');
-  const { limit, offset } = c.req.valid('query');
+  const { limit, offset, cursor, includeTotal } = c.req.valid('query');
 
   const whereClause = isNull(promptTemplates.deletedAt);
+  const keyset = createdAtKeyset(promptTemplates);
 
-  const [data, totalResult] = await Promise.all([
+  const [rows, total] = await Promise.all([
     db
-      .select()
+      .select({ ...getTableColumns(promptTemplates), sortKey: keyset.sortKey })
       .from(promptTemplates)
-      .where(whereClause)
-      .limit(limit)
-      .offset(offset)
-      .orderBy(promptTemplates.createdAt),
-    db.select({ count: count() }).from(promptTemplates).where(whereClause),
+      .where(cursor ? and(whereClause, keyset.after(cursor)) : whereClause)
+      .orderBy(...keyset.orderBy)
+      .limit(limit + 1)
+      .offset(offset),
+    includeTotal
+      ? db
+          .select({ count: count() })
+          .from(promptTemplates)
+          .where(whereClause)
+          .then(([result]) => result.count)
+      : undefined,
   ]);
 
-  return c.json({ data, total: totalResult[0].count });
+  return c.json({ ...toPage(rows, limit, keyset), ...(total === undefined ? {} : { total }) });
 });
 
 /** POST / — Create a new template with an initial version. */
@@ -100,6 +122,7 @@ templateRoutes.post('/', zValidator('json', createTemplateSchema), async (c) =>
   }
 
   const [template] = await db.insert(promptTemplates).values(body).returning();
+  invalidateTemplates(db);
 
   return c.json({ data: template }, 201);
 });
@@ -121,7 +144,7 @@ templateRoutes.get('/preview/:issueId', async (c) => {
     throw new HTTPException(404, { message: 'Issue not found' });
   }
 
-  // 2. Build IssueContext (same logic as dispatch buildIssueContext)
+  // 2. Build IssueContext (same logic as dispatch buildIssueContexts)
   const [labelRows, failedSessionRows] = await Promise.all([
     db
       .select({ name: labels.name })
@@ -152,31 +175,10 @@ templateRoutes.get('/preview/:issueId', async (c) => {
     hypothesisConfidence: issue.hypothesis?.confidence ?? null,
   };
 
-  // 3. Fetch all non-deleted templates
-  const allTemplates = await db
-    .select()
-    .from(promptTemplates)
-    .where(isNull(promptTemplates.deletedAt));
-
-  const candidates: TemplateCandidate[] = allTemplates.map((t) => ({
-    id: t.id,
-    slug: t.slug,
-    conditions: t.conditions as TemplateConditions,
-    specificity: t.specificity,
-    projectId: t.projectId ?? null,
-    activeVersionId: t.activeVersionId ?? null,
-  }));
-
-  // 4. Select template with fallback
-  let selected = selectTemplate(candidates, issueContext);
-  if (!selected) {
-    selected =
-      candidates.find(
-        (t) => (t.conditions as TemplateConditions).type === issue.type && t.activeVersionId
-      ) ?? null;
-  }
+  // 3. Select template, falling back to any template conditioned on the issue type
+  const selected = await resolvePreviewTemplate(db, issueContext);
 
-  // 5. No template found
+  // 4. No template found
   if (!selected || !selected.activeVersionId) {
     return c.json({
       issue: { id: issue.id, number: issue.number, title: issue.title, type: issue.type },
@@ -187,11 +189,10 @@ templateRoutes.get('/preview/:issueId', async (c) => {
     });
   }
 
-  // 6. Fetch version, build context, hydrate
-  const [version] = await db
-    .select()
-    .from(promptVersions)
-    .where(eq(promptVersions.id, selected.activeVersionId));
+  // 5. Fetch version, build context, hydrate
+  const version = (await getTemplateVersions(db, [selected.activeVersionId])).get(
+    selected.activeVersionId
+  );
 
   if (!version) {
     return c.json({
@@ -216,7 +217,7 @@ templateRoutes.get('/preview/:issueId', async (c) => {
     template: {
       id: selected.id,
       slug: selected.slug,
-      name: allTemplates.find((t) => t.id === selected!.id)?.name,
+      name: selected.name,
       conditions: selected.conditions,
       specificity: selected.specificity,
     },
@@ -272,6 +273,7 @@ templateRoutes.patch('/:id', zValidator('json', updateTemplateSchema), async (c)
     .set(body)
     .where(eq(promptTemplates.id, id))
     .returning();
+  invalidateTemplates(db);
 
   return c.json({ data: updated });
 });
@@ -291,6 +293,7 @@ templateRoutes.delete('/:id', async (c) => {
   }
 
   await db.update(promptTemplates).set({ deletedAt: new Date() }).where(eq(promptTemplates.id, id));
+  invalidateTemplates(db);
 
   return c.body(null, 204);
 });
@@ -379,6 +382,7 @@ templateRoutes.post('/:id/versions', zValidator('json', createVersionSchema), as
       .update(promptTemplates)
       .set({ activeVersionId: version.id })
       .where(eq(promptTemplates.id, id));
+    invalidateTemplates(db);
   }
 
   return c.json({ data: version }, 201);
@@ -434,6 +438,19 @@ templateRoutes.post('/:id/versions/:versionId/promote', async (c) => {
     .update(promptTemplates)
     .set({ activeVersionId: versionId })
     .where(eq(promptTemplates.id, id));
+  invalidateTemplates(db);
+  invalidateTemplateVersions(
+    db,
+    template.activeVersionId ? [template.activeVersionId, versionId] : [versionId]
+  );
+
+  eventBus.publish('template.promoted', {
+    templateId: id,
+    slug: template.slug,
+    versionId,
+    version: promoted.version,
+    previousVersionId: template.activeVersionId,
+  });
 
   return c.json({ data: promoted });
 });
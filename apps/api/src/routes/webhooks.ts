@@ -1,26 +1,12 @@
 import { Hono } from 'hono';
-import { signals } from '../db/schema/signals';
-import { issues } from '../db/schema/issues';
 import {
   verifyGitHubWebhook,
   verifySentryWebhook,
   verifyPostHogWebhook,
 } from '../middleware/webhooks';
-import type { AppEnv, AnyDb } from '../types';
-import type { signalSeverityValues } from '../db/schema/signals';
-
-// ─── Types ──────────────────────────────────────────────────────────────────
-
-type Severity = (typeof signalSeverityValues)[number];
-
-// ─── Severity → priority mapping ────────────────────────────────────────────
-
-const SEVERITY_PRIORITY_MAP: Record<Severity, number> = {
-  critical: 1,
-  high: 2,
-  medium: 3,
-  low: 4,
-};
+import { ingestSignal } from '../lib/signal-ingest';
+import type { Severity } from '../lib/signal-ingest';
+import type { AppEnv } from '../types';
 
 // ─── GitHub event → severity mapping ────────────────────────────────────────
 
@@ -65,15 +51,49 @@ function deriveSentrySeverity(level: string, count: number): Severity {
   return 'low';
 }
 
+/** Payload fields holding the object a GitHub event is about, most specific first. */
+const GITHUB_ENTITY_FIELDS = [
+  'pull_request',
+  'issue',
+  'alert',
+  'security_advisory',
+  'check_run',
+  'workflow_run',
+  'deployment',
+] as const;
+
+/**
+ * Stable identity of the object a GitHub event is about, e.g. `dork-labs/loop#42` for a
+ * pull request or issue. Falls back to the object's `node_id` or GHSA id, and returns
+ * null when the payload names no entity (pushes, pings), so it is never deduplicated.
+ *
+ * @param body - Parsed GitHub webhook payload
+ */
+function githubEntityId(body: Record<string, unknown>): string | null {
+  const repo = (body.repository as { full_name?: string } | undefined)?.full_name;
+  for (const field of GITHUB_ENTITY_FIELDS) {
+    const entity = body[field] as Record<string, unknown> | null | undefined;
+    if (!entity || typeof entity !== 'object') continue;
+    if (repo && typeof entity.number === 'number') {
+      return field === 'alert' ? `${repo}/alerts/${entity.number}` : `${repo}#${entity.number}`;
+    }
+    const id = entity.node_id ?? entity.ghsa_id ?? entity.id;
+    if (typeof id === 'string' || typeof id === 'number') return `${field}/${id}`;
+  }
+  return null;
+}
+
 // ─── Route handler ──────────────────────────────────────────────────────────
 
 /**
  * Webhook signal routes for PostHog, GitHub, and Sentry.
- * Each endpoint uses provider-specific auth middleware (not apiKeyAuth).
+ * Each endpoint uses provider-specific auth middleware (not apiKeyAuth), and feeds the
+ * shared ingest pipeline so repeated deliveries coalesce into one triage issue.
+ * Responds 201 for a new signal and 200 when the delivery was deduplicated.
  */
 export const webhookRoutes = new Hono<AppEnv>();
 
-/** POST /posthog — Ingest a PostHog webhook and create a signal + issue. */
+/** POST /posthog — Ingest a PostHog webhook and create (or coalesce into) a signal + issue. */
 webhookRoutes.post('/posthog', verifyPostHogWebhook, async (c) => {
   const db = c.get('db');
   const body = await c.req.json();
@@ -86,39 +106,20 @@ webhookRoutes.post('/posthog', verifyPostHogWebhook, async (c) => {
   const title = `PostHog: ${metricName} ${changePercent}% (${timeframe})`;
   const payload = body as Record<string, unknown>;
 
-  const result = await db.transaction(async (tx: AnyDb) => {
-    const [issue] = await tx
-      .insert(issues)
-      .values({
-        title,
-        type: 'signal',
-        status: 'triage',
-        priority: SEVERITY_PRIORITY_MAP[severity],
-        projectId: null,
-        signalSource: 'posthog',
-        signalPayload: payload,
-      })
-      .returning();
-
-    const [signal] = await tx
-      .insert(signals)
-      .values({
-        source: 'posthog',
-        sourceId: null,
-        type: 'metric_change',
-        severity,
-        payload,
-        issueId: issue.id,
-      })
-      .returning();
-
-    return { signal, issue };
+  const result = await ingestSignal(db, {
+    source: 'posthog',
+    sourceId: null,
+    type: 'metric_change',
+    severity,
+    payload,
+    projectId: null,
+    title,
   });
 
-  return c.json({ data: result }, 201);
+  return c.json({ data: result }, result.deduplicated ? 200 : 201);
 });
 
-/** POST /github — Ingest a GitHub webhook and create a signal + issue. */
+/** POST /github — Ingest a GitHub webhook and create (or coalesce into) a signal + issue. */
 webhookRoutes.post('/github', verifyGitHubWebhook, async (c) => {
   const db = c.get('db');
   const body = await c.req.json();
@@ -129,42 +130,26 @@ webhookRoutes.post('/github', verifyGitHubWebhook, async (c) => {
 
   const severity = GITHUB_EVENT_SEVERITY[eventType] ?? 'medium';
   const title = `GitHub: ${eventType} on ${repo} by ${actor}`;
-  const sourceId = body.action ? `${eventType}.${body.action}` : eventType;
+  const event = body.action ? `${eventType}.${body.action}` : eventType;
+  // Deliveries are only coalesced per entity; without one, every delivery is a new signal
+  const entity = githubEntityId(body);
+  const sourceId = entity ? `${event}:${entity}` : null;
   const payload = body as Record<string, unknown>;
 
-  const result = await db.transaction(async (tx: AnyDb) => {
-    const [issue] = await tx
-      .insert(issues)
-      .values({
-        title,
-        type: 'signal',
-        status: 'triage',
-        priority: SEVERITY_PRIORITY_MAP[severity],
-        projectId: null,
-        signalSource: 'github',
-        signalPayload: payload,
-      })
-      .returning();
-
-    const [signal] = await tx
-      .insert(signals)
-      .values({
-        source: 'github',
-        sourceId,
-        type: eventType,
-        severity,
-        payload,
-        issueId: issue.id,
-      })
-      .returning();
-
-    return { signal, issue };
+  const result = await ingestSignal(db, {
+    source: 'github',
+    sourceId,
+    type: eventType,
+    severity,
+    payload,
+    projectId: null,
+    title,
   });
 
-  return c.json({ data: result }, 201);
+  return c.json({ data: result }, result.deduplicated ? 200 : 201);
 });
 
-/** POST /sentry — Ingest a Sentry webhook and create a signal + issue. */
+/** POST /sentry — Ingest a Sentry webhook and create (or coalesce into) a signal + issue. */
 webhookRoutes.post('/sentry', verifySentryWebhook, async (c) => {
   const db = c.get('db');
   const body = await c.req.json();
@@ -181,34 +166,15 @@ webhookRoutes.post('/sentry', verifySentryWebhook, async (c) => {
   const sourceId = issueId ? String(issueId) : null;
   const payload = body as Record<string, unknown>;
 
-  const result = await db.transaction(async (tx: AnyDb) => {
-    const [issue] = await tx
-      .insert(issues)
-      .values({
-        title,
-        type: 'signal',
-        status: 'triage',
-        priority: SEVERITY_PRIORITY_MAP[severity],
-        projectId: null,
-        signalSource: 'sentry',
-        signalPayload: payload,
-      })
-      .returning();
-
-    const [signal] = await tx
-      .insert(signals)
-      .values({
-        source: 'sentry',
-        sourceId,
-        type: (body.action ?? 'event') as string,
-        severity,
-        payload,
-        issueId: issue.id,
-      })
-      .returning();
-
-    return { signal, issue };
+  const result = await ingestSignal(db, {
+    source: 'sentry',
+    sourceId,
+    type: (body.action ?? 'event') as string,
+    severity,
+    payload,
+    projectId: null,
+    title,
   });
 
-  return c.json({ data: result }, 201);
+  return c.json({ data: result }, result.deduplicated ? 200 : 201);
 });
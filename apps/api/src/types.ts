@@ -1,5 +1,6 @@
 import type { PgDatabase, PgQueryResultHKT } from 'drizzle-orm/pg-core';
 import type * as schema from './db/schema';
+import type { RequestMetrics } from './lib/request-metrics';
 
 /**
  * Driver-agnostic database type shared by routes, middleware, and tests.
@@ -12,5 +13,7 @@ export type AnyDb = PgDatabase<PgQueryResultHKT, typeof schema>;
 export type AppEnv = {
   Variables: {
     db: AnyDb;
+    /** Per-route latency histograms, set by `requestTiming()` when metrics are enabled. */
+    requestMetrics?: RequestMetrics;
   };
 };
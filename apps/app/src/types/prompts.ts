@@ -45,6 +45,10 @@ export interface PromptVersion {
   completionRate: number | null;
   avgDurationMs: number | null;
   reviewScore: number | null;
+  reviewCount: number;
+  claritySum: number;
+  completenessSum: number;
+  relevanceSum: number;
   createdAt: string;
 }
 
@@ -4,10 +4,11 @@ import { registerDispatchCommand } from '../../commands/dispatch.js';
 
 // Mock client module
 const mockNext = vi.fn();
+const mockNextBatch = vi.fn();
 const mockQueue = vi.fn();
 vi.mock('../../lib/client.js', () => ({
   createClient: vi.fn(() => ({
-    dispatch: { next: mockNext, queue: mockQueue },
+    dispatch: { next: mockNext, nextBatch: mockNextBatch, queue: mockQueue },
   })),
 }));
 
@@ -153,6 +154,73 @@ describe('dispatch commands', () => {
     });
   });
 
+  describe('dispatch claim', () => {
+    const mockBatch = [
+      {
+        issue: {
+          id: 'iss-1',
+          number: 42,
+          title: 'Fix OAuth redirect',
+          type: 'task',
+          priority: 2,
+          status: 'in_progress',
+        },
+        prompt: 'You are working on fixing the OAuth redirect...',
+        meta: null,
+      },
+      {
+        issue: {
+          id: 'iss-2',
+          number: 43,
+          title: 'Triage login spike',
+          type: 'signal',
+          priority: 1,
+          status: 'in_progress',
+        },
+        prompt: null,
+        meta: null,
+      },
+    ];
+
+    it('calls client.dispatch.nextBatch with default count and renders each issue', async () => {
+      mockNextBatch.mockResolvedValue(mockBatch);
+
+      await program.parseAsync(['node', 'test', 'dispatch', 'claim']);
+
+      expect(mockNextBatch).toHaveBeenCalledWith({ count: 5 });
+      expect(console.log).toHaveBeenCalledWith(expect.stringContaining('#42'));
+      expect(console.log).toHaveBeenCalledWith(expect.stringContaining('#43'));
+      expect(console.log).toHaveBeenCalledWith(expect.stringContaining('Claimed 2 issue(s)'));
+    });
+
+    it('passes --count and --project through', async () => {
+      mockNextBatch.mockResolvedValue([]);
+
+      await program.parseAsync([
+        'node',
+        'test',
+        'dispatch',
+        'claim',
+        '--count',
+        '10',
+        '--project',
+        'proj-1',
+      ]);
+
+      expect(mockNextBatch).toHaveBeenCalledWith({ count: 10, projectId: 'proj-1' });
+    });
+
+    it('shows empty message when nothing was claimed', async () => {
+      mockNextBatch.mockResolvedValue([]);
+
+      await program.parseAsync(['node', 'test', 'dispatch', 'claim']);
+
+      expect(console.log).toHaveBeenCalledWith(
+        expect.stringContaining('No issues ready for dispatch.')
+      );
+    });
+  });
+
   describe('dispatch queue', () => {
     const mockQueueResult = {
       data: [
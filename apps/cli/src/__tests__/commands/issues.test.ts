@@ -3,6 +3,7 @@ import { Command } from 'commander';
 import { registerIssuesCommand } from '../../commands/issues.js';
 
 const mockList = vi.fn();
+const mockIter = vi.fn();
 const mockGet = vi.fn();
 const mockCreate = vi.fn();
 const mockUpdate = vi.fn();
@@ -10,7 +11,13 @@ const mockCommentsCreate = vi.fn();
 
 vi.mock('../../lib/client.js', () => ({
   createClient: vi.fn(() => ({
-    issues: { list: mockList, get: mockGet, create: mockCreate, update: mockUpdate },
+    issues: {
+      list: mockList,
+      iter: mockIter,
+      get: mockGet,
+      create: mockCreate,
+      update: mockUpdate,
+    },
     comments: { create: mockCommentsCreate },
   })),
 }));
@@ -90,6 +97,38 @@ describe('issues command', () => {
       writeSpy.mockRestore();
     });
 
+    it('requests the next page by cursor instead of offset', async () => {
+      mockList.mockResolvedValue({ data: mockIssues, total: 2, nextCursor: null });
+
+      await program.parseAsync([
+        'node', 'test', 'issues', 'list',
+        '--cursor', 'abc',
+        '--order', 'number',
+      ]);
+
+      expect(mockList).toHaveBeenCalledWith({ limit: 50, cursor: 'abc', orderBy: 'number' });
+    });
+
+    it('streams every issue as JSON lines with --all --json', async () => {
+      mockIter.mockImplementation(async function* () {
+        yield* mockIssues;
+      });
+      const writeSpy = vi.spyOn(process.stdout, 'write').mockImplementation(() => true);
+
+      await program.parseAsync([
+        'node', 'test', '--json', 'issues', 'list',
+        '--all',
+        '--status', 'todo',
+      ]);
+
+      expect(mockIter).toHaveBeenCalledWith({ status: 'todo' });
+      expect(mockList).not.toHaveBeenCalled();
+      expect(writeSpy.mock.calls.map(([line]) => line)).toEqual(
+        mockIssues.map((issue) => JSON.stringify(issue) + '\n')
+      );
+      writeSpy.mockRestore();
+    });
+
     it('exits with error on API failure', async () => {
       mockList.mockRejectedValue(new Error('Network error'));
 
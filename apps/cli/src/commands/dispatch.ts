@@ -11,6 +11,7 @@ import type { DispatchNextResponse, DispatchQueueItem } from '@dork-labs/loop-ty
  * Register the `next` and `dispatch` top-level commands.
  *
  * - `loop next` — Claim the highest-priority unblocked issue with dispatch instructions.
+ * - `loop dispatch claim` — Claim a batch of issues in a single round trip.
  * - `loop dispatch queue` — Preview the dispatch queue without claiming.
  */
 export function registerDispatchCommand(program: Command): void {
@@ -61,6 +62,45 @@ export function registerDispatchCommand(program: Command): void {
   // -- dispatch queue
   const dispatch = program.command('dispatch').description('Dispatch queue operations');
 
+  dispatch
+    .command('claim')
+    .description('Claim a batch of highest-priority issues in a single round trip')
+    .option('--project <id>', 'Filter by project ID')
+    .option('--count <n>', 'Max issues to claim (1-50)', '5')
+    .action(async (opts) => {
+      const globalOpts = program.opts<GlobalOptions>();
+      await withErrorHandler(async () => {
+        const client = createClient(globalOpts);
+
+        const params: { count: number; projectId?: string } = { count: Number(opts.count) };
+        if (opts.project) params.projectId = opts.project;
+
+        const results = await client.dispatch.nextBatch(params);
+
+        output(
+          results,
+          globalOpts,
+          () => {
+            if (results.length === 0) {
+              console.log(pc.dim('No issues ready for dispatch.'));
+              return;
+            }
+            for (const result of results) renderDispatchResult(result);
+            console.log(pc.dim(`\nClaimed ${results.length} issue(s)`));
+          },
+          () => {
+            for (const { issue } of results) {
+              console.log(
+                [issue.id, issue.number, issue.type, issue.title, issue.priority, issue.status].join(
+                  '\t'
+                )
+              );
+            }
+          }
+        );
+      });
+    });
+
   dispatch
     .command('queue')
     .description('Preview the dispatch queue (priority-ordered unblocked issues)')
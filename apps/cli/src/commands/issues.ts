@@ -7,12 +7,20 @@ import {
   output,
   renderIssueTable,
   renderIssueTablePlain,
+  streamIssueTablePlain,
+  streamJsonLines,
   STATUS_COLOR,
   PRIORITY_LABEL,
   TYPE_ICON,
 } from '../lib/output.js';
 import type { GlobalOptions } from '../lib/config.js';
-import type { IssueDetail, IssueRelation, IssueType, CreateIssueParams } from '@dork-labs/loop-types';
+import type {
+  Issue,
+  IssueDetail,
+  IssueRelation,
+  IssueType,
+  CreateIssueParams,
+} from '@dork-labs/loop-types';
 
 const ISSUE_TYPES: IssueType[] = ['signal', 'hypothesis', 'plan', 'task', 'monitor'];
 
@@ -36,28 +44,53 @@ export function registerIssuesCommand(program: Command): void {
     .option('--type <type>', 'Filter by issue type')
     .option('--project <id>', 'Filter by project ID')
     .option('--priority <n>', 'Filter by priority (0-4)')
+    .option('--order <field>', 'Sort by createdAt (default) or number')
     .option('--limit <n>', 'Results per page', '50')
     .option('--offset <n>', 'Pagination offset', '0')
+    .option('--cursor <cursor>', 'Continue after a previous page (its nextCursor)')
+    .option('--all', 'Stream every matching issue, fetching pages by cursor')
     .action(async (opts) => {
       const globalOpts = program.opts<GlobalOptions>();
       await withErrorHandler(async () => {
         const client = createClient(globalOpts);
 
-        const params: Record<string, unknown> = {
-          limit: Number(opts.limit),
-          offset: Number(opts.offset),
-        };
-        if (opts.status) params.status = opts.status;
-        if (opts.type) params.type = opts.type;
-        if (opts.project) params.projectId = opts.project;
-        if (opts.priority) params.priority = Number(opts.priority);
+        const filters: Record<string, unknown> = {};
+        if (opts.status) filters.status = opts.status;
+        if (opts.type) filters.type = opts.type;
+        if (opts.project) filters.projectId = opts.project;
+        if (opts.priority) filters.priority = Number(opts.priority);
+        if (opts.order) filters.orderBy = opts.order;
+
+        if (opts.all) {
+          // Rows are printed as pages arrive; --json emits one issue per line
+          const all = client.issues.iter(filters);
+          if (globalOpts.json) {
+            await streamJsonLines(all);
+          } else if (globalOpts.plain) {
+            await streamIssueTablePlain(all);
+          } else {
+            const collected: Issue[] = [];
+            for await (const issue of all) collected.push(issue);
+            renderIssueTable(collected);
+          }
+          return;
+        }
+
+        const params: Record<string, unknown> = opts.cursor
+          ? { limit: Number(opts.limit), cursor: opts.cursor, ...filters }
+          : { limit: Number(opts.limit), offset: Number(opts.offset), ...filters };
 
         const result = await client.issues.list(params);
 
         output(
           result,
           globalOpts,
-          () => renderIssueTable(result.data),
+          () => {
+            renderIssueTable(result.data);
+            if (result.nextCursor) {
+              console.log(pc.dim(`\nNext page: --cursor ${result.nextCursor}`));
+            }
+          },
           () => renderIssueTablePlain(result.data)
         );
       });
@@ -75,13 +75,16 @@ export function renderPlainTable(headers: string[], rows: string[][]): void {
   }
 }
 
+/** Column headers shared by the issue table renderers. */
+const ISSUE_COLUMNS = ['#', 'TYPE', 'TITLE', 'STATUS', 'PRI', 'PROJECT', 'CREATED'];
+
 /**
  * Render a list of issues as a formatted table.
  * Columns: #, TYPE, TITLE, STATUS, PRI, PROJECT, CREATED
  */
 export function renderIssueTable(issues: Issue[]): void {
   const table = new Table({
-    head: ['#', 'TYPE', 'TITLE', 'STATUS', 'PRI', 'PROJECT', 'CREATED'],
+    head: ISSUE_COLUMNS,
     style: { head: ['cyan'] },
   });
 
@@ -107,23 +110,49 @@ export function renderIssueTable(issues: Issue[]): void {
   console.log(table.toString());
 }
 
+/** Cells of one issue row in plain output. */
+function issuePlainRow(issue: Issue): string[] {
+  return [
+    String(issue.number ?? ''),
+    issue.type ?? '',
+    issue.title ?? '',
+    issue.status ?? '',
+    String(issue.priority ?? 3),
+    issue.projectId ?? '-',
+    formatDate(issue.createdAt ?? ''),
+  ];
+}
+
 /**
  * Render a list of issues as tab-separated plain text.
  * Columns: #, TYPE, TITLE, STATUS, PRIORITY, PROJECT, CREATED
  */
 export function renderIssueTablePlain(issues: Issue[]): void {
-  renderPlainTable(
-    ['#', 'TYPE', 'TITLE', 'STATUS', 'PRI', 'PROJECT', 'CREATED'],
-    issues.map((issue) => [
-      String(issue.number ?? ''),
-      issue.type ?? '',
-      issue.title ?? '',
-      issue.status ?? '',
-      String(issue.priority ?? 3),
-      issue.projectId ?? '-',
-      formatDate(issue.createdAt ?? ''),
-    ])
-  );
+  renderPlainTable(ISSUE_COLUMNS, issues.map(issuePlainRow));
+}
+
+/**
+ * Write issues as tab-separated rows as they arrive, so long listings start printing
+ * before the last page is fetched. Same columns as {@link renderIssueTablePlain}.
+ *
+ * @param issues - Issues to print, typically from `client.issues.iter()`
+ */
+export async function streamIssueTablePlain(issues: AsyncIterable<Issue>): Promise<void> {
+  process.stdout.write(ISSUE_COLUMNS.join('\t') + '\n');
+  for await (const issue of issues) {
+    process.stdout.write(issuePlainRow(issue).join('\t') + '\n');
+  }
+}
+
+/**
+ * Write items as JSON Lines (one compact JSON object per line) as they arrive.
+ *
+ * @param items - Items to print
+ */
+export async function streamJsonLines(items: AsyncIterable<unknown>): Promise<void> {
+  for await (const item of items) {
+    process.stdout.write(JSON.stringify(item) + '\n');
+  }
 }
 
 /** Truncate a string to maxLen, appending ellipsis if needed. */
@@ -59,7 +59,7 @@ function getRegisteredCallback(client: ApiClient) {
   // The 6-arg overload: name, description, paramsSchema, annotations, callback
   const args = toolSpy.mock.calls[0];
   const callback = args[args.length - 1] as (
-    params: { projectId?: string },
+    params: { projectId?: string; count?: number },
     extra: unknown
   ) => Promise<{
     content: Array<{ type: string; text: string }>;
@@ -212,4 +212,39 @@ describe('registerGetNextTask', () => {
     expect(parsed.prompt).toBeNull();
     expect(parsed.meta).toBeNull();
   });
+
+  it('passes count and returns a tasks array in batch mode', async () => {
+    const client = createMockClient({
+      data: [
+        {
+          issue: { id: 'iss_1', number: 1, title: 'A', type: 'task', priority: 1, status: 'x' },
+          prompt: 'Do A',
+          meta: null,
+        },
+        {
+          issue: { id: 'iss_2', number: 2, title: 'B', type: 'task', priority: 2, status: 'x' },
+        },
+      ],
+    });
+    const { callback } = getRegisteredCallback(client);
+
+    const result = await callback({ count: 2 }, {});
+
+    expect(client.get).toHaveBeenCalledWith('api/dispatch/next', {
+      searchParams: { count: '2' },
+    });
+    const parsed = JSON.parse(result.content[0].text);
+    expect(parsed.tasks).toHaveLength(2);
+    expect(parsed.tasks[0].prompt).toBe('Do A');
+    expect(parsed.tasks[1].prompt).toBeNull();
+  });
+
+  it('returns empty queue message on 204 in batch mode', async () => {
+    const client = createEmptyQueueClient();
+    const { callback } = getRegisteredCallback(client);
+
+    const result = await callback({ count: 5 }, {});
+
+    expect(result.content[0].text).toBe('No tasks available. The dispatch queue is empty.');
+  });
 });
@@ -7,7 +7,9 @@ import { handleToolCall } from './error-handler.js';
  * Register the `loop_get_next_task` tool on the MCP server.
  *
  * Calls `GET /api/dispatch/next` to atomically claim the highest-priority
- * unblocked issue and return it with hydrated prompt instructions.
+ * unblocked issue and return it with hydrated prompt instructions. When
+ * `count` is given, claims up to that many issues in one round trip and
+ * returns them as a `tasks` array.
  *
  * @param server - MCP server instance to register the tool on
  * @param client - Authenticated ky client for the Loop API
@@ -16,11 +18,21 @@ export function registerGetNextTask(server: McpServer, client: ApiClient): void
   server.tool(
     'loop_get_next_task',
     'Get the highest-priority unblocked issue with dispatch instructions. Atomically claims the issue. Returns issue details and hydrated prompt.',
-    { projectId: z.string().optional().describe('Filter to a specific project') },
-    async ({ projectId }) => {
+    {
+      projectId: z.string().optional().describe('Filter to a specific project'),
+      count: z
+        .number()
+        .int()
+        .min(1)
+        .max(50)
+        .optional()
+        .describe('Claim up to this many issues at once (batch mode)'),
+    },
+    async ({ projectId, count }) => {
       return handleToolCall(async () => {
         const searchParams: Record<string, string> = {};
         if (projectId) searchParams.projectId = projectId;
+        if (count !== undefined) searchParams.count = String(count);
 
         const response = await client.get('api/dispatch/next', { searchParams });
 
@@ -36,6 +48,21 @@ export function registerGetNextTask(server: McpServer, client: ApiClient): void
           };
         }
 
+        if (count !== undefined) {
+          const batch = (await response.json()) as { data?: Record<string, unknown>[] };
+          const structured = { tasks: (batch.data ?? []).map(toTask) };
+
+          return {
+            content: [
+              {
+                type: 'text' as const,
+                text: JSON.stringify(structured, null, 2),
+              },
+            ],
+            structuredContent: structured,
+          };
+        }
+
         const result = (await response.json()) as Record<string, unknown>;
 
         if (!result || !result.issue) {
@@ -49,19 +76,7 @@ export function registerGetNextTask(server: McpServer, client: ApiClient): void
           };
         }
 
-        const issue = result.issue as Record<string, unknown>;
-        const structured = {
-          issue: {
-            id: issue.id,
-            number: issue.number,
-            title: issue.title,
-            type: issue.type,
-            priority: issue.priority,
-            status: issue.status,
-          },
-          prompt: result.prompt ?? null,
-          meta: result.meta ?? null,
-        };
+        const structured = toTask(result);
 
         return {
           content: [
@@ -76,3 +91,24 @@ export function registerGetNextTask(server: McpServer, client: ApiClient): void
     }
   );
 }
+
+/**
+ * Project a dispatch result onto the fields exposed to MCP clients.
+ *
+ * @param result - Raw dispatch result from the API
+ */
+function toTask(result: Record<string, unknown>) {
+  const issue = result.issue as Record<string, unknown>;
+  return {
+    issue: {
+      id: issue.id,
+      number: issue.number,
+      title: issue.title,
+      type: issue.type,
+      priority: issue.priority,
+      status: issue.status,
+    },
+    prompt: result.prompt ?? null,
+    meta: result.meta ?? null,
+  };
+}
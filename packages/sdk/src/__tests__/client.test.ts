@@ -11,6 +11,7 @@ import { TemplatesResource } from '../resources/templates';
 import { ReviewsResource } from '../resources/reviews';
 import { DashboardResource } from '../resources/dashboard';
 import { DispatchResource } from '../resources/dispatch';
+import { EventsResource } from '../resources/events';
 
 // Mock ky so that createHttpClient() doesn't make real network calls
 vi.mock('ky', () => {
@@ -108,6 +109,10 @@ describe('LoopClient', () => {
     it('exposes dashboard as DashboardResource', () => {
       expect(client.dashboard).toBeInstanceOf(DashboardResource);
     });
+
+    it('exposes events as EventsResource', () => {
+      expect(client.events).toBeInstanceOf(EventsResource);
+    });
   });
 
   describe('resource stability', () => {
@@ -1,5 +1,6 @@
 import { describe, it, expect, vi } from 'vitest';
 import { PaginatedList, paginate } from '../pagination';
+import type { Page } from '../pagination';
 
 describe('PaginatedList', () => {
   it('stores data and total', () => {
@@ -19,6 +20,11 @@ describe('PaginatedList', () => {
   it('hasMore is false for empty results', () => {
     expect(new PaginatedList([], 0).hasMore).toBe(false);
   });
+
+  it('hasMore follows nextCursor when the endpoint returns one', () => {
+    expect(new PaginatedList([1, 2], 10, 'cursor').hasMore).toBe(true);
+    expect(new PaginatedList([1, 2], 10, null).hasMore).toBe(false);
+  });
 });
 
 describe('paginate', () => {
@@ -86,4 +92,22 @@ describe('paginate', () => {
     expect(items).toEqual(['c']);
     expect(fetchPage).toHaveBeenCalledWith({ limit: 2, offset: 2 });
   });
+
+  it('follows nextCursor instead of offsets once a page returns one', async () => {
+    const fetchPage = vi
+      .fn<(params: { limit?: number; offset?: number; cursor?: string }) => Promise<Page<string>>>()
+      .mockResolvedValueOnce({ data: ['a', 'b'], nextCursor: 'c1' })
+      .mockResolvedValueOnce({ data: ['c', 'd'], nextCursor: 'c2' })
+      .mockResolvedValueOnce({ data: ['e'], nextCursor: null });
+
+    const items: string[] = [];
+    for await (const item of paginate(fetchPage, {}, 2)) {
+      items.push(item);
+    }
+
+    expect(items).toEqual(['a', 'b', 'c', 'd', 'e']);
+    expect(fetchPage).toHaveBeenNthCalledWith(1, { limit: 2, offset: 0 });
+    expect(fetchPage).toHaveBeenNthCalledWith(2, { limit: 2, cursor: 'c1' });
+    expect(fetchPage).toHaveBeenNthCalledWith(3, { limit: 2, cursor: 'c2' });
+  });
 });
@@ -135,6 +135,73 @@ describe('DispatchResource', () => {
       const [, options] = getFn.mock.calls[0] as [string, { searchParams: URLSearchParams }];
       expect([...options.searchParams.entries()]).toHaveLength(0);
     });
+
+    it('passes wait and extends the request timeout beyond it', async () => {
+      const getFn = vi.fn().mockReturnValue({ status: 204, json: vi.fn() });
+      const http = makeHttpClient({ get: getFn });
+      const resource = new DispatchResource(http);
+
+      await resource.next({ wait: 30 });
+
+      const [, options] = getFn.mock.calls[0] as [
+        string,
+        { searchParams: URLSearchParams; timeout: number },
+      ];
+      expect(options.searchParams.get('wait')).toBe('30');
+      expect(options.timeout).toBeGreaterThan(30_000);
+    });
+  });
+
+  describe('nextBatch()', () => {
+    const batch = [
+      {
+        issue: { id: 'i1', number: 1, title: 'A', type: 'task', priority: 1, status: 'todo' },
+        prompt: 'Do A',
+        meta: null,
+      },
+      {
+        issue: { id: 'i2', number: 2, title: 'B', type: 'task', priority: 2, status: 'todo' },
+        prompt: null,
+        meta: null,
+      },
+    ];
+
+    it('returns the claimed batch when status is 200', async () => {
+      const http = makeHttpClient({
+        get: vi.fn().mockReturnValue(makeJsonResponse({ data: batch }, 200)),
+      });
+      const resource = new DispatchResource(http);
+
+      const result = await resource.nextBatch({ count: 2 });
+
+      expect(result).toEqual(batch);
+    });
+
+    it('returns an empty array when status is 204 (queue empty)', async () => {
+      const jsonFn = vi.fn();
+      const http = makeHttpClient({
+        get: vi.fn().mockReturnValue({ status: 204, json: jsonFn }),
+      });
+      const resource = new DispatchResource(http);
+
+      const result = await resource.nextBatch({ count: 5 });
+
+      expect(result).toEqual([]);
+      expect(jsonFn).not.toHaveBeenCalled();
+    });
+
+    it('passes count and projectId as search params', async () => {
+      const getFn = vi.fn().mockReturnValue(makeJsonResponse({ data: batch }, 200));
+      const http = makeHttpClient({ get: getFn });
+      const resource = new DispatchResource(http);
+
+      await resource.nextBatch({ count: 10, projectId: 'proj_1' });
+
+      const [path, options] = getFn.mock.calls[0] as [string, { searchParams: URLSearchParams }];
+      expect(path).toBe('api/dispatch/next');
+      expect(options.searchParams.get('count')).toBe('10');
+      expect(options.searchParams.get('projectId')).toBe('proj_1');
+    });
   });
 
   describe('queue()', () => {
@@ -0,0 +1,112 @@
+import { describe, it, expect, vi } from 'vitest';
+import { EventsResource } from '../../resources/events';
+import type { HttpClient } from '../../http';
+
+function makeHttpClient(
+  overrides: Partial<Record<'get' | 'post' | 'patch' | 'delete', unknown>> = {}
+): HttpClient {
+  return {
+    get: vi.fn(),
+    post: vi.fn(),
+    patch: vi.fn(),
+    delete: vi.fn(),
+    ...overrides,
+  } as unknown as HttpClient;
+}
+
+/** A response whose body streams the given SSE text and then closes. */
+function makeStreamResponse(text: string) {
+  const encoder = new TextEncoder();
+  return {
+    status: 200,
+    body: new ReadableStream<Uint8Array>({
+      start(controller) {
+        controller.enqueue(encoder.encode(text));
+        controller.close();
+      },
+    }),
+  };
+}
+
+const issueCreated = {
+  id: 'evt_1',
+  type: 'issue.created',
+  data: {
+    issueId: 'issue_1',
+    number: 1,
+    title: 'Fix bug',
+    type: 'task',
+    status: 'todo',
+    priority: 1,
+    projectId: null,
+  },
+  timestamp: '2026-02-23T00:00:00Z',
+};
+
+const issueDeleted = {
+  id: 'evt_2',
+  type: 'issue.deleted',
+  data: { issueId: 'issue_1' },
+  timestamp: '2026-02-23T00:00:01Z',
+};
+
+function sse(event: { id: string; type: string }) {
+  return `id: ${event.id}\nevent: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`;
+}
+
+describe('EventsResource', () => {
+  describe('subscribe()', () => {
+    it('yields parsed events and skips the ready message', async () => {
+      const getFn = vi
+        .fn()
+        .mockResolvedValue(
+          makeStreamResponse(`event: ready\ndata: {}\n\n${sse(issueCreated)}${sse(issueDeleted)}`)
+        );
+      const resource = new EventsResource(makeHttpClient({ get: getFn }));
+
+      const events = [];
+      for await (const event of resource.subscribe({}, { reconnect: false })) {
+        events.push(event);
+      }
+
+      expect(events).toEqual([issueCreated, issueDeleted]);
+    });
+
+    it('passes types and Last-Event-ID, with no request timeout', async () => {
+      const getFn = vi.fn().mockResolvedValue(makeStreamResponse(''));
+      const resource = new EventsResource(makeHttpClient({ get: getFn }));
+
+      const params = { types: ['issue.created' as const, 'issue.claimed' as const] };
+      for await (const _event of resource.subscribe(
+        { ...params, lastEventId: 'evt_0' },
+        { reconnect: false }
+      )) {
+        // drain
+      }
+
+      const [path, options] = getFn.mock.calls[0];
+      expect(path).toBe('api/events');
+      expect(options.searchParams.get('types')).toBe('issue.created,issue.claimed');
+      expect(options.headers['Last-Event-ID']).toBe('evt_0');
+      expect(options.timeout).toBe(false);
+    });
+
+    it('reconnects from the last received event when the stream ends', async () => {
+      const controller = new AbortController();
+      const getFn = vi
+        .fn()
+        .mockResolvedValueOnce(makeStreamResponse(`retry: 1\n\n${sse(issueCreated)}`))
+        .mockResolvedValueOnce(makeStreamResponse(sse(issueDeleted)));
+      const resource = new EventsResource(makeHttpClient({ get: getFn }));
+
+      const events = [];
+      for await (const event of resource.subscribe({}, { signal: controller.signal })) {
+        events.push(event);
+        if (events.length === 2) controller.abort();
+      }
+
+      expect(events.map((e) => e.id)).toEqual(['evt_1', 'evt_2']);
+      expect(getFn.mock.calls[1][1].headers['Last-Event-ID']).toBe('evt_1');
+    });
+  });
+});
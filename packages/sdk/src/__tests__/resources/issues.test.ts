@@ -206,6 +206,35 @@ describe('IssuesResource', () => {
       expect(options.searchParams.get('type')).toBe('task');
     });
 
+    it('walks pages by cursor without requesting totals', async () => {
+      http.get
+        .mockReturnValueOnce({
+          json: vi
+            .fn()
+            .mockResolvedValue({ data: [makeIssue({ id: 'issue_1' })], nextCursor: 'c1' }),
+        })
+        .mockReturnValueOnce({
+          json: vi
+            .fn()
+            .mockResolvedValue({ data: [makeIssue({ id: 'issue_2' })], nextCursor: null }),
+        });
+
+      const collected: Issue[] = [];
+      for await (const issue of resource.iter({ orderBy: 'number' })) {
+        collected.push(issue);
+      }
+
+      expect(collected.map((issue) => issue.id)).toEqual(['issue_1', 'issue_2']);
+      const [first, second] = http.get.mock.calls.map(
+        ([, options]) => options.searchParams as URLSearchParams
+      );
+      expect(first.get('includeTotal')).toBe('false');
+      expect(first.get('orderBy')).toBe('number');
+      expect(first.has('cursor')).toBe(false);
+      expect(second.get('cursor')).toBe('c1');
+      expect(second.has('offset')).toBe(false);
+    });
+
     it('yields zero items when list returns empty', async () => {
       http.get.mockReturnValue({
         json: vi.fn().mockResolvedValue({ data: [], total: 0 }),
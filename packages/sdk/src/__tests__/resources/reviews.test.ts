@@ -136,6 +136,32 @@ describe('ReviewsResource', () => {
     });
   });
 
+  describe('createBatch(reviews)', () => {
+    it('POSTs the reviews array to api/prompt-reviews/batch', async () => {
+      const { http, jsonFn } = makeHttp();
+      jsonFn.mockResolvedValue({
+        data: [makeReview({ id: 'rev_1' }), makeReview({ id: 'rev_2' })],
+      });
+      const resource = new ReviewsResource(http as never);
+
+      const review: CreateReviewParams = {
+        versionId: 'ver_1',
+        issueId: 'issue_1',
+        clarity: 4,
+        completeness: 4,
+        relevance: 4,
+        authorType: 'agent',
+      };
+      const result = await resource.createBatch([review, { ...review, issueId: 'issue_2' }]);
+
+      expect(http.post).toHaveBeenCalledWith(
+        'api/prompt-reviews/batch',
+        expect.objectContaining({ json: { reviews: [review, { ...review, issueId: 'issue_2' }] } })
+      );
+      expect(result.map((r) => r.id)).toEqual(['rev_1', 'rev_2']);
+    });
+  });
+
   describe('list(templateId, params?)', () => {
     it('GETs api/templates/:templateId/reviews', async () => {
       const { http, jsonFn } = makeHttp();
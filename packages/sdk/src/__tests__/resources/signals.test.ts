@@ -23,7 +23,9 @@ const mockSignalResponse = {
     severity: 'high' as const,
     payload: { metric: 'conversion', drop: 0.12 },
     issueId: 'issue_1',
+    occurrences: 1,
     createdAt: '2026-02-23T00:00:00Z',
+    lastSeenAt: '2026-02-23T00:00:00Z',
   },
   issue: {
     id: 'issue_1',
@@ -47,6 +49,7 @@ const mockSignalResponse = {
     updatedAt: '2026-02-23T00:00:00Z',
     deletedAt: null,
   },
+  deduplicated: false,
 };
 
 describe('SignalsResource', () => {
@@ -182,4 +185,49 @@ describe('SignalsResource', () => {
       expect(jsonFn).toHaveBeenCalled();
     });
   });
+
+  describe('ingestBatch()', () => {
+    const mockBatchResponse = {
+      data: [
+        { signalId: 'sig_1', issueId: 'issue_1', deduplicated: false },
+        { signalId: 'sig_1', issueId: 'issue_1', deduplicated: true },
+      ],
+      created: 1,
+      deduplicated: 1,
+    };
+
+    it('POSTs the signals array to api/signals/batch', async () => {
+      const postFn = vi.fn().mockReturnValue({
+        json: vi.fn().mockResolvedValue(mockBatchResponse),
+      });
+      const http = makeHttpClient({ post: postFn });
+      const resource = new SignalsResource(http);
+
+      const signals = [
+        { source: 'sentry', sourceId: '99', type: 'error', severity: 'high' as const, payload: {} },
+        { source: 'sentry', sourceId: '99', type: 'error', severity: 'high' as const, payload: {} },
+      ];
+      await resource.ingestBatch(signals);
+
+      const [url, options] = postFn.mock.calls[0] as [string, { json: unknown }];
+      expect(url).toBe('api/signals/batch');
+      expect(options.json).toEqual({ signals });
+    });
+
+    it('returns per-signal results and totals without unwrapping', async () => {
+      const http = makeHttpClient({
+        post: vi.fn().mockReturnValue({
+          json: vi.fn().mockResolvedValue(mockBatchResponse),
+        }),
+      });
+      const resource = new SignalsResource(http);
+
+      const result = await resource.ingestBatch([
+        { source: 'github', type: 'push', severity: 'low', payload: {} },
+      ]);
+
+      expect(result).toEqual(mockBatchResponse);
+      expect(result.data[1].deduplicated).toBe(true);
+    });
+  });
 });
@@ -39,6 +39,10 @@ function makeVersion(overrides: Partial<PromptVersion> = {}): PromptVersion {
     completionRate: null,
     avgDurationMs: null,
     reviewScore: null,
+    reviewCount: 0,
+    claritySum: 0,
+    completenessSum: 0,
+    relevanceSum: 0,
     createdAt: '2026-02-23T00:00:00Z',
     ...overrides,
   };
@@ -0,0 +1,47 @@
+import { describe, it, expect } from 'vitest';
+import { parseEventStream } from '../sse';
+
+/** Build a byte stream that emits each string as its own chunk. */
+function streamOf(...chunks: string[]): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  return new ReadableStream({
+    start(controller) {
+      for (const chunk of chunks) controller.enqueue(encoder.encode(chunk));
+      controller.close();
+    },
+  });
+}
+
+async function collect(body: ReadableStream<Uint8Array>) {
+  const messages = [];
+  for await (const message of parseEventStream(body)) messages.push(message);
+  return messages;
+}
+
+describe('parseEventStream', () => {
+  it('parses id, event and data fields', async () => {
+    const messages = await collect(streamOf('id: 1\nevent: issue.created\ndata: {"a":1}\n\n'));
+
+    expect(messages).toEqual([{ id: '1', event: 'issue.created', data: '{"a":1}' }]);
+  });
+
+  it('reassembles messages split across chunks', async () => {
+    const body = streamOf('id: 1\nda', 'ta: hel', 'lo\n', '\nid: 2\ndata: x\n\n');
+    const messages = await collect(body);
+
+    expect(messages.map((m) => m.data)).toEqual(['hello', 'x']);
+  });
+
+  it('joins multi-line data and handles CRLF line endings', async () => {
+    const messages = await collect(streamOf('data: one\r\ndata: two\r\n\r\n'));
+
+    expect(messages).toEqual([{ data: 'one\ntwo' }]);
+  });
+
+  it('skips comments and reads retry', async () => {
+    const body = streamOf(': keep-alive\n\nretry: 3000\nevent: ready\ndata: {}\n\n');
+    const messages = await collect(body);
+
+    expect(messages).toEqual([{ event: 'ready', data: '{}', retry: 3000 }]);
+  });
+});
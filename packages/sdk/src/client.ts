@@ -10,6 +10,7 @@ import { TemplatesResource } from './resources/templates';
 import { ReviewsResource } from './resources/reviews';
 import { DashboardResource } from './resources/dashboard';
 import { DispatchResource } from './resources/dispatch';
+import { EventsResource } from './resources/events';
 
 export type { LoopClientOptions };
 
@@ -66,6 +67,9 @@ export class LoopClient {
   /** Dashboard — system health metrics and activity overview. */
   readonly dashboard: DashboardResource;
 
+  /** Events — stream issue, dispatch, signal and template changes. */
+  readonly events: EventsResource;
+
   constructor(options: LoopClientOptions) {
     const http = createHttpClient(options);
 
@@ -80,5 +84,6 @@ export class LoopClient {
     this.templates = new TemplatesResource(http);
     this.reviews = new ReviewsResource(http);
     this.dashboard = new DashboardResource(http);
+    this.events = new EventsResource(http);
   }
 }
@@ -13,6 +13,7 @@ export type { HttpClient, RequestOptions } from './http';
 
 // Pagination
 export { PaginatedList, paginate } from './pagination';
+export type { Page } from './pagination';
 
 // Errors
 export {
@@ -35,6 +36,12 @@ export { TemplatesResource } from './resources/templates';
 export { ReviewsResource } from './resources/reviews';
 export { DashboardResource } from './resources/dashboard';
 export { DispatchResource } from './resources/dispatch';
+export { EventsResource } from './resources/events';
+export type { SubscribeOptions } from './resources/events';
+
+// Server-sent events
+export { parseEventStream } from './sse';
+export type { ServerSentEvent } from './sse';
 
 // Re-export all types from @dork-labs/loop-types for convenience
 export * from '@dork-labs/loop-types';
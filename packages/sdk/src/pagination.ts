@@ -5,24 +5,43 @@
 export class PaginatedList<T> {
   readonly data: T[];
   readonly total: number;
+  /**
+   * Cursor for the next page, to pass back as `cursor`. `null` on the last page and
+   * `undefined` for endpoints that only support offset pagination.
+   */
+  readonly nextCursor: string | null | undefined;
 
-  constructor(data: T[], total: number) {
+  constructor(data: T[], total: number, nextCursor?: string | null) {
     this.data = data;
     this.total = total;
+    this.nextCursor = nextCursor;
   }
 
   /** Whether more results exist beyond the current page. */
   get hasMore(): boolean {
+    if (this.nextCursor !== undefined) return this.nextCursor !== null;
     return this.data.length > 0 && this.data.length < this.total;
   }
 }
 
+/** The parts of a page that {@link paginate} reads. `total` may be omitted for cursor pages. */
+export interface Page<T> {
+  data: T[];
+  total?: number;
+  nextCursor?: string | null;
+}
+
 /**
  * Creates an async generator that auto-paginates through all results.
  * Yields individual items, not pages.
  *
+ * The first page is requested at `params.offset`. When a page carries a `nextCursor`,
+ * following pages are requested with `cursor` instead of an offset, so each page is an
+ * index seek and rows inserted during the walk do not shift or repeat results. Endpoints
+ * without cursor support are walked by offset until `total` is reached.
+ *
  * @param fetchPage - Function that fetches a single page of results
- * @param params - Base query parameters (limit/offset will be overridden)
+ * @param params - Base query parameters (limit/offset/cursor will be overridden)
  * @param pageSize - Number of items per page (default 50)
  *
  * @example
@@ -32,23 +51,37 @@ export class PaginatedList<T> {
  * }
  * ```
  */
-export async function* paginate<T, P extends { limit?: number; offset?: number }>(
-  fetchPage: (params: P) => Promise<PaginatedList<T>>,
+export async function* paginate<
+  T,
+  P extends { limit?: number; offset?: number; cursor?: string },
+>(
+  fetchPage: (params: P) => Promise<Page<T>>,
   params: P,
   pageSize: number = 50
 ): AsyncGenerator<T, void, undefined> {
   let offset = params.offset ?? 0;
+  let cursor: string | undefined;
 
   while (true) {
-    const page = await fetchPage({ ...params, limit: pageSize, offset });
+    const page = await fetchPage(
+      cursor === undefined
+        ? { ...params, limit: pageSize, offset }
+        : { ...params, limit: pageSize, offset: undefined, cursor }
+    );
 
     for (const item of page.data) {
       yield item;
     }
 
+    if (page.nextCursor !== undefined) {
+      if (page.nextCursor === null) break;
+      cursor = page.nextCursor;
+      continue;
+    }
+
     offset += page.data.length;
 
-    if (offset >= page.total || page.data.length === 0) {
+    if (page.data.length === 0 || offset >= (page.total ?? offset)) {
       break;
     }
   }
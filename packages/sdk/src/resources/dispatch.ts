@@ -3,6 +3,7 @@ import { toSearchParams } from '../http';
 import { PaginatedList } from '../pagination';
 import type {
   DispatchNextParams,
+  DispatchBatchParams,
   DispatchQueueParams,
   DataResponse,
   PaginatedResponse,
@@ -10,6 +11,14 @@ import type {
   DispatchQueueItem,
 } from '@dork-labs/loop-types';
 
+/** Extra time allowed on top of a long-poll `wait` before the request times out. */
+const WAIT_TIMEOUT_MARGIN_MS = 10_000;
+
+/** Request timeout override for long-poll claims, so ky does not abort a waiting request. */
+function waitTimeout(wait: number | undefined): { timeout?: number } {
+  return wait ? { timeout: wait * 1000 + WAIT_TIMEOUT_MARGIN_MS } : {};
+}
+
 /**
  * Dispatch resource — Loop's core agent feedback loop.
  * Claim work from the priority queue with hydrated prompt instructions.
@@ -21,11 +30,14 @@ export class DispatchResource {
    * Atomically claim the highest-priority unblocked issue.
    * Returns the issue with hydrated prompt instructions, or null if queue is empty.
    *
-   * @param params - Optional filter by projectId
+   * With `wait`, an empty queue holds the request open for up to that many seconds
+   * until work arrives, instead of returning null immediately.
+   *
+   * @param params - Optional filter by projectId and long-poll `wait` in seconds
    *
    * @example
    * ```typescript
-   * const task = await loop.dispatch.next()
+   * const task = await loop.dispatch.next({ wait: 30 })
    * if (task) {
    *   console.log(task.issue.title)
    *   console.log(task.prompt)
@@ -34,7 +46,10 @@ export class DispatchResource {
    */
   async next(params?: DispatchNextParams): Promise<DispatchNextResponse | null> {
     const searchParams = toSearchParams(params as Record<string, unknown>);
-    const response = await this.http.get('api/dispatch/next', { searchParams });
+    const response = await this.http.get('api/dispatch/next', {
+      searchParams,
+      ...waitTimeout(params?.wait),
+    });
 
     if (response.status === 204) {
       return null;
@@ -44,6 +59,35 @@ export class DispatchResource {
     return body.data;
   }
 
+  /**
+   * Atomically claim up to `count` unblocked issues in a single round trip.
+   * Returns the claimed issues in priority order, or an empty array if the queue is empty.
+   *
+   * @param params - Batch size, optional filter by projectId and long-poll `wait` in seconds
+   *
+   * @example
+   * ```typescript
+   * const tasks = await loop.dispatch.nextBatch({ count: 10 })
+   * for (const task of tasks) {
+   *   console.log(task.issue.title)
+   * }
+   * ```
+   */
+  async nextBatch(params: DispatchBatchParams): Promise<DispatchNextResponse[]> {
+    const searchParams = toSearchParams(params as unknown as Record<string, unknown>);
+    const response = await this.http.get('api/dispatch/next', {
+      searchParams,
+      ...waitTimeout(params.wait),
+    });
+
+    if (response.status === 204) {
+      return [];
+    }
+
+    const body = await response.json<DataResponse<DispatchNextResponse[]>>();
+    return body.data;
+  }
+
   /**
    * Preview the priority queue without claiming any issues.
    *
@@ -0,0 +1,95 @@
+import type { HttpClient } from '../http';
+import { toSearchParams } from '../http';
+import { parseEventStream } from '../sse';
+import type { LoopEvent, SubscribeEventsParams } from '@dork-labs/loop-types';
+
+/** Delay before reconnecting when the server has not suggested one. */
+const DEFAULT_RECONNECT_MS = 3_000;
+
+/** Options controlling a long-lived event subscription. */
+export interface SubscribeOptions {
+  /** Abort to end the subscription; the iterator then finishes without throwing. */
+  signal?: AbortSignal;
+  /** Reconnect with `Last-Event-ID` when the stream drops (default: true). */
+  reconnect?: boolean;
+}
+
+/**
+ * Events resource — push notifications for issue, dispatch, signal and template
+ * changes, streamed from `GET /api/events`.
+ */
+export class EventsResource {
+  constructor(private readonly http: HttpClient) {}
+
+  /**
+   * Subscribe to change events as an async iterator.
+   * The connection stays open until the loop exits or `options.signal` aborts; dropped
+   * connections are resumed from the last received event.
+   *
+   * @param params - Event types to receive and an optional event ID to resume after
+   * @param options - Abort signal and reconnect behaviour
+   *
+   * @example
+   * ```typescript
+   * for await (const event of loop.events.subscribe({ types: ['issue.created'] })) {
+   *   console.log(event.data.title)
+   * }
+   * ```
+   */
+  async *subscribe(
+    params: SubscribeEventsParams = {},
+    options: SubscribeOptions = {}
+  ): AsyncGenerator<LoopEvent, void, undefined> {
+    const { signal, reconnect = true } = options;
+    const searchParams = toSearchParams({ types: params.types?.join(',') });
+    let lastEventId = params.lastEventId;
+    let reconnectMs = DEFAULT_RECONNECT_MS;
+
+    while (!signal?.aborted) {
+      let response: Response;
+      try {
+        response = await this.http.get('api/events', {
+          searchParams,
+          signal,
+          timeout: false,
+          headers: {
+            Accept: 'text/event-stream',
+            ...(lastEventId ? { 'Last-Event-ID': lastEventId } : {}),
+          },
+        });
+      } catch (error) {
+        if (signal?.aborted) return;
+        throw error;
+      }
+
+      try {
+        for await (const message of parseEventStream(response.body!)) {
+          if (message.retry !== undefined) reconnectMs = message.retry;
+          if (message.id === undefined || !message.data) continue;
+          lastEventId = message.id;
+          yield JSON.parse(message.data) as LoopEvent;
+        }
+      } catch (error) {
+        // A dropped connection is retried below; an abort ends the subscription quietly
+        if (signal?.aborted) return;
+        if (!reconnect) throw error;
+      }
+
+      if (!reconnect || signal?.aborted) return;
+      await delay(reconnectMs, signal);
+    }
+  }
+}
+
+/** Resolve after `ms`, or immediately once `signal` aborts. */
+function delay(ms: number, signal?: AbortSignal): Promise<void> {
+  return new Promise((resolve) => {
+    const timer = setTimeout(done, ms);
+    signal?.addEventListener('abort', done, { once: true });
+    function done() {
+      clearTimeout(timer);
+      signal?.removeEventListener('abort', done);
+      resolve();
+    }
+  });
+}
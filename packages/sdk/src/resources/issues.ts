@@ -9,6 +9,7 @@ import type {
   ListIssuesParams,
   DataResponse,
   PaginatedResponse,
+  CursorPaginatedResponse,
 } from '@dork-labs/loop-types';
 
 /**
@@ -20,21 +21,25 @@ export class IssuesResource {
 
   /**
    * List issues with optional filters and pagination.
+   * Pass a page's `nextCursor` back as `cursor` to fetch the following page without an offset.
    *
-   * @param params - Filter by status, type, projectId, labelId, priority, parentId; paginate with limit/offset
+   * @param params - Filter by status, type, projectId, labelId, priority, parentId; order by
+   *   createdAt or number; paginate with limit/offset or cursor
    */
-  async list(params?: ListIssuesParams): Promise<PaginatedList<Issue>> {
+  async list(params?: Omit<ListIssuesParams, 'includeTotal'>): Promise<PaginatedList<Issue>> {
     const searchParams = toSearchParams(params as Record<string, unknown>);
     const response = await this.http
       .get('api/issues', { searchParams })
       .json<PaginatedResponse<Issue>>();
-    return new PaginatedList(response.data, response.total);
+    return new PaginatedList(response.data, response.total, response.nextCursor);
   }
 
   /**
    * Auto-paginating async generator that yields individual issues.
+   * Pages are fetched by cursor without counting the total, so walking every issue stays
+   * linear however large the result set is.
    *
-   * @param params - Filter params (limit/offset are managed automatically)
+   * @param params - Filter params and sort order (limit/offset/cursor are managed automatically)
    *
    * @example
    * ```typescript
@@ -43,9 +48,17 @@ export class IssuesResource {
    * }
    * ```
    */
-  iter(params?: Omit<ListIssuesParams, 'limit' | 'offset'>): AsyncGenerator<Issue> {
-    const baseParams: ListIssuesParams = { ...params };
-    return paginate((p) => this.list({ ...baseParams, ...p }), baseParams);
+  iter(
+    params?: Omit<ListIssuesParams, 'limit' | 'offset' | 'cursor' | 'includeTotal'>
+  ): AsyncGenerator<Issue> {
+    const baseParams: ListIssuesParams = { ...params, includeTotal: false };
+    return paginate(
+      (p) =>
+        this.http
+          .get('api/issues', { searchParams: toSearchParams(p as Record<string, unknown>) })
+          .json<CursorPaginatedResponse<Issue>>(),
+      baseParams
+    );
   }
 
   /**
@@ -32,6 +32,27 @@ export class ReviewsResource {
     return response.data;
   }
 
+  /**
+   * Create many reviews in one request and one database transaction. Each version's
+   * review score is updated once, applying its reviews in the order given.
+   *
+   * @param reviews - Up to 200 reviews, in submission order
+   * @param options - Per-request overrides
+   * @returns The created reviews, in input order
+   */
+  async createBatch(
+    reviews: CreateReviewParams[],
+    options?: RequestOptions
+  ): Promise<PromptReview[]> {
+    const response = await this.http
+      .post('api/prompt-reviews/batch', {
+        json: { reviews },
+        ...toKyOptions(options),
+      })
+      .json<DataResponse<PromptReview[]>>();
+    return response.data;
+  }
+
   /**
    * List reviews for a template across all versions.
    *
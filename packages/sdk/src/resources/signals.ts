@@ -1,6 +1,11 @@
 import type { HttpClient, RequestOptions } from '../http';
 import { toKyOptions } from '../http';
-import type { IngestSignalParams, DataResponse, SignalIngestResponse } from '@dork-labs/loop-types';
+import type {
+  IngestSignalParams,
+  DataResponse,
+  SignalIngestResponse,
+  SignalBatchIngestResponse,
+} from '@dork-labs/loop-types';
 
 /**
  * Signals resource — ingest external data (PostHog, GitHub, Sentry, etc.)
@@ -10,7 +15,9 @@ export class SignalsResource {
   constructor(private readonly http: HttpClient) {}
 
   /**
-   * Ingest a signal. Creates a signal record and a linked triage issue.
+   * Ingest a signal. Creates a signal record and a linked triage issue, or coalesces
+   * it into a recent signal with the same source, sourceId and type
+   * (`deduplicated: true`).
    *
    * @param params - Signal data including source, type, severity, and payload
    * @param options - Per-request overrides
@@ -27,4 +34,24 @@ export class SignalsResource {
       .json<DataResponse<SignalIngestResponse>>();
     return response.data;
   }
+
+  /**
+   * Ingest many signals in one request and one database transaction.
+   * Repeats are coalesced the same way as {@link ingest}.
+   *
+   * @param signals - Up to 500 signals, in arrival order
+   * @param options - Per-request overrides
+   * @returns One `{ signalId, issueId, deduplicated }` entry per input plus totals
+   */
+  async ingestBatch(
+    signals: IngestSignalParams[],
+    options?: RequestOptions
+  ): Promise<SignalBatchIngestResponse> {
+    return this.http
+      .post('api/signals/batch', {
+        json: { signals },
+        ...toKyOptions(options),
+      })
+      .json<SignalBatchIngestResponse>();
+  }
 }
@@ -10,8 +10,10 @@ import type {
   UpdateTemplateParams,
   CreateVersionParams,
   PaginationParams,
+  ListTemplatesParams,
   DataResponse,
   PaginatedResponse,
+  CursorPaginatedResponse,
 } from '@dork-labs/loop-types';
 
 /**
@@ -24,18 +26,21 @@ export class TemplatesResource {
   /**
    * List prompt templates with optional pagination.
    *
-   * @param params - Pagination params
+   * @param params - Pagination params: limit/offset, or the previous page's `nextCursor`
    */
-  async list(params?: PaginationParams): Promise<PaginatedList<PromptTemplate>> {
+  async list(
+    params?: Omit<ListTemplatesParams, 'includeTotal'>
+  ): Promise<PaginatedList<PromptTemplate>> {
     const searchParams = toSearchParams(params as Record<string, unknown>);
     const response = await this.http
       .get('api/templates', { searchParams })
       .json<PaginatedResponse<PromptTemplate>>();
-    return new PaginatedList(response.data, response.total);
+    return new PaginatedList(response.data, response.total, response.nextCursor);
   }
 
   /**
    * Auto-paginating async generator that yields individual prompt templates.
+   * Pages are fetched by cursor without counting the total.
    *
    * @example
    * ```typescript
@@ -45,7 +50,14 @@ export class TemplatesResource {
    * ```
    */
   iter(params?: Record<string, never>): AsyncGenerator<PromptTemplate> {
-    return paginate((p) => this.list(p), params ?? {});
+    const baseParams: ListTemplatesParams = { ...params, includeTotal: false };
+    return paginate(
+      (p) =>
+        this.http
+          .get('api/templates', { searchParams: toSearchParams(p as Record<string, unknown>) })
+          .json<CursorPaginatedResponse<PromptTemplate>>(),
+      baseParams
+    );
   }
 
   /**
@@ -0,0 +1,62 @@
+/** A single message parsed from a `text/event-stream` body. */
+export interface ServerSentEvent {
+  id?: string;
+  event?: string;
+  data: string;
+  retry?: number;
+}
+
+/**
+ * Parse a `text/event-stream` body into messages as they arrive.
+ * Comment lines (keep-alives) are skipped. Returning early from the consuming loop
+ * cancels the underlying stream.
+ *
+ * @param body - Response body of an SSE request
+ */
+export async function* parseEventStream(
+  body: ReadableStream<Uint8Array>
+): AsyncGenerator<ServerSentEvent, void, undefined> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let message: Partial<ServerSentEvent> = {};
+  let data: string[] = [];
+
+  try {
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += decoder.decode(value, { stream: true });
+
+      let newline = buffer.indexOf('\n');
+      while (newline !== -1) {
+        const line = buffer.slice(0, newline).replace(/\r$/, '');
+        buffer = buffer.slice(newline + 1);
+        newline = buffer.indexOf('\n');
+
+        if (line === '') {
+          // Blank line ends a message
+          if (data.length > 0 || message.id !== undefined || message.retry !== undefined) {
+            yield { ...message, data: data.join('\n') };
+          }
+          message = {};
+          data = [];
+          continue;
+        }
+        if (line.startsWith(':')) continue;
+
+        const colon = line.indexOf(':');
+        const field = colon === -1 ? line : line.slice(0, colon);
+        const raw = colon === -1 ? '' : line.slice(colon + 1);
+        const fieldValue = raw.startsWith(' ') ? raw.slice(1) : raw;
+
+        if (field === 'data') data.push(fieldValue);
+        else if (field === 'id') message.id = fieldValue;
+        else if (field === 'event') message.event = fieldValue;
+        else if (field === 'retry' && /^\d+$/.test(fieldValue)) message.retry = Number(fieldValue);
+      }
+    }
+  } finally {
+    await reader.cancel().catch(() => undefined);
+  }
+}
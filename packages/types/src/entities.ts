@@ -113,7 +113,9 @@ export interface Signal {
   severity: SignalSeverity;
   payload: SignalPayload;
   issueId: string;
+  occurrences: number;
   createdAt: string;
+  lastSeenAt: string;
 }
 
 export interface PromptTemplate {
@@ -143,6 +145,12 @@ export interface PromptVersion {
   completionRate: number | null;
   avgDurationMs: number | null;
   reviewScore: number | null;
+  /** Reviews recorded for this version. */
+  reviewCount: number;
+  /** Running sums of each review dimension; divide by `reviewCount` for the mean. */
+  claritySum: number;
+  completenessSum: number;
+  relevanceSum: number;
   createdAt: string;
 }
 
@@ -49,3 +49,18 @@ export type SignalSeverity = z.infer<typeof signalSeveritySchema>;
 export const versionStatusValues = ['active', 'draft', 'retired'] as const;
 export const versionStatusSchema = z.enum(versionStatusValues);
 export type VersionStatus = z.infer<typeof versionStatusSchema>;
+
+export const loopEventTypeValues = [
+  'issue.created',
+  'issue.updated',
+  'issue.deleted',
+  'issue.claimed',
+  'signal.ingested',
+  'template.promoted',
+] as const;
+export const loopEventTypeSchema = z.enum(loopEventTypeValues);
+export type LoopEventType = z.infer<typeof loopEventTypeSchema>;
+
+export const issueListOrderValues = ['createdAt', 'number'] as const;
+export const issueListOrderSchema = z.enum(issueListOrderValues);
+export type IssueListOrder = z.infer<typeof issueListOrderSchema>;
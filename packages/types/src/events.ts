@@ -0,0 +1,50 @@
+import type { IssueStatus, IssueType, LoopEventType, SignalSeverity } from './enums';
+
+/** Compact issue summary carried by issue events. */
+export interface IssueEventData {
+  issueId: string;
+  number: number;
+  title: string;
+  type: IssueType;
+  status: IssueStatus;
+  priority: number;
+  projectId: string | null;
+}
+
+/** Payload for each event type streamed by `GET /api/events`. */
+export interface LoopEventDataMap {
+  'issue.created': IssueEventData;
+  'issue.updated': IssueEventData & {
+    /** Fields written by the update. */
+    fields: string[];
+  };
+  'issue.deleted': { issueId: string };
+  'issue.claimed': IssueEventData;
+  'signal.ingested': {
+    signalId: string;
+    issueId: string;
+    source: string;
+    type: string;
+    severity: SignalSeverity;
+    /** True when the signal was coalesced into an existing signal and issue. */
+    deduplicated: boolean;
+  };
+  'template.promoted': {
+    templateId: string;
+    slug: string;
+    versionId: string;
+    version: number;
+    previousVersionId: string | null;
+  };
+}
+
+/** A change event. Narrow on `type` to get a typed `data` payload. */
+export type LoopEvent<T extends LoopEventType = LoopEventType> = {
+  [K in T]: {
+    /** Unique event ID; pass as `lastEventId` to resume a subscription. */
+    id: string;
+    type: K;
+    data: LoopEventDataMap[K];
+    timestamp: string;
+  };
+}[T];
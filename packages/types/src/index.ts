@@ -26,6 +26,12 @@ export {
   versionStatusValues,
   versionStatusSchema,
   type VersionStatus,
+  loopEventTypeValues,
+  loopEventTypeSchema,
+  type LoopEventType,
+  issueListOrderValues,
+  issueListOrderSchema,
+  type IssueListOrder,
 } from './enums';
 
 export {
@@ -65,23 +71,30 @@ export type {
   UpdateGoalParams,
   CreateLabelParams,
   IngestSignalParams,
+  IngestSignalBatchParams,
   CreateCommentParams,
   CreateRelationParams,
   CreateTemplateParams,
   UpdateTemplateParams,
   CreateVersionParams,
   CreateReviewParams,
+  CreateReviewBatchParams,
   DispatchNextParams,
+  DispatchBatchParams,
   DispatchQueueParams,
+  SubscribeEventsParams,
   PaginationParams,
+  ListTemplatesParams,
 } from './requests';
 
 export type {
   DataResponse,
   PaginatedResponse,
+  CursorPaginatedResponse,
   ErrorResponse,
   DispatchNextResponse,
   SignalIngestResponse,
+  SignalBatchIngestResponse,
   DashboardStats,
   DashboardActivityItem,
   DashboardPromptHealth,
@@ -89,3 +102,5 @@ export type {
   TemplateDetail,
   TemplatePreview,
 } from './responses';
+
+export type { IssueEventData, LoopEventDataMap, LoopEvent } from './events';
@@ -8,6 +8,8 @@ import type {
   AuthorType,
   RelationType,
   VersionStatus,
+  LoopEventType,
+  IssueListOrder,
 } from './enums';
 import type { HypothesisData, SignalPayload, TemplateConditions } from './jsonb';
 
@@ -47,6 +49,12 @@ export interface ListIssuesParams {
   parentId?: string;
   limit?: number;
   offset?: number;
+  /** Sort by creation time (default) or by issue number. */
+  orderBy?: IssueListOrder;
+  /** `nextCursor` from the previous page; resumes after it instead of using `offset`. */
+  cursor?: string;
+  /** Set to `false` to skip counting all matches; `total` is then omitted. */
+  includeTotal?: boolean;
 }
 
 export interface CreateProjectParams {
@@ -101,6 +109,10 @@ export interface IngestSignalParams {
   projectId?: string;
 }
 
+export interface IngestSignalBatchParams {
+  signals: IngestSignalParams[];
+}
+
 export interface CreateCommentParams {
   body: string;
   authorName: string;
@@ -147,8 +159,22 @@ export interface CreateReviewParams {
   authorType: AuthorType;
 }
 
+export interface CreateReviewBatchParams {
+  reviews: CreateReviewParams[];
+}
+
 export interface DispatchNextParams {
   projectId?: string;
+  /** Seconds to wait for work when the queue is empty (0–30, default 0). */
+  wait?: number;
+}
+
+export interface DispatchBatchParams {
+  /** Maximum number of issues to claim in one round trip (1–50). */
+  count: number;
+  projectId?: string;
+  /** Seconds to wait for work when the queue is empty (0–30, default 0). */
+  wait?: number;
 }
 
 export interface DispatchQueueParams {
@@ -157,7 +183,21 @@ export interface DispatchQueueParams {
   offset?: number;
 }
 
+export interface SubscribeEventsParams {
+  /** Event types to receive; all types when omitted. */
+  types?: LoopEventType[];
+  /** Resume after this event ID, replaying recent events that were missed. */
+  lastEventId?: string;
+}
+
 export interface PaginationParams {
   limit?: number;
   offset?: number;
 }
+
+export interface ListTemplatesParams extends PaginationParams {
+  /** `nextCursor` from the previous page; resumes after it instead of using `offset`. */
+  cursor?: string;
+  /** Set to `false` to skip counting all templates; `total` is then omitted. */
+  includeTotal?: boolean;
+}
@@ -8,6 +8,15 @@ export interface DataResponse<T> {
 export interface PaginatedResponse<T> {
   data: T[];
   total: number;
+  /** Cursor for the next page on endpoints that support `cursor`; null on the last page. */
+  nextCursor?: string | null;
+}
+
+/** A page requested with `includeTotal=false`: no `total`, only a cursor to continue from. */
+export interface CursorPaginatedResponse<T> {
+  data: T[];
+  nextCursor: string | null;
+  total?: number;
 }
 
 export interface ErrorResponse {
@@ -30,6 +39,14 @@ export interface DispatchNextResponse {
 export interface SignalIngestResponse {
   signal: Signal;
   issue: Issue;
+  /** True when the signal was coalesced into an existing signal and issue. */
+  deduplicated: boolean;
+}
+
+export interface SignalBatchIngestResponse {
+  data: Array<{ signalId: string; issueId: string; deduplicated: boolean }>;
+  created: number;
+  deduplicated: number;
 }
 
 export interface DashboardStats {